@@ -0,0 +1,583 @@
+#! /usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Copyright (c) 2018 by Karsten Lehmann <mail@kalehmann.de>
+#
+#    This file is part of PySFedit.
+#
+#    PySFedit is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    PySFedit is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    long with PySFedit. If not, see <http://www.gnu.org/licenses/>.
+
+
+"""
+This module contains the command line interface of PySFedit.
+
+It is built solely on the psflib and never imports Gtk, so it can be
+used on machines without a display, for example in build pipelines.
+
+Examples:
+    pysfedit-cli info font.psf
+    pysfedit-cli convert font.asm font.psf.gz
+    pysfedit-cli convert font.asm font.psf font.psf.gz
+    pysfedit-cli extract font.psf glyphs/
+    pysfedit-cli render font.psf "Hello World"
+    pysfedit-cli merge latin.psf cyrillic.psf -o merged.psf
+    pysfedit-cli subset font.psf small.psf -t "Hello World"
+    pysfedit-cli profile font.psf messages.txt
+"""
+
+import argparse
+import itertools
+import json
+import os
+import sys
+
+from . import __version__
+from . import psflib
+from .psflib.render import TextRenderer
+
+class CliError(Exception):
+    """Exception for errors that should be reported to the user of the
+    command line interface without a traceback.
+    """
+    pass
+
+def bitmap_to_pbm(rows, width):
+    """Convert a bitmap to a binary portable bitmap (P4).
+
+    Args:
+        rows (list): A list of lists, where each list represents a row
+            of the bitmap and contains 0s and 1s.
+        width (int): The width of the bitmap in pixels
+
+    Returns:
+        bytes: The content of the pbm file
+    """
+    data = bytearray(b"P4\n%d %d\n" % (width, len(rows)))
+    for row in rows:
+        for i in range(0, width, 8):
+            byte = 0
+            for j, bit in enumerate(row[i:i + 8]):
+                if bit:
+                    byte |= 0x80 >> j
+            data.append(byte)
+
+    return bytes(data)
+
+def bitmap_to_text(rows, set_char='#', unset_char='.'):
+    """Convert a bitmap to a string for printing it on a terminal.
+
+    Args:
+        rows (list): A list of lists, where each list represents a row
+            of the bitmap and contains 0s and 1s.
+        set_char (str): The character for set pixels
+        unset_char (str): The character for unset pixels
+
+    Returns:
+        str: One line of text for each row of the bitmap
+    """
+    return "\n".join(
+        "".join(set_char if bit else unset_char for bit in row)
+            for row in rows
+    )
+
+def import_font(path):
+    """Import a font from a file.
+
+    Args:
+        path (str): The path of the file to import
+
+    Returns:
+        psflib.PcScreenFont: The imported font
+    """
+    return psflib.get_importer_for_file(path).import_from_file(path)
+
+def get_cache(args):
+    """Create the conversion cache requested on the command line.
+
+    Args:
+        args (argparse.Namespace): The parsed command line arguments
+
+    Returns:
+        psflib.cache.ConversionCache: The cache or None if no cache was
+            requested.
+    """
+    if not args.cache:
+
+        return None
+    from .psflib.cache import ConversionCache
+
+    directory = None if args.cache == "default" else args.cache
+
+    return ConversionCache(directory, args.cache_size * 1024 * 1024)
+
+def add_cache_arguments(parser):
+    """Add the arguments for the conversion cache to a parser.
+
+    Args:
+        parser (argparse.ArgumentParser): The parser of a subcommand
+    """
+    parser.add_argument("--cache", nargs="?", const="default",
+        metavar="DIRECTORY",
+        help="cache the converted fonts, by default in "
+             "~/.cache/pysfedit")
+    parser.add_argument("--cache-size", type=int, default=256,
+        metavar="MIB", help="maximum size of the cache in MiB")
+    parser.add_argument("--link", action="store_true",
+        help="hard link outputs to the cache instead of copying them")
+
+def get_exporter_options(args):
+    """Get the keyword arguments for the exporters of compressed fonts
+    requested on the command line.
+
+    Args:
+        args (argparse.Namespace): The parsed command line arguments
+
+    Returns:
+        dict: The keyword arguments with the exporter classes as keys
+    """
+    level = {}
+    if args.compress_level is not None:
+        level['compresslevel'] = args.compress_level
+
+    return {
+        psflib.PsfGzExporter: dict(level, threads=args.compress_threads),
+        psflib.PsfXzExporter: level,
+        psflib.PsfBz2Exporter: level,
+    }
+
+def add_compression_arguments(parser):
+    """Add the arguments for the compression of gzip compressed fonts to
+    a parser.
+
+    Args:
+        parser (argparse.ArgumentParser): The parser of a subcommand
+    """
+    parser.add_argument("--compress-level", type=int,
+        choices=range(10), metavar="LEVEL",
+        help="compression level of compressed fonts from 0 to 9")
+    parser.add_argument("--compress-threads", type=int, default=1,
+        metavar="N",
+        help="number of threads compressing blocks of a gzip "
+             "compressed font, the output is the same for any number")
+
+def info(args):
+    """Print the metadata of one or more fonts. Only the headers of the
+    fonts are read, with --count-unicode also the unicode tables.
+
+    Args:
+        args (argparse.Namespace): The parsed command line arguments
+    """
+    for path in args.fonts:
+        font_info = psflib.inspect(path, args.count_unicode)
+        header = font_info.header
+        width, height = header.size
+        line = "%s: PSF%d, %dx%d, %d glyphs, %s" % (
+            path,
+            header.version_psf,
+            width,
+            height,
+            header.get_length(),
+            "unicode table" if header.has_unicode_table()
+                else "no unicode table"
+        )
+        if font_info.unicode_value_count is not None:
+            line += " (%d unicode values, %d sequences)" % (
+                font_info.unicode_value_count, font_info.sequence_count)
+        print(line)
+
+def convert(args):
+    """Convert a font into one or more other formats. The font gets
+    imported and encoded only once for all outputs.
+
+    Args:
+        args (argparse.Namespace): The parsed command line arguments
+    """
+    options = get_exporter_options(args)
+    if args.cache:
+        get_cache(args).convert_to_files(args.input, args.outputs, options,
+            link=args.link)
+
+        return
+    font = import_font(args.input)
+    psflib.export_to_files(font, args.outputs, options)
+
+def extract(args):
+    """Write the bitmaps of the glyphs of a font into portable bitmap
+    files.
+
+    Args:
+        args (argparse.Namespace): The parsed command line arguments
+    """
+    font = import_font(args.font)
+    indices = args.glyphs if args.glyphs else range(len(font))
+    os.makedirs(args.directory, exist_ok=True)
+    for index in indices:
+        if not 0 <= index < len(font):
+            raise CliError("The font has no glyph with index %d" % index)
+        glyph = font.get_glyph(index)
+        path = os.path.join(args.directory, "glyph_%d.pbm" % index)
+        with open(path, "wb") as f:
+            f.write(bitmap_to_pbm(glyph.get_data(), glyph.get_size()[0]))
+
+def render(args):
+    """Render a text with a font either onto the terminal or into a
+    portable bitmap file.
+
+    Args:
+        args (argparse.Namespace): The parsed command line arguments
+    """
+    bitmap = TextRenderer(import_font(args.font)).render(args.text)
+    if not args.output:
+        print(bitmap_to_text(bitmap.to_rows()))
+
+        return
+    with open(args.output, "wb") as f:
+        f.write(bitmap.to_pbm())
+
+def batch(args):
+    """Convert many fonts in parallel and print the result of each
+    conversion as a line of JSON.
+
+    Args:
+        args (argparse.Namespace): The parsed command line arguments
+
+    Returns:
+        int: The exit status, 1 if any conversion failed
+    """
+    from .psflib import batch
+
+    status = 0
+    for result in batch.convert_files(
+            args.patterns,
+            args.output_directory,
+            '.' + args.format,
+            workers=args.jobs,
+            chunksize=args.chunksize,
+            check=args.check,
+            cache=get_cache(args),
+            link=args.link,
+            options=get_exporter_options(args).get(
+                psflib.get_exporter_for_file('.' + args.format))):
+        if result['status'] == batch.STATUS_ERROR:
+            status = 1
+        print(json.dumps(result), flush=True)
+
+    return status
+
+def open_catalog(args):
+    """Open the font catalog requested on the command line.
+
+    Args:
+        args (argparse.Namespace): The parsed command line arguments
+
+    Returns:
+        psflib.catalog.FontCatalog: The catalog
+    """
+    from .psflib.catalog import FontCatalog
+
+    return FontCatalog(args.database)
+
+def catalog_scan(args):
+    """Add fonts to the catalog and update changed ones.
+
+    Args:
+        args (argparse.Namespace): The parsed command line arguments
+
+    Returns:
+        int: The exit status, 1 if any font could not be scanned
+    """
+    with open_catalog(args) as catalog:
+        summary = catalog.scan(args.patterns, workers=args.jobs,
+            chunksize=args.chunksize)
+        print(", ".join("%d %s" % (summary[k], k) for k in
+            ["added", "updated", "unchanged", "removed", "failed"]))
+        if not summary["failed"]:
+
+            return 0
+        for path, error in catalog.get_errors():
+            print("%s: %s" % (path, error), file=sys.stderr)
+
+    return 1
+
+def catalog_find(args):
+    """Print the fonts in the catalog matching the given criteria.
+
+    Args:
+        args (argparse.Namespace): The parsed command line arguments
+    """
+    from .psflib.coverage import parse_ranges
+
+    covers = parse_ranges(args.covers) if args.covers else []
+    if args.text:
+        covers += [ord(c) for c in args.text if c not in "\r\n"]
+    width = height = None
+    if args.size:
+        width, height = (int(v) for v in args.size.lower().split("x"))
+
+    with open_catalog(args) as catalog:
+        for row in catalog.find(covers, width, height, args.min_glyphs):
+            print("%s: PSF%d, %dx%d, %d glyphs, %d codepoints" % (
+                row["path"],
+                row["version"],
+                row["width"],
+                row["height"],
+                row["length"],
+                row["codepoint_count"],
+            ))
+
+def merge(args):
+    """Merge fonts into one, using the later fonts only for codepoints
+    that the earlier ones lack.
+
+    Args:
+        args (argparse.Namespace): The parsed command line arguments
+    """
+    font = psflib.PcScreenFont.merge(import_font(f) for f in args.fonts)
+    psflib.export_to_files(font, [args.output], get_exporter_options(args))
+
+def iter_corpus(paths):
+    """Iterate over the lines of text files without their line breaks.
+
+    Args:
+        paths (list): The paths of the text files
+
+    Yields:
+        str: The next line
+    """
+    for path in paths:
+        with open(path, encoding="utf-8", errors="replace") as f:
+            for line in f:
+                yield line.rstrip("\r\n")
+
+def subset(args):
+    """Write a font with only the glyphs needed for codepoint ranges, a
+    text or the text of files.
+
+    Args:
+        args (argparse.Namespace): The parsed command line arguments
+    """
+    from .psflib.coverage import parse_ranges
+
+    if not (args.codepoints or args.text or args.files):
+        raise CliError("Specify the codepoints, a text or text files")
+    codepoints = parse_ranges(args.codepoints) if args.codepoints else []
+    text = iter_corpus(args.files)
+    if args.text:
+        text = itertools.chain([args.text], text)
+    font = import_font(args.input).subset(codepoints, text, args.psf1)
+    psflib.export_to_files(font, [args.output], get_exporter_options(args))
+
+def profile(args):
+    """Count the characters of text files and print the most frequent
+    characters missing from a font.
+
+    Args:
+        args (argparse.Namespace): The parsed command line arguments
+
+    Returns:
+        int: 1 if characters are missing from the font, otherwise 0
+    """
+    from .psflib.corpus import profile_files
+    from .psflib.unicodeblocks import NO_BLOCK, get_block
+
+    font = import_font(args.font)
+    corpus = profile_files(args.files, workers=args.jobs)
+    missing = corpus.get_missing(font)
+    print("%d characters, %d codepoints, %d missing" % (
+        corpus.get_total(), len(corpus.get_coverage()), len(missing)))
+    for codepoint, count in missing[:args.top]:
+        character = chr(codepoint)
+        block = get_block(codepoint)
+        print("U+%04X %s %d %s" % (
+            codepoint,
+            character if character.isprintable() else " ",
+            count,
+            block.name if block else NO_BLOCK,
+        ))
+
+    if args.reorder:
+        if not font.has_unicode_table():
+            raise CliError("Can not reorder a font without unicode table")
+        for old_index, new_index in corpus.get_glyph_moves(font):
+            font.move_glyph(old_index, new_index)
+        psflib.export_to_files(font, [args.reorder],
+            get_exporter_options(args))
+
+    return 1 if missing else 0
+
+def get_argument_parser():
+    """Create the parser for the command line arguments.
+
+    Returns:
+        argparse.ArgumentParser: The parser for the command line
+            arguments
+    """
+    parser = argparse.ArgumentParser(
+        prog="pysfedit-cli",
+        description="Inspect and convert pc screen fonts."
+    )
+    parser.add_argument(
+        "--version", action="version", version="%(prog)s " + __version__)
+    subparsers = parser.add_subparsers(dest="command")
+    subparsers.required = True
+
+    p = subparsers.add_parser("info",
+        help="show the metadata of fonts")
+    p.add_argument("fonts", nargs="+", metavar="FONT")
+    p.add_argument("-u", "--count-unicode", action="store_true",
+        help="count the entries of the unicode tables")
+    p.set_defaults(func=info)
+
+    p = subparsers.add_parser("convert",
+        help="convert a font into other formats")
+    p.add_argument("input", metavar="INPUT")
+    p.add_argument("outputs", nargs="+", metavar="OUTPUT")
+    add_compression_arguments(p)
+    add_cache_arguments(p)
+    p.set_defaults(func=convert)
+
+    p = subparsers.add_parser("extract",
+        help="write glyph bitmaps into pbm files")
+    p.add_argument("font", metavar="FONT")
+    p.add_argument("directory", metavar="DIRECTORY")
+    p.add_argument("-g", "--glyph", dest="glyphs", type=int,
+        action="append", metavar="INDEX",
+        help="only extract the glyph with this index, can be repeated")
+    p.set_defaults(func=extract)
+
+    p = subparsers.add_parser("render",
+        help="render a text with a font")
+    p.add_argument("font", metavar="FONT")
+    p.add_argument("text", metavar="TEXT")
+    p.add_argument("-o", "--output", metavar="FILE",
+        help="write a pbm file instead of printing to the terminal")
+    p.set_defaults(func=render)
+
+    p = subparsers.add_parser("batch",
+        help="convert many fonts in parallel")
+    p.add_argument("patterns", nargs="+", metavar="PATTERN",
+        help="glob pattern or directory of the fonts to convert")
+    p.add_argument("-o", "--output-directory", required=True,
+        metavar="DIRECTORY")
+    p.add_argument("-f", "--format",
+        choices=[f.name for f in psflib.formats.get_formats()],
+        default="psf")
+    p.add_argument("-j", "--jobs", type=int, default=None,
+        help="number of worker processes, defaults to the number of "
+             "processors")
+    p.add_argument("--chunksize", type=int, default=1,
+        help="number of fonts sent to a worker process at once")
+    p.add_argument("--check", choices=["mtime", "hash", "none"],
+        default="mtime",
+        help="how to detect fonts that are already up to date")
+    add_compression_arguments(p)
+    add_cache_arguments(p)
+    p.set_defaults(func=batch)
+
+    p = subparsers.add_parser("catalog",
+        help="find fonts by size and codepoint coverage")
+    p.add_argument("--database", metavar="FILE",
+        help="the catalog database, by default "
+             "~/.local/share/pysfedit/catalog.sqlite")
+    catalog_parsers = p.add_subparsers(dest="catalog_command")
+    catalog_parsers.required = True
+
+    p = catalog_parsers.add_parser("scan",
+        help="add fonts to the catalog and update changed ones")
+    p.add_argument("patterns", nargs="+", metavar="PATTERN",
+        help="glob pattern or directory of the fonts to scan")
+    p.add_argument("-j", "--jobs", type=int, default=None,
+        help="number of worker processes, defaults to the number of "
+             "processors")
+    p.add_argument("--chunksize", type=int, default=16,
+        help="number of fonts sent to a worker process at once")
+    p.set_defaults(func=catalog_scan)
+
+    p = catalog_parsers.add_parser("find",
+        help="list the fonts matching all given criteria")
+    p.add_argument("-c", "--covers", metavar="RANGES",
+        help="codepoints the fonts must cover, for example "
+             "U+0400-U+04FF,U+2500-U+257F")
+    p.add_argument("-t", "--text", metavar="TEXT",
+        help="a text whose characters the fonts must cover")
+    p.add_argument("-s", "--size", metavar="WIDTHxHEIGHT",
+        help="the size of the glyphs, for example 8x16")
+    p.add_argument("-n", "--min-glyphs", type=int, metavar="N",
+        help="the minimum number of glyphs")
+    p.set_defaults(func=catalog_find)
+
+    p = subparsers.add_parser("merge",
+        help="merge fonts, the first font has the highest priority")
+    p.add_argument("fonts", nargs="+", metavar="FONT")
+    p.add_argument("-o", "--output", required=True, metavar="OUTPUT")
+    add_compression_arguments(p)
+    p.set_defaults(func=merge)
+
+    p = subparsers.add_parser("subset",
+        help="keep only the glyphs needed for codepoints or a text")
+    p.add_argument("input", metavar="INPUT")
+    p.add_argument("output", metavar="OUTPUT")
+    p.add_argument("-c", "--codepoints", metavar="RANGES",
+        help="comma separated codepoints or ranges, for example "
+             "0x20-0x7e,0xe4")
+    p.add_argument("-t", "--text", metavar="TEXT",
+        help="keep the glyphs for the characters of the text")
+    p.add_argument("-f", "--file", dest="files", action="append",
+        default=[], metavar="FILE",
+        help="keep the glyphs for the characters of an utf-8 text file, "
+             "can be given multiple times")
+    p.add_argument("--psf1", action="store_true",
+        help="write an old pc screen font if the subset fits into one")
+    add_compression_arguments(p)
+    p.set_defaults(func=subset)
+
+    p = subparsers.add_parser("profile",
+        help="find the characters of text files missing from a font")
+    p.add_argument("font", metavar="FONT")
+    p.add_argument("files", nargs="+", metavar="FILE",
+        help="utf-8 encoded text files")
+    p.add_argument("-j", "--jobs", type=int, default=None,
+        help="number of worker processes, defaults to the number of "
+             "processors")
+    p.add_argument("-n", "--top", type=int, default=20, metavar="N",
+        help="number of missing characters to show, the most frequent "
+             "first")
+    p.add_argument("--reorder", metavar="OUTPUT",
+        help="write the font with its glyphs ordered by their frequency "
+             "in the text files")
+    add_compression_arguments(p)
+    p.set_defaults(func=profile)
+
+    return parser
+
+def main(argv=None):
+    """Run the command line interface of PySFedit.
+
+    Args:
+        argv (list): The command line arguments without the program
+            name. Defaults to sys.argv[1:]
+
+    Returns:
+        int: The exit status
+    """
+    parser = get_argument_parser()
+    args = parser.parse_args(argv)
+    try:
+        status = args.func(args)
+    except Exception as e:
+        # The psflib reports malformed fonts with plain exceptions.
+        print("pysfedit-cli: error: %s" % e, file=sys.stderr)
+
+        return 1
+
+    return status or 0
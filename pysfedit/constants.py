@@ -24,6 +24,7 @@ This module contains some constants like paths to ressources.
 """
 
 from os.path import dirname, abspath
+import gettext
 import inspect
 from pathlib import Path
 
@@ -33,7 +34,7 @@ from gi.repository import GdkPixbuf
 from gi.repository import Gdk
 from gi.repository import GLib
 import pkg_resources
-import PIL
+from .psflib.render import PackedBitmap
 
 directory = Path(dirname(
         abspath(inspect.getfile(inspect.currentframe()))
@@ -45,17 +46,85 @@ RES_DIR = PROJECT_ROOT + 'res/'
 IMG_DIR = RES_DIR + 'img/'
 LOCALE_DIR = RES_DIR + 'locale/'
 
+translation = gettext.translation(
+    'pysfedit',
+    localedir=pkg_resources.resource_filename(__name__, "res/locale"),
+    fallback=True
+)
+translation.install()
+
 def get_pixbuf_from_file(path):
-    with pkg_resources.resource_stream(__name__, path) as img_fp:
-        img = PIL.Image.open(img_fp).convert("RGBA")
-        img.load()
-        data = img.tobytes()
-        w, h = img.size
-        data = GLib.Bytes.new(data)
-        
-        return GdkPixbuf.Pixbuf.new_from_bytes(
-            data, GdkPixbuf.Colorspace.RGB, True, 8, w, h, w * 4
-        )
+    loader = GdkPixbuf.PixbufLoader()
+    loader.write(pkg_resources.resource_string(__name__, path))
+    loader.close()
+
+    return loader.get_pixbuf()
+
+def get_preview_data(rows, preview_size=None):
+    """Expand the rows of a bitmap into RGBA pixels with black set pixels
+    on a transparent background. This does not use Gtk, so it may be
+    called from any thread.
+
+    Args:
+        rows (list): A list of lists, where each list represents a row
+            of the bitmap and contains 0s and 1s.
+        preview_size (int): If given, the bitmap is padded to a square
+            on the right or at the bottom and enlarged by the largest
+            integer factor that does not exceed this size.
+
+    Returns:
+        tuple: The pixels as bytes, their width and their height
+    """
+    height = len(rows)
+    width = len(rows[0]) if rows else 0
+    scale = 1
+    if preview_size is not None:
+        width = height = max(width, height, 1)
+        scale = max(1, preview_size // width)
+    bitmap = PackedBitmap.from_rows(rows, width, height)
+
+    return bitmap.to_rgba(scale), width * scale, height * scale
+
+def get_pixbuf_from_preview_data(data, width, height, preview_size=None):
+    """Create a pixbuf from the result of get_preview_data.
+
+    Args:
+        data (bytes): The RGBA pixels
+        width (int): The width of the pixels
+        height (int): The height of the pixels
+        preview_size (int): If given, the pixbuf is scaled to this width
+            and height
+
+    Returns:
+        GdkPixbuf.Pixbuf: The pixbuf
+    """
+    pixbuf = GdkPixbuf.Pixbuf.new_from_bytes(
+        GLib.Bytes.new(data), GdkPixbuf.Colorspace.RGB, True, 8, width,
+        height, width * 4
+    )
+    if preview_size is not None and width != preview_size:
+        pixbuf = pixbuf.scale_simple(preview_size, preview_size,
+            GdkPixbuf.InterpType.NEAREST)
+
+    return pixbuf
+
+def get_pixbuf_from_rows(rows, preview_size=None):
+    """Get a pixbuf with black set pixels on a transparent background
+    from the rows of a bitmap.
+
+    Args:
+        rows (list): A list of lists, where each list represents a row
+            of the bitmap and contains 0s and 1s.
+        preview_size (int): If given, the bitmap is padded to a square
+            on the right or at the bottom and scaled to this width and
+            height.
+
+    Returns:
+        GdkPixbuf.Pixbuf: The pixbuf
+    """
+
+    return get_pixbuf_from_preview_data(
+        *get_preview_data(rows, preview_size), preview_size)
 
 class Storage(dict):
         """A key value based storage for application data.
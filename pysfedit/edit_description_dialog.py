@@ -28,6 +28,8 @@ gi.require_version("Gtk", "3.0")
 from gi.repository import Gtk, Gdk
 
 from . import psflib
+# Importing the constants installs the gettext translation.
+from . import constants
 
 class TextRow(Gtk.ListBoxRow):
     TYPE_SINGLE_VALUE = 0
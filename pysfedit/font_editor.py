@@ -27,19 +27,251 @@ from gi.repository import Gtk
 from gi.repository import GdkPixbuf
 from gi.repository import GLib
 from gi.repository import Gdk
-from PIL import Image, ImageDraw
-import gettext
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 import re
+import weakref
 
 from . import psflib
+from .psflib.render import PackedBitmap
 from .glyph_editor import GlyphEditor
+from .glyph_overview import GlyphOverview, GlyphOverviewView
 from .edit_description_dialog import EditUnicodeDescriptionDialog
 from . import constants as c
 
-translation = gettext.translation(
-    'pysfedit', localedir=c.LOCALE_DIR, fallback=True
-)
-translation.install()
+class GlyphPreviewCache(object):
+    """A bounded cache of the preview images of glyphs, which is shared
+    by all rows of a glyph selector.
+
+    The previews are looked up by the content of the glyph bitmaps, so
+    identical glyphs like the blank ones are rendered once and share
+    one pixbuf. The content of a glyph is packed into bytes once per
+    generation of the glyph. The least recently used previews are
+    dropped first.
+
+    Missing previews can be requested. Their pixels are then rendered by
+    a pool of worker threads and the pixbufs are created on the main
+    loop, where the callbacks of the requests are called. Requests are
+    served in the order they were made. If rendering fails, the
+    callbacks get a blank preview.
+
+    Args:
+        max_size (int): The maximum number of cached previews
+        workers (int): The number of worker threads
+    """
+    DEFAULT_MAX_SIZE = 1024
+    DEFAULT_WORKERS = 2
+
+    def __init__(self, max_size=DEFAULT_MAX_SIZE, workers=DEFAULT_WORKERS):
+        self.__max_size = max_size
+        self.__workers = workers
+        self.__executor = None
+        self.__pixbufs = OrderedDict()
+        # The packed content of the glyphs with the generation it was
+        # packed at
+        self.__contents = weakref.WeakKeyDictionary()
+        # The pending requests, mapping their keys to their futures and
+        # the callbacks waiting for them.
+        self.__jobs = {}
+
+    def __len__(self):
+        return len(self.__pixbufs)
+
+    def get_key(self, glyph, preview_size):
+        """Get the key of the preview of a glyph.
+
+        Args:
+            glyph (psflib.GlyphBitmap): The glyph
+            preview_size (int): The width and the height of the preview
+
+        Returns:
+            tuple: The key, which does not refer to the glyph itself
+        """
+        generation = glyph.get_generation()
+        content = self.__contents.get(glyph)
+        if content is None or content[0] != generation:
+            content = self.__contents[glyph] = generation, glyph.to_bytes()
+
+        return glyph.get_size(), content[1], preview_size
+
+    @staticmethod
+    def __render(key):
+        """Render the pixels of a preview. This runs in a worker thread.
+
+        Args:
+            key (tuple): The key of the preview
+
+        Returns:
+            tuple: The pixels as bytes, their width and their height
+        """
+        (width, height), data, preview_size = key
+        rows = PackedBitmap(width, height, data).to_rows()
+
+        return c.get_preview_data(rows, preview_size)
+
+    def __get(self, key):
+        """Get a cached preview and mark it as recently used.
+
+        Args:
+            key (tuple): The key of the preview
+
+        Returns:
+            GdkPixbuf.Pixbuf: The preview image or None
+        """
+        pixbuf = self.__pixbufs.get(key)
+        if pixbuf is not None:
+            self.__pixbufs.move_to_end(key)
+
+        return pixbuf
+
+    def __add(self, key, pixbuf):
+        self.__pixbufs[key] = pixbuf
+        if len(self.__pixbufs) > self.__max_size:
+            self.__pixbufs.popitem(last=False)
+
+    def lookup(self, glyph, preview_size):
+        """Get the preview image of a glyph if it is cached.
+
+        Args:
+            glyph (psflib.GlyphBitmap): The glyph
+            preview_size (int): The width and the height of the preview
+
+        Returns:
+            GdkPixbuf.Pixbuf: The preview image of the glyph or None
+        """
+
+        return self.__get(self.get_key(glyph, preview_size))
+
+    def get_pixbuf(self, glyph, preview_size):
+        """Get the preview image of a glyph and render it on the calling
+        thread if it is not cached.
+
+        Args:
+            glyph (psflib.GlyphBitmap): The glyph
+            preview_size (int): The width and the height of the preview
+
+        Returns:
+            GdkPixbuf.Pixbuf: The preview image of the glyph
+        """
+        pixbuf = self.lookup(glyph, preview_size)
+        if pixbuf is not None:
+
+            return pixbuf
+
+        pixbuf = c.get_pixbuf_from_rows(glyph.get_data(), preview_size)
+        self.__add(self.get_key(glyph, preview_size), pixbuf)
+
+        return pixbuf
+
+    def request(self, glyph, preview_size, callback=None):
+        """Request the preview image of a glyph. If it is cached, the
+        callback is called right away.
+
+        Args:
+            glyph (psflib.GlyphBitmap): The glyph
+            preview_size (int): The width and the height of the preview
+            callback (callable): Gets called with the key and the
+                pixbuf of the preview when it is ready. It may be None to
+                only fill the cache.
+
+        Returns:
+            tuple: The key of the request, which is needed to cancel it
+        """
+        key = self.get_key(glyph, preview_size)
+        pixbuf = self.__get(key)
+        if pixbuf is not None:
+            if callback:
+                callback(key, pixbuf)
+
+            return key
+
+        job = self.__jobs.get(key)
+        if job is None:
+            if self.__executor is None:
+                self.__executor = ThreadPoolExecutor(self.__workers)
+            future = self.__executor.submit(self.__render, key)
+            job = self.__jobs[key] = future, []
+            # Done callbacks run in the worker thread, so the result is
+            # handed over to the main loop.
+            future.add_done_callback(
+                lambda future: GLib.idle_add(
+                    self.__on_rendered, key, future))
+        if callback:
+            job[1].append(callback)
+
+        return key
+
+    def cancel(self, key, callback=None):
+        """Cancel a request. The rendering of the preview is cancelled
+        too, if it has not started yet and no other callbacks are waiting
+        for it.
+
+        Args:
+            key (tuple): The key returned by request
+            callback (callable): The callback passed to request
+        """
+        job = self.__jobs.get(key)
+        if job is None:
+            return
+        future, callbacks = job
+        if callback in callbacks:
+            callbacks.remove(callback)
+        if not callbacks and future.cancel():
+            del self.__jobs[key]
+
+    def has_pending(self):
+        """Check whether there are requests that are not served yet.
+
+        Returns:
+            bool: True if previews are being rendered
+        """
+
+        return bool(self.__jobs)
+
+    def __on_rendered(self, key, future):
+        """This method gets called on the main loop when the pixels of
+        a preview have been rendered.
+
+        Args:
+            key (tuple): The key of the preview
+            future (concurrent.futures.Future): The future of the job
+
+        Returns:
+            bool: False to remove the idle source
+        """
+        job = self.__jobs.get(key)
+        if job is None or job[0] is not future:
+
+            return False
+
+        del self.__jobs[key]
+        future, callbacks = job
+        try:
+            pixbuf = c.get_pixbuf_from_preview_data(*future.result(),
+                key[2])
+        except Exception:
+            # The waiting rows still get an image. It is not cached, so
+            # the preview is rendered again when it is requested again.
+            pixbuf = c.get_pixbuf_from_rows([[0]], key[2])
+        else:
+            self.__add(key, pixbuf)
+        for callback in callbacks:
+            callback(key, pixbuf)
+
+        return False
+
+    def clear(self):
+        """Drop all cached previews."""
+        self.__pixbufs.clear()
+
+    def shutdown(self):
+        """Cancel all requests and stop the worker threads."""
+        for future, _ in self.__jobs.values():
+            future.cancel()
+        self.__jobs.clear()
+        if self.__executor is not None:
+            self.__executor.shutdown(wait=False)
+            self.__executor = None
 
 class GlyphSelectorContext(object):
 
@@ -58,6 +290,7 @@ class GlyphSelectorContext(object):
     def __init__(self, font, glyph_selector):
         self.__font = font
         self.__parent_glyph_selector = glyph_selector
+        self.__preview_cache = GlyphPreviewCache()
 
         self.__storage = c.Storage.get(self)
         self.__storage.register_changed_callback(
@@ -74,31 +307,24 @@ class GlyphSelectorContext(object):
         self.update_rows()
 
     def __on_glyph_preview_size_changed(self, key, value):
+        # Previews of the old size are not needed anymore.
+        self.__preview_cache.clear()
         self.update_rows()
 
     def move_row(self, old_index, new_index):
-        """Switch two rows. This also changes the positions of the
-        glyphs in the font.
+        """Move a row. This also changes the positions of the glyphs in
+        the font.
 
         Args:
-            first (int): The index of the first row
-            second (int): The index of the second row
+            old_index (int): The current index of the row
+            new_index (int): The new index of the row
         """
         if old_index == new_index:
             return
 
-        lb = self.__parent_glyph_selector
-        row = lb.get_row_at_index(old_index)
-        lb.select_row(lb.get_row_at_index(new_index))
-        lb.remove(row)
-        lb.insert(row, new_index)
-
-        lb.select_row(row)
-
-        lb.show_all()
-        self.update_rows()
-
         self.__font.move_glyph(old_index, new_index)
+        self.__parent_glyph_selector.refresh()
+        self.__parent_glyph_selector.select_index(new_index)
 
     def add_glyph(self, index=-1):
         """Add a new glyph.
@@ -108,17 +334,12 @@ class GlyphSelectorContext(object):
                 The default is -1 meaning at the end
         """
         glyph, _ = self.__font.add_glyph(index)
-        if glyph:
-            row = GlyphRow(self, len(self.__font) - 1)
-            row.connect('drag-data-received',
-                self.__parent_glyph_selector._on_drag_data_received,
-                row)
-            self.__parent_glyph_selector.add(row)
-            self.__parent_glyph_selector.show_all()
-            self.__parent_glyph_selector.select_row(row)
-        if self.__storage['show_glyph_index']:
-            for row in self.__parent_glyph_selector.get_children():
-                row.update()
+        if not glyph:
+            return
+
+        self.__parent_glyph_selector.refresh()
+        self.__parent_glyph_selector.select_index(
+            len(self.__font) - 1 if index < 0 else index)
 
     def remove_glyph(self, index=-1):
         """Remove a glyph.
@@ -131,33 +352,24 @@ class GlyphSelectorContext(object):
             return
 
         if index == -1:
-            row = self.__parent_glyph_selector.get_selected_row()
-            index = row.get_index()
-        else:
-            row = self.__parent.glyph_selector.get_row_at_index(index)
-        if not row:
+            index = self.__parent_glyph_selector.get_selected_index()
+        if index is None or not 0 <= index < len(self.__font):
             return
 
-        if index > 0:
-            next_row = self.__parent_glyph_selector.get_row_at_index(
-                index - 1)
-            self.__parent_glyph_selector.select_row(next_row)
-        elif len(self.__parent_glyph_selector.get_children()) > 1:
-            # The row that will be deleted is the first row. Select the
-            # second row.
-            next_row = self.__parent_glyph_selector.get_row_at_index(1)
-            self.__parent_glyph_selector.select_row(next_row)
-
-        row.destroy()
+        # The glyph editor must not keep editing the removed glyph.
+        glyph_editor = self.__parent_glyph_selector.get_glyph_editor()
+        glyph_editor.get_context().bind_glyph(None)
         self.__font.remove_glyph(index)
-
-        if self.get_show_glyph_index():
-            self.update_rows()
+        self.__parent_glyph_selector.refresh()
+        if len(self.__font):
+            # Select the previous glyph or the new first glyph.
+            self.__parent_glyph_selector.select_index(max(index - 1, 0))
+        else:
+            self.__parent_glyph_selector.select_index(None)
 
     def update_rows(self):
         """Update information of all rows of the glyph selector."""
-        for row in self.__parent_glyph_selector.get_children():
-            row.update()
+        self.__parent_glyph_selector.refresh()
 
     def get_font(self):
         """Get the font of the glyph selector
@@ -167,6 +379,15 @@ class GlyphSelectorContext(object):
         """
         return self.__font
 
+    def get_preview_cache(self):
+        """Get the cache of the preview images of the glyphs.
+
+        Returns:
+            GlyphPreviewCache: The cache shared by all rows
+        """
+
+        return self.__preview_cache
+
     def get_glyph_preview_size(self):
         """Get the size of the preview image for each glyph in the glyph
         selector in pixels.
@@ -233,18 +454,24 @@ class GlyphRow(Gtk.ListBoxRow):
     glyph referenced by the row, a list of unicode representations for
     this glyph and a button for editing these.
 
+    The glyph selector only creates rows for the visible glyphs and
+    recycles them while scrolling by binding them to other glyphs.
+
     Args:
         context (GlyphSelectorContext): The context of the parent
             glyph selector
-        index (int): The initial index of the row
+        index (int): The index of the glyph the row is initially bound
+            to
     """
     def __init__(self, context, index):
         Gtk.ListBoxRow.__init__(self)
         font = context.get_font()
-        self.__glyph, self.__description = font[index]
         self.__context = context
-        self.__glyph_prev_size = context.get_glyph_preview_size()
-        self.__index = index
+        self.__glyph = None
+        self.__description = None
+        self.__preview_key = None
+        self.__preview_request = None
+        self.__index = None
         self.box = Gtk.Box(orientation=Gtk.Orientation.HORIZONTAL)
         self.add(self.box)
 
@@ -260,11 +487,8 @@ class GlyphRow(Gtk.ListBoxRow):
 
         self.l_index = Gtk.Label()
         self.box.pack_start((self.l_index), False, False, 0)
-        if self.__context.get_show_glyph_index():
-            self.l_index.set_text("%d" % index)
 
-        pixbuf = self.get_pixbuf_from_glyph_bitmap(self.__glyph)
-        self.image = Gtk.Image.new_from_pixbuf(pixbuf)
+        self.image = Gtk.Image()
         self.box.pack_start(self.image, False, False, 5)
 
         self.l_descriptions = Gtk.Label()
@@ -276,7 +500,6 @@ class GlyphRow(Gtk.ListBoxRow):
             )
             self.btn_edit.connect("clicked", self.__on_btn_edit_clicked)
             self.box.pack_end(self.btn_edit, False, False, 0)
-        self.set_label_descriptions()
 
         self.handle.drag_source_set(
             Gdk.ModifierType.BUTTON1_MASK,
@@ -294,6 +517,64 @@ class GlyphRow(Gtk.ListBoxRow):
         targets.add(self.GLYPH_ROW_ATOM, 0, self.TARGET_GlYPH_ROW_INFO)
         self.handle.drag_source_set_target_list(targets)
         self.drag_dest_set_target_list(targets)
+        self.connect('destroy', self.__on_destroy)
+
+        self.bind(index)
+
+    def bind(self, index):
+        """Bind the row to a glyph of the font and update all of its
+        widgets.
+
+        Args:
+            index (int): The index of the glyph
+        """
+        self.__index = index
+        self.__glyph, self.__description = \
+            self.__context.get_font()[index]
+        self.update()
+
+    def update_preview(self):
+        """Update the preview image, if the glyph, its generation or the
+        preview size changed since it was set the last time. Previews
+        that are not cached are requested from the preview cache and
+        set when they are ready.
+        """
+        preview_size = self.__context.get_glyph_preview_size()
+        key = self.__glyph, self.__glyph.get_generation(), preview_size
+        if key == self.__preview_key:
+            return
+        self.__preview_key = key
+        self.__cancel_preview_request()
+        cache = self.__context.get_preview_cache()
+        pixbuf = cache.lookup(self.__glyph, preview_size)
+        if pixbuf is not None:
+            self.image.set_from_pixbuf(pixbuf)
+
+            return
+
+        self.image.clear()
+        self.__preview_request = cache.request(self.__glyph, preview_size,
+            self.__on_preview_rendered)
+
+    def __cancel_preview_request(self):
+        if self.__preview_request is not None:
+            self.__context.get_preview_cache().cancel(
+                self.__preview_request, self.__on_preview_rendered)
+            self.__preview_request = None
+
+    def __on_preview_rendered(self, key, pixbuf):
+        """This method gets called when a requested preview is ready.
+
+        Args:
+            key (tuple): The key of the request
+            pixbuf (GdkPixbuf.Pixbuf): The preview image
+        """
+        if key == self.__preview_request:
+            self.__preview_request = None
+            self.image.set_from_pixbuf(pixbuf)
+
+    def __on_destroy(self, widget):
+        self.__cancel_preview_request()
 
     def __on_drag_data_get(self, widget, context, data, info, time):
         """This method gets called while drag and drop when this row
@@ -312,33 +593,26 @@ class GlyphRow(Gtk.ListBoxRow):
             bytes('%d' % self.get_index(), 'utf8'))
 
     def get_index(self):
-        """Get the index of the row. This method works even before the
-        rows has been assigned to the glyph selector.
+        """Get the index of the glyph the row is bound to. This is not
+        the position of the row in the glyph selector.
 
         Returns:
-            int: The index of the row
+            int: The index of the glyph
         """
-        if super().get_index() == -1:
-            return self.__index
 
-        return super().get_index()
+        return self.__index
 
     def update(self):
-        """This method updates the label with the index of this row."""
+        """This method updates the label with the index of this row, the
+        preview image and the unicode representations."""
         if self.__context.get_show_glyph_index():
             self.l_index.set_text('%d' % self.get_index())
         else:
             self.l_index.set_text('')
 
-        new_prev_size = self.__context.get_glyph_preview_size()
-        if new_prev_size !=    self.__glyph_prev_size:
-            self.__glyph_prev_size = new_prev_size
-            pixbuf = self.get_pixbuf_from_glyph_bitmap(self.__glyph)
-            self.image.set_from_pixbuf(pixbuf)
-
+        self.update_preview()
         self.set_label_descriptions()
 
-
     def set_label_descriptions(self):
         """This method updates the label with the unicode
         representations of the glyph referenced by this row.
@@ -352,7 +626,6 @@ class GlyphRow(Gtk.ListBoxRow):
             self.l_descriptions.set_text(printable)
 
             return
-        index = 0 if self.get_index() == -1 else self.get_index()
 
         self.l_descriptions.set_text(chr(self.get_index()))
 
@@ -367,26 +640,8 @@ class GlyphRow(Gtk.ListBoxRow):
             GdkPixbuf.Pixbuf: The preview image of the given glyph
                 bitmap.
         """
-        width, height = size = glyph.get_size()
-        data = glyph.get_data()
-
-        size = max(width, height), max(width, height)
-
-        img = Image.new('RGBA', size, (0,0,0,0))
-        draw = ImageDraw.Draw(img)
-        for y, row in zip(range(height), data):
-            for x, pixel in zip(range(width), row):
-                if pixel == 1:
-                    draw.point((x, y), (0,0,0,255))
-        data = img.tobytes()
-        w, h = img.size
-        data = GLib.Bytes.new(data)
-        pixbuf = GdkPixbuf.Pixbuf.new_from_bytes(data,
-                    GdkPixbuf.Colorspace.RGB, True, 8, w, h, w * 4)
-
-        preview_size = self.__context.get_glyph_preview_size()
-        return pixbuf.scale_simple(preview_size, preview_size,
-            GdkPixbuf.InterpType.NEAREST)
+        return self.__context.get_preview_cache().get_pixbuf(glyph,
+            self.__context.get_glyph_preview_size())
 
     def get_glyph_data(self):
         """Get the data of the glyph referenced by this row.
@@ -397,17 +652,6 @@ class GlyphRow(Gtk.ListBoxRow):
 
         return self.__glyph.get_data()
 
-    def update_glyph_data(self, data):
-        """Update the data and the preview image of the glyph referenced
-        by this row.
-
-        Args:
-            data (list): The new data of the glyph
-        """
-        self.__glyph.set_data(data)
-        pixbuf = self.get_pixbuf_from_glyph_bitmap(self.__glyph)
-        self.image.set_from_pixbuf(pixbuf)
-
     def __on_btn_edit_clicked(self, button):
         """This method gets called when the button for editing the
         unicode descriptions of the glyph referenced by this row has
@@ -435,38 +679,67 @@ class GlyphRow(Gtk.ListBoxRow):
 class GlyphSelector(Gtk.ListBox):
     """A widget for displaying glyphs from a pc screen font.
 
+    The glyph selector is virtualized: it only holds rows for the glyphs
+    in its viewport plus a small margin and binds them to other glyphs
+    while scrolling. The first glyph shown is the value of the
+    adjustment of the glyph selector, which should be attached to a
+    scrollbar, see GlyphSelectorView. The selection is tracked by the
+    index of the glyph, so it survives the recycling of rows.
+
     Args:
         font (psflib.PcScreenFont): The font which glyphs should be
             displayed by this widget
         glyph_editor (GlyphEditor): The glyph editor widget of the font
             editor
     """
+    # The number of rows created before the height of the viewport is
+    # known.
+    INITIAL_ROWS = 16
+    # The number of rows created in addition to the visible rows.
+    MARGIN_ROWS = 2
+    # The number of rows scrolled by one step of the mouse wheel.
+    SCROLL_ROWS = 3
+    # The number of glyphs behind the shown rows in scroll direction,
+    # whose previews are rendered in advance.
+    PREFETCH_ROWS = 16
+
     def __init__(self, font, glyph_editor):
         Gtk.ListBox.__init__(self)
         self.set_selection_mode(Gtk.SelectionMode.BROWSE)
 
-        self.context = GlyphSelectorContext(font, self)
-
-        self.connect('row-selected', self.__on_row_selected)
         self.__font = font
         self.__glyph_editor = glyph_editor
         self.__editor_context = glyph_editor.get_context()
         self.__editor_context.register_on_changed_callback(
             self.__on_glyph_edited)
+        self.__first_index = 0
+        self.__selected_index = None
+        self.__visible_rows = self.INITIAL_ROWS
+        self.__viewport_height = None
+        self.__binding = False
+        self.__scroll_direction = 1
+        self.__prefetched = []
+        self.__on_selected_callbacks = []
+        self.__on_glyph_changed_callbacks = []
+        self.__on_font_changed_callbacks = []
+        self.__adjustment = Gtk.Adjustment(0, 0, 0, 1, 1, 1)
+        self.__adjustment.connect('value-changed', self.__on_scrolled)
 
-        for i in range(len(self.__font)):
-            row = GlyphRow(self.context, i)
-            row.connect('drag-data-received',
-                self._on_drag_data_received, row)
-            self.add(row)
+        self.context = GlyphSelectorContext(font, self)
+
+        self.connect('row-selected', self.__on_row_selected)
+        self.refresh()
 
         # Select the first row
         if len(font):
-            first_row = self.get_row_at_index(0)
-            self.select_row(first_row)
+            self.select_index(0)
 
+        self.add_events(Gdk.EventMask.SCROLL_MASK |
+            Gdk.EventMask.SMOOTH_SCROLL_MASK)
         self.connect('button-release-event', self.__on_button_release)
-
+        self.connect('scroll-event', self.__on_scroll)
+        self.connect('key-press-event', self.__on_key_press)
+        self.connect('destroy', self.__on_destroy)
 
     def get_context(self):
         """Get the context of the glyph selector.
@@ -477,6 +750,332 @@ class GlyphSelector(Gtk.ListBox):
 
         return self.context
 
+    def get_glyph_editor(self):
+        """Get the glyph editor, that edits the selected glyph.
+
+        Returns:
+            GlyphEditor: The glyph editor
+        """
+
+        return self.__glyph_editor
+
+    def get_adjustment(self):
+        """Get the adjustment with the index of the first visible glyph
+        as value and the number of visible glyphs as page size.
+
+        Returns:
+            Gtk.Adjustment: The adjustment of the glyph selector
+        """
+
+        return self.__adjustment
+
+    def register_on_selected_callback(self, callback):
+        """Register a function that gets called with the index of the
+        selected glyph or None when the selection changes.
+
+        Args:
+            callback (callable): The function
+        """
+        self.__on_selected_callbacks.append(callback)
+
+    def register_on_glyph_changed_callback(self, callback):
+        """Register a function that gets called with the index of a
+        glyph after its bitmap has been edited.
+
+        Args:
+            callback (callable): The function
+        """
+        self.__on_glyph_changed_callbacks.append(callback)
+
+    def register_on_font_changed_callback(self, callback):
+        """Register a function that gets called without arguments after
+        the rows have been refreshed, for example because glyphs have
+        been added, removed or moved.
+
+        Args:
+            callback (callable): The function
+        """
+        self.__on_font_changed_callbacks.append(callback)
+
+    def set_viewport_height(self, height):
+        """Set the height of the area the glyph selector is shown in.
+        This determines the number of rows of the glyph selector.
+
+        Args:
+            height (int): The height in pixels
+        """
+        if height == self.__viewport_height:
+            return
+
+        self.__viewport_height = height
+        self.refresh()
+
+    def __get_row_height(self):
+        """Get the height of a row, either as allocated or estimated
+        from the size of the preview images.
+
+        Returns:
+            int: The height of a row in pixels
+        """
+        row = Gtk.ListBox.get_row_at_index(self, 0)
+        if row and row.get_allocated_height() > 1:
+
+            return row.get_allocated_height()
+
+        return self.context.get_glyph_preview_size() + 4
+
+    def refresh(self):
+        """Create or destroy rows to fill the viewport and bind all rows
+        to the glyphs they show. Call this after glyphs of the font
+        have been added, removed or moved.
+        """
+        if self.__viewport_height:
+            self.__visible_rows = max(
+                1, self.__viewport_height // self.__get_row_height())
+        rows = self.get_children()
+        wanted = min(len(self.__font),
+            self.__visible_rows + self.MARGIN_ROWS)
+        for row in rows[wanted:]:
+            row.destroy()
+        for i in range(len(rows), wanted):
+            row = GlyphRow(self.context, i)
+            row.connect('drag-data-received',
+                self._on_drag_data_received, row)
+            self.add(row)
+            row.show_all()
+
+        if (self.__selected_index is not None and
+                self.__selected_index >= len(self.__font)):
+            self.__selected_index = None
+        self.__adjustment.configure(
+            min(self.__first_index, self.__get_max_first_index()),
+            0, len(self.__font), 1, self.__visible_rows,
+            min(self.__visible_rows, len(self.__font)))
+        self.__bind_rows(rebind=True)
+        for callback in self.__on_font_changed_callbacks:
+            callback()
+
+    def __get_max_first_index(self):
+        return max(0, len(self.__font) - self.__visible_rows)
+
+    def __bind_rows(self, rebind=False):
+        """Bind the rows to the glyphs starting at the first visible
+        glyph and select the row of the selected glyph if it is shown.
+
+        Args:
+            rebind (bool): Whether to bind rows that already show the
+                right index again, because the glyphs of the font have
+                changed
+        """
+        first_index = min(int(self.__adjustment.get_value()),
+            self.__get_max_first_index())
+        if first_index != self.__first_index:
+            self.__scroll_direction = \
+                1 if first_index > self.__first_index else -1
+        self.__first_index = first_index
+        cache = self.context.get_preview_cache()
+        for key in self.__prefetched:
+            cache.cancel(key)
+        self.__binding = True
+        selected_row = None
+        for i, row in enumerate(self.get_children()):
+            index = self.__first_index + i
+            if rebind or row.get_index() != index:
+                row.bind(index)
+            else:
+                row.update()
+            if index == self.__selected_index:
+                selected_row = row
+        if selected_row:
+            Gtk.ListBox.select_row(self, selected_row)
+        else:
+            self.unselect_all()
+        self.__binding = False
+        self.__prefetch_previews()
+
+    def __prefetch_previews(self):
+        """Request the previews of the glyphs following the shown rows in
+        scroll direction. The requests are made after those of the shown
+        rows, so they are served later.
+        """
+        if self.__scroll_direction > 0:
+            start = self.__first_index + len(self.get_children())
+        else:
+            start = self.__first_index - self.PREFETCH_ROWS
+        stop = min(start + self.PREFETCH_ROWS, len(self.__font))
+        cache = self.context.get_preview_cache()
+        preview_size = self.context.get_glyph_preview_size()
+        self.__prefetched = [
+            cache.request(self.__font.get_glyph(i), preview_size)
+                for i in range(max(start, 0), stop)
+        ]
+
+    def __on_destroy(self, widget):
+        """This method gets called when the glyph selector gets destroyed,
+        for example when the font is closed, and stops the rendering of
+        previews.
+
+        Args:
+            widget (Gtk.Widget): The glyph selector
+        """
+        self.context.get_preview_cache().shutdown()
+
+    def __get_row_for_index(self, index):
+        """Get the row bound to a glyph.
+
+        Args:
+            index (int): The index of the glyph
+
+        Returns:
+            GlyphRow: The row or None if the glyph is not shown
+        """
+        if index is None:
+
+            return None
+
+        return Gtk.ListBox.get_row_at_index(self, index - self.__first_index)
+
+    def scroll_to_index(self, index):
+        """Scroll the glyph selector so that a glyph is visible.
+
+        Args:
+            index (int): The index of the glyph
+        """
+        first = self.__first_index
+        if index < first:
+            first = index
+        elif index >= first + self.__visible_rows:
+            first = index - self.__visible_rows + 1
+        self.__adjustment.set_value(first)
+
+    def get_row_at_index(self, index):
+        """Get the row for a glyph, scrolling to the glyph if necessary.
+
+        Args:
+            index (int): The index of the glyph
+
+        Returns:
+            GlyphRow: The row bound to the glyph or None if the font has
+                no glyph with the index
+        """
+        if not 0 <= index < len(self.__font):
+
+            return None
+        self.scroll_to_index(index)
+
+        return self.__get_row_for_index(index)
+
+    def get_selected_index(self):
+        """Get the index of the selected glyph.
+
+        Returns:
+            int: The index of the selected glyph or None
+        """
+
+        return self.__selected_index
+
+    def get_selected_row(self):
+        """Get the row of the selected glyph.
+
+        Returns:
+            GlyphRow: The row of the selected glyph or None if no glyph
+                is selected or the glyph is not shown
+        """
+
+        return self.__get_row_for_index(self.__selected_index)
+
+    def select_row(self, row):
+        """Select the glyph a row is bound to.
+
+        Args:
+            row (GlyphRow): The row or None to clear the selection
+        """
+        self.select_index(row.get_index() if row else None)
+
+    def select_index(self, index):
+        """Select a glyph, scroll to it and bind it to the glyph editor,
+        which then edits the bitmap of the glyph directly.
+
+        Args:
+            index (int): The index of the glyph or None to clear the
+                selection
+        """
+        # Notify about pending edits of the previously selected glyph.
+        self.__editor_context.flush()
+        self.__selected_index = index
+        if index is not None:
+            self.scroll_to_index(index)
+        self.__bind_rows()
+
+        self.__editor_context.bind_glyph(
+            None if index is None else self.__font.get_glyph(index))
+        for callback in self.__on_selected_callbacks:
+            callback(index)
+
+    def __on_scrolled(self, adjustment):
+        """This method gets called when the value of the adjustment of
+        the glyph selector changes.
+
+        Args:
+            adjustment (Gtk.Adjustment): The adjustment
+        """
+        if int(adjustment.get_value()) != self.__first_index:
+            self.__bind_rows()
+
+    def __on_scroll(self, widget, event):
+        """This method gets called when the mouse wheel is turned over
+        the glyph selector.
+
+        Args:
+            widget (Gtk.Widget): The glyph selector
+            event (Gdk.EventScroll): The event which triggered this
+                signal.
+
+        Returns:
+            bool: True to stop the scrolled window around the glyph
+                selector from scrolling as well
+        """
+        has_deltas, _, delta = event.get_scroll_deltas()
+        if not has_deltas:
+            delta = {
+                Gdk.ScrollDirection.UP: -1,
+                Gdk.ScrollDirection.DOWN: 1,
+            }.get(event.direction, 0)
+        self.__adjustment.set_value(
+            self.__adjustment.get_value() + delta * self.SCROLL_ROWS)
+
+        return True
+
+    def __on_key_press(self, widget, event):
+        """This method moves the selection with the cursor keys, also to
+        glyphs that are not shown yet.
+
+        Args:
+            widget (Gtk.Widget): The glyph selector
+            event (Gdk.EventKey): The event which triggered this signal.
+
+        Returns:
+            bool: Whether the key has been handled
+        """
+        if self.__selected_index is None or not len(self.__font):
+
+            return False
+        offset = {
+            Gdk.KEY_Up: -1,
+            Gdk.KEY_Down: 1,
+            Gdk.KEY_Page_Up: -self.__visible_rows,
+            Gdk.KEY_Page_Down: self.__visible_rows,
+            Gdk.KEY_Home: -len(self.__font),
+            Gdk.KEY_End: len(self.__font),
+        }.get(event.keyval)
+        if offset is None:
+
+            return False
+        self.select_index(min(max(self.__selected_index + offset, 0),
+            len(self.__font) - 1))
+
+        return True
+
     def __on_button_release(self, widget, event):
         """This method gets called each time a mouse button gets
         release over the glyph selector. Since after drag and drop
@@ -496,7 +1095,7 @@ class GlyphSelector(Gtk.ListBox):
             return
 
         row = self.get_row_at_y(y)
-        if not row:
+        if not row or row.get_index() == self.__selected_index:
             return
 
         self.select_row(row)
@@ -523,14 +1122,20 @@ class GlyphSelector(Gtk.ListBox):
 
     def __on_glyph_edited(self, data):
         """This method gets called, when the data of the glyph editor
-        widget has changed.
+        widget has changed. The glyph editor edits the selected glyph
+        directly, so only its preview needs to be updated.
 
         Args:
             data (list): The new data of the glyph editor widget
         """
+        if self.__selected_index is None:
+            return
+
         row = self.get_selected_row()
-        if  row:
-            row.update_glyph_data(data)
+        if row:
+            row.update_preview()
+        for callback in self.__on_glyph_changed_callbacks:
+            callback(self.__selected_index)
 
     def __on_row_selected(self, listbox, row):
         """This method gets called, when the selected row changes.
@@ -538,9 +1143,62 @@ class GlyphSelector(Gtk.ListBox):
         Args:
             row (GlyphSelectorRow): The newly selected row
         """
-        self.__editor_context.reset_pixels()
-        if row:
-            self.__glyph_editor.set_data(row.get_glyph_data())
+        if self.__binding or not row:
+            return
+
+        if row.get_index() != self.__selected_index:
+            self.select_index(row.get_index())
+
+class GlyphSelectorView(Gtk.Box):
+    """The glyph selector with a scrollbar.
+
+    The glyph selector is placed in a scrolled window without scrollbars
+    that only clips it, while the scrollbar moves the rows of the glyph
+    selector through its adjustment.
+
+    Args:
+        glyph_selector (GlyphSelector): The glyph selector
+    """
+    def __init__(self, glyph_selector):
+        Gtk.Box.__init__(self, orientation=Gtk.Orientation.HORIZONTAL)
+        self.__glyph_selector = glyph_selector
+
+        self.__viewport = Gtk.ScrolledWindow()
+        self.__viewport.set_policy(Gtk.PolicyType.NEVER,
+            Gtk.PolicyType.EXTERNAL)
+        self.__viewport.add(glyph_selector)
+        # Focusing a row must not move the rows out of the viewport.
+        self.__viewport.get_vadjustment().connect('value-changed',
+            lambda adjustment: adjustment.set_value(0)
+                if adjustment.get_value() else None)
+        self.__viewport.connect('size-allocate', self.__on_size_allocate)
+        self.pack_start(self.__viewport, True, True, 0)
+
+        self.scrollbar = Gtk.Scrollbar(
+            orientation=Gtk.Orientation.VERTICAL,
+            adjustment=glyph_selector.get_adjustment())
+        self.pack_start(self.scrollbar, False, False, 0)
+
+    def get_glyph_selector(self):
+        """Get the glyph selector of the view.
+
+        Returns:
+            GlyphSelector: The glyph selector
+        """
+
+        return self.__glyph_selector
+
+    def __on_size_allocate(self, widget, allocation):
+        """Adjust the number of rows of the glyph selector to the height
+        of the viewport. Rows can not be added while the size is being
+        allocated, so this is deferred until the main loop is idle.
+
+        Args:
+            widget (Gtk.Widget): The viewport
+            allocation (Gdk.Rectangle): The new size of the viewport
+        """
+        GLib.idle_add(self.__glyph_selector.set_viewport_height,
+            allocation.height)
 
 class FontEditorContext(object):
     """The context of the font editor widget.
@@ -650,7 +1308,14 @@ class FontEditor(Gtk.Box):
             self.__on_btn_remove_clicked)
         button_wrapper.pack_start(self.button_remove, True, True, 0)
 
-        glyph_editor_wrapper.pack_start(self.glyph_editor, False, False,
+        # Large glyphs or zoomed glyphs may exceed the window.
+        glyph_editor_scroller = Gtk.ScrolledWindow()
+        glyph_editor_scroller.set_policy(Gtk.PolicyType.AUTOMATIC,
+            Gtk.PolicyType.AUTOMATIC)
+        glyph_editor_scroller.set_propagate_natural_width(True)
+        glyph_editor_scroller.set_propagate_natural_height(True)
+        glyph_editor_scroller.add(self.glyph_editor)
+        glyph_editor_wrapper.pack_start(glyph_editor_scroller, True, True,
             0)
 
         # Pencil
@@ -681,13 +1346,34 @@ class FontEditor(Gtk.Box):
             self.pencil_showcase, False, False, 0)
 
         # GlyphSelector
-        self.glyph_selector_wrapper = Gtk.ScrolledWindow()
         self.glyph_selector = GlyphSelector(
             self.context.get_font(), self.glyph_editor)
-        self.glyph_selector_wrapper.add(self.glyph_selector)
-        self.glyph_selector_wrapper.set_propagate_natural_height(True)
-        self.glyph_selector_wrapper.set_min_content_width(250)
-        self.pack_start(self.glyph_selector_wrapper, False, False, 10)
+        self.glyph_selector_wrapper = GlyphSelectorView(
+            self.glyph_selector)
+
+        # GlyphOverview
+        self.glyph_overview = GlyphOverview(self.context.get_font())
+        self.glyph_overview.set_selected_index(
+            self.glyph_selector.get_selected_index())
+        self.glyph_overview.register_on_selected_callback(
+            self.glyph_selector.select_index)
+        self.glyph_overview.register_on_moved_callback(
+            self.glyph_selector.get_context().move_row)
+        self.glyph_selector.register_on_selected_callback(
+            self.glyph_overview.set_selected_index)
+        self.glyph_selector.register_on_glyph_changed_callback(
+            self.glyph_overview.update_glyph)
+        self.glyph_selector.register_on_font_changed_callback(
+            self.glyph_overview.refresh)
+
+        self.glyph_notebook = Gtk.Notebook()
+        self.glyph_notebook.append_page(self.glyph_selector_wrapper,
+            Gtk.Label(_("List")))
+        self.glyph_notebook.append_page(
+            GlyphOverviewView(self.glyph_overview),
+            Gtk.Label(_("Overview")))
+        self.glyph_notebook.set_size_request(250, -1)
+        self.pack_start(self.glyph_notebook, False, False, 10)
 
     def __on_pencil_selected(self, icon_view):
         """This method gets called when a pencil has been selected.
@@ -777,38 +1463,6 @@ class FontEditor(Gtk.Box):
                 the font handled by this widget
         """
         self.glyph_selector.get_context().add_glyph()
-
-        def row_tick_callback(widget, clock, self):
-            """Gtk.TickCallback
-            A callback that gets called before a new frame.
-
-            Args:
-                widget (Gtk.Widget): The widget this callback has been
-                    added to.
-                clock (Gdk.FrameClock): The frame clock for this widget
-                self (FontEditor): The font editor, explicit is better
-                    than implicit ;)
-
-            Returns:
-                GLib.SOURCE_CONTINUE: if the callback should be called
-                    another time.
-                Glib.SOURCE_REMOVE: if the callback should be removed
-                    from the widget.
-
-            """
-            _, y = widget.translate_coordinates(self.glyph_selector,
-                0, 0)
-            if y == -1:
-
-                return GLib.SOURCE_CONTINUE
-            vadj = self.glyph_selector_wrapper.get_vadjustment()
-            vadj.set_value(int(y))
-
-            return GLib.SOURCE_REMOVE
-
-        row = self.glyph_selector.get_children()[-1]
-        row.add_tick_callback(row_tick_callback, self)
-
         self.button_remove.set_sensitive(True)
 
     def __on_btn_remove_clicked(self, button):
@@ -821,7 +1475,7 @@ class FontEditor(Gtk.Box):
         """
         self.glyph_selector.get_context().remove_glyph()
 
-        if not self.glyph_selector.get_children():
+        if not len(self.get_font()):
             button.set_sensitive(False)
 
 s = c.Storage.get(GlyphSelectorContext)
@@ -24,8 +24,18 @@ drawing glyphs.
 
 Furthermore there is one class for modifiyng the appearance of the
 widget and one for managing its data.
+
+The widget draws from two cached layers, which are split into tiles
+covering a block of pixels of the glyph, so the memory needed does not
+grow with the size of the glyph or the zoom. Only the visible tiles of
+the pixels are created and only their rows that changed since the last
+frame are painted again. The separation lines look the same in most
+tiles, so the grid layer holds one tile for each shape, which is
+rebuilt only when the size or the color change.
 """
 
+from collections import OrderedDict
+import cairo
 import gi
 gi.require_version("Gtk", "3.0")
 gi.require_foreign("cairo")
@@ -33,9 +43,40 @@ from gi.repository import Gtk
 from gi.repository import Gdk
 from gi.repository import GLib
 from gi.repository import GdkPixbuf
-from PIL import Image, ImageDraw
 from . import constants as c
 
+def get_line_points(x0, y0, x1, y1):
+    """Get the points of a line between two points with the algorithm of
+    Bresenham.
+
+    Args:
+        x0 (int): The x coordinate of the start of the line
+        y0 (int): The y coordinate of the start of the line
+        x1 (int): The x coordinate of the end of the line
+        y1 (int): The y coordinate of the end of the line
+
+    Returns:
+        list: The points of the line as tuples of their x and y
+            coordinate, including the start and the end
+    """
+    dx = abs(x1 - x0)
+    dy = -abs(y1 - y0)
+    sx = 1 if x0 < x1 else -1
+    sy = 1 if y0 < y1 else -1
+    error = dx + dy
+    points = [(x0, y0)]
+    while x0 != x1 or y0 != y1:
+        e2 = 2 * error
+        if e2 >= dy:
+            error += dy
+            x0 += sx
+        if e2 <= dx:
+            error += dx
+            y0 += sy
+        points.append((x0, y0))
+
+    return points
+
 class GlyphEditorAttributes(object):
     """This class represents the attributes of a GlyphEditor, for
     example how it looks and how large all pixels of the glyph are
@@ -49,12 +90,15 @@ class GlyphEditorAttributes(object):
     DEFAULT_UNSET_PIXEL_COLOR = [0.8, 0.8, 0.8, 1]
     DEFAULT_PIXEL_COLOR = [0.1, 0.1, 0.1, 1]
     DEFAULT_DRAW_UNSET_PIXELS = False
+    # The bounds of the pixel size when zooming
+    MIN_PIXEL_SIZE = 6
+    MAX_PIXEL_SIZE = 64
 
     def __init__(self, glyph_editor):
         self.__glyph_editor = glyph_editor
         self.__storage = c.Storage.get(self)
         self.__storage.register_changed_callback('pixel_size',
-            lambda key, value: self.__glyph_editor.make_size_request()
+            lambda key, value: self.__glyph_editor.reset_zoom()
         )
         self.__storage.register_changed_callback('pixel_margin',
             lambda key, value: self.__glyph_editor.queue_draw()
@@ -238,19 +282,9 @@ class GlyphEditorPencil(object):
                     representing the mask of the pencil
         """
         self.__mask = mask
-        self.__size = width, height = len(mask), len(mask[0])
-
-        img = Image.new('RGBA', self.__size, (0,0,0,0))
-        draw = ImageDraw.Draw(img)
-        for y, row in zip(range(height), mask):
-            for x, pixel in zip(range(width), row):
-                if pixel == 1:
-                    draw.point((x, y), (0,0,0,255))
-                    data = GLib.Bytes.new(img.tobytes())
-                    self.__pixbuf = GdkPixbuf.Pixbuf.new_from_bytes(
-                        data, GdkPixbuf.Colorspace.RGB, True, 8, width, height,
-                        width * 4
-                    )
+        self.__size = len(mask), len(mask[0])
+
+        self.__pixbuf = c.get_pixbuf_from_rows(mask)
 
     def get_mask(self):
         """Get the mask of the pencil.
@@ -304,9 +338,16 @@ class GlyphEditorContext(object):
     def __init__(self, glyph_editor):
         self.__glyph_size = self.__GLYPH_SIZE[:]
         self.__pixels = self.__get_pixel_list()
+        # The glyph whose bitmap is edited directly or None
+        self.__glyph = None
         self.__parent_glyph_editor = glyph_editor
         self.__on_changed_callbacks = []
+        # The id of the tick callback, that notifies about edits with
+        # the next frame
+        self.__tick_id = None
         self.__pencil_position = [0, 0]
+        # The last position of the pencil during a stroke or None
+        self.__stroke_position = None
         self.__pencils = [
             self.PENCIL_DOT,
             self.PENCIL_SQUARE_SMALL,
@@ -394,13 +435,54 @@ class GlyphEditorContext(object):
 
     def get_pixels(self):
         """Get a reference to the list representing the pixels of a
-        glyph.
+        glyph. This is the data of the bound glyph, so another list is
+        returned after binding another glyph.
 
         Returns:
             list: A list of lists of integers.
         """
         return self.__pixels
 
+    def bind_glyph(self, glyph):
+        """Edit the bitmap of a glyph directly. The pixels are not
+        copied, the glyph editor operates on the data of the glyph, so
+        binding a glyph takes constant time.
+
+        Args:
+            glyph (psflib.GlyphBitmap): The glyph or None to edit blank
+                pixels not belonging to any glyph
+
+        Raises:
+            ValueError: If the size of the glyph differs from the glyph
+                size of the context
+        """
+        if glyph is not None and list(glyph.get_size()) != \
+                self.__glyph_size:
+            raise ValueError(
+                "The glyph should have the size of the glyph editor")
+        # Pending edits belong to the previous glyph.
+        self.flush()
+        self.__glyph = glyph
+        if glyph is None:
+            self.__pixels = self.__get_pixel_list()
+        else:
+            self.__pixels = glyph.get_data()
+        self.__parent_glyph_editor.queue_draw()
+
+    def get_glyph(self):
+        """Get the glyph edited directly by the glyph editor.
+
+        Returns:
+            psflib.GlyphBitmap: The bound glyph or None
+        """
+        return self.__glyph
+
+    def __mark_changed(self):
+        """Increment the generation of the bound glyph after its data
+        has been modified in place."""
+        if self.__glyph is not None:
+            self.__glyph.mark_changed()
+
     def set_pixels(self, data):
         """Set the pixels of the glyph editor.
 
@@ -415,12 +497,11 @@ class GlyphEditorContext(object):
                 "data should have the same dimensions as the glyphs"
             )
 
-        for x in range(width):
-            for y in range(height):
-                self.__pixels[y][x] = data[y][x]
+        for row, new_row in zip(self.__pixels, data):
+            row[:] = new_row
 
-        for callback in self.__on_changed_callbacks:
-            callback(self.__pixels)
+        self.__mark_changed()
+        self.__notify_changed()
 
     def set_glyph_size(self, glyph_size):
         """This method sets the number of pixels representing a glyph.
@@ -428,13 +509,10 @@ class GlyphEditorContext(object):
         Args:
             glyph_size (list):    The size of a glyph [width, height]
         """
+        self.flush()
         self.__glyph_size = list(glyph_size)
-
-        # We do not overwrite self.__pixels here, but modify it. So
-        # if someone have a reference to self.__pixels, for example
-        # over the get_pixels() method, he can still use it.
-        self.__pixels.clear()
-        self.__pixels += self.__get_pixel_list()
+        self.__glyph = None
+        self.__pixels = self.__get_pixel_list()
         self.__parent_glyph_editor.make_size_request()
 
     def get_glyph_size(self):
@@ -451,31 +529,120 @@ class GlyphEditorContext(object):
         Action represents the action on this pixel (self.SET_PIXEL,
         self.CLEAR_PIXEL or self.NONE)
 
+        The on changed callbacks are not called right away, but once
+        with the next frame of the glyph editor, no matter how many
+        events have been handled until then. Use flush to call them
+        earlier.
+
+        Consecutive events setting or clearing pixels form a stroke,
+        which lasts until an event without action or a call of
+        end_stroke. The pencil is applied along the line from the
+        previous position of the stroke to the new one, so fast mouse
+        movements do not leave gaps.
+
         Args:
             x (int): The x coordinate of the pixel
             y (int): The y coordinate of the pixel
             action (int): The action to perform on this pixel (set,
                     clear or none)
+
+        Returns:
+            tuple: The x and y coordinate of the upper left pixel and the
+                width and height of the rectangle of modified pixels or
+                None if no pixel has been modified
         """
         self.__pencil_position[:] = x, y
         if action == self.SET_PIXEL:
-            for x, y in self.get_pencil_affected_pixels():
-                self.__pixels[y][x] = 1
+            value = 1
         elif action == self.CLEAR_PIXEL:
-            for x, y in self.get_pencil_affected_pixels():
-                self.__pixels[y][x] = 0
+            value = 0
+        else:
+            self.end_stroke()
+
+            return None
+
+        start = self.__stroke_position or (x, y)
+        self.__stroke_position = x, y
+        pencil = self.__pencils[self.__current_pencil]
+        width, height = pencil.get_size()
+        mask = pencil.get_mask()
+        offsets = [
+            (i - width // 2, j - height // 2)
+                for i in range(width) for j in range(height) if mask[i][j]
+        ]
+        glyph_width, glyph_height = self.__glyph_size
+        affected_pixels = {
+            (px + dx, py + dy)
+                for px, py in get_line_points(*start, x, y)
+                    for dx, dy in offsets
+                        if 0 <= px + dx < glyph_width and
+                            0 <= py + dy < glyph_height
+        }
+        if not affected_pixels:
+
+            return None
+
+        for px, py in affected_pixels:
+            self.__pixels[py][px] = value
+
+        self.__mark_changed()
+        if self.__tick_id is None:
+            glyph_editor = self.__parent_glyph_editor
+            if glyph_editor.get_frame_clock() is None:
+                # Without a frame clock no frames are drawn.
+                self.__notify_changed()
+            else:
+                self.__tick_id = glyph_editor.add_tick_callback(
+                    self.__on_tick)
+
+        xs = [px for px, _ in affected_pixels]
+        ys = [py for _, py in affected_pixels]
+
+        return (min(xs), min(ys), max(xs) - min(xs) + 1,
+            max(ys) - min(ys) + 1)
+
+    def end_stroke(self):
+        """End the current stroke, so the next pixel event does not
+        continue it."""
+        self.__stroke_position = None
+
+    def __on_tick(self, widget, frame_clock):
+        """This method gets called with the next frame after pixels have
+        been edited.
+
+        Args:
+            widget (GlyphEditor): The glyph editor
+            frame_clock (Gdk.FrameClock): The frame clock of the glyph
+                editor
 
+        Returns:
+            bool: False to remove the tick callback
+        """
+        self.__tick_id = None
+        self.__notify_changed()
+
+        return False
+
+    def __notify_changed(self):
+        """Call all on changed callbacks and cancel a pending
+        notification."""
+        if self.__tick_id is not None:
+            self.__parent_glyph_editor.remove_tick_callback(self.__tick_id)
+            self.__tick_id = None
         for callback in self.__on_changed_callbacks:
             callback(self.__pixels)
 
+    def flush(self):
+        """Call the on changed callbacks right away, if pixels have been
+        edited since they were called the last time.
+        """
+        if self.__tick_id is not None:
+            self.__notify_changed()
+
     def reset_pixels(self):
-        """Clear all pixels"""
-        # We do not overwrite self.__pixels here, but modify it. So
-        # if someone have a reference to self.__pixels, for example
-        # over the get_pixels() method, he can still use it.
-        self.__pixels.clear()
-        self.__pixels += self.__get_pixel_list()
-        self.__parent_glyph_editor.queue_draw()
+        """Show blank pixels. A bound glyph is unbound and stays
+        unchanged."""
+        self.bind_glyph(None)
 
     def register_on_changed_callback(self, callback):
         """Register a callback that should be called every time the
@@ -505,23 +672,7 @@ class GlyphEditorContext(object):
             GdkPixBuf.PixBuf: The pixbuf with the current selected glyph
                     bitmap.
         """
-        width, height = size = self.__glyph_size
-        data = self.__pixels
-
-        img = Image.new('RGBA', size, (0,0,0,0))
-        draw = ImageDraw.Draw(img)
-        for y, row in zip(range(height), data):
-            for x, pixel in zip(range(width), row):
-                if pixel == 1:
-                    draw.point((x, y), (0,0,0,255))
-
-        data = img.tobytes()
-        w, h = img.size
-        data = GLib.Bytes.new(data)
-        pixbuf = GdkPixbuf.Pixbuf.new_from_bytes(data,
-        GdkPixbuf.Colorspace.RGB, True, 8, w, h, w * 4)
-
-        return pixbuf
+        return c.get_pixbuf_from_rows(self.__pixels)
 
     def set_current_glyph_from_pixbuf(self, pixbuf):
         """Update the data of the current glyph bitmap from a pixbuf.
@@ -536,22 +687,41 @@ class GlyphEditorContext(object):
         if size != self.__glyph_size:
             return
 
-        data = pixbuf.get_pixels()
+        pixels = pixbuf.get_pixels()
         stride = pixbuf.get_rowstride()
-        mode = 'RGBA'
-        img = Image.frombytes(mode, size, data, 'raw', mode, stride)
-
+        channels = pixbuf.get_n_channels()
         data = []
-
-        for y in range(size[1]):
-            row  = []
-            for x in range(size[0]):
-                i = 1 if sum(img.getpixel((x,y))) else 0
-                row.append(i)
-            data.append(row)
+        for y in range(h):
+            start = y * stride
+            line = pixels[start:start + w * channels]
+            data.append([
+                1 if any(line[x:x + channels]) else 0
+                    for x in range(0, w * channels, channels)
+            ])
 
         self.set_pixels(data)
 
+    def get_pencil_area(self):
+        """Get the rectangle of pixels covered by the pencil at its
+        current position.
+
+        Returns:
+            tuple: The x and y coordinate of the upper left pixel and
+                the width and height of the rectangle in pixels or None
+                if the pencil is outside of the glyph.
+        """
+        size = self.__pencils[self.__current_pencil].get_size()
+        pos = self.__pencil_position
+        x0 = max(pos[0] - size[0] // 2, 0)
+        y0 = max(pos[1] - size[1] // 2, 0)
+        x1 = min(pos[0] - size[0] // 2 + size[0], self.__glyph_size[0])
+        y1 = min(pos[1] - size[1] // 2 + size[1], self.__glyph_size[1])
+        if x0 >= x1 or y0 >= y1:
+
+            return None
+
+        return x0, y0, x1 - x0, y1 - y0
+
     def get_pencil_affected_pixels(self):
         """Get all the pixels that arre affected by the current position
         of the pencil over the glyph editor.
@@ -595,9 +765,20 @@ class GlyphEditor(Gtk.Widget):
     The size of a glyph in pixels can be set with the set_glyph_size
     method of the GlyphEditorContext class. Simply get an instance with
     the get_context method.
+
+    Turning the mouse wheel with the control key pressed zooms the
+    glyph. Glyphs larger than the window should be scrolled by putting
+    the widget into a Gtk.ScrolledWindow.
     """
 
     __gtype_name__ = 'GlyphEditor'
+    # The change of the pixel size by one step of the mouse wheel
+    ZOOM_STEP = 2
+    # The maximum width and height of a tile of the pixels in pixels of
+    # the screen
+    TILE_SIZE = 256
+    # The number of tiles kept in addition to the visible ones
+    MAX_TILES = 64
 
     def __init__(self, *args, **kwds):
         super().__init__(*args, **kwds)
@@ -605,6 +786,17 @@ class GlyphEditor(Gtk.Widget):
         self.__context = None
         self.__attrs = None
         self.__requested_size = None
+        self.__pixel_key = None
+        # The tiles of the pixels by their column and row, see
+        # __get_tile
+        self.__tiles = OrderedDict()
+        self.__grid_key = None
+        # The tiles of the grid by their shape, see __get_grid_tile
+        self.__grid_tiles = {}
+        # The scrolled distance not yet turned into a zoom step
+        self.__zoom_delta = 0
+        # The pixel size set by zooming, None if the stored one is used
+        self.__pixel_size = None
 
         self.set_context(GlyphEditorContext(self))
         self.set_attributes(GlyphEditorAttributes(self))
@@ -621,6 +813,12 @@ class GlyphEditor(Gtk.Widget):
             self.__set_draw_pencil(False)
         )
 
+        # Tick callbacks are not called for unrealized widgets.
+        self.connect(
+            'unrealize',
+            lambda widget: self.__context.flush()
+        )
+
     def __set_draw_pencil(self, draw):
         """Set whether to draw the pencil of the glyph editor or not.
 
@@ -631,7 +829,36 @@ class GlyphEditor(Gtk.Widget):
             draw (bool): Whether to show the pencil or not.
         """
         self.__context.set_mouse_over_widget(draw)
-        self.queue_draw()
+        self.__context.end_stroke()
+        self.__queue_draw_pencil()
+
+    def __queue_draw_pencil(self):
+        """Invalidate the area of the pixels covered by the pencil, so
+        they and the outline of the pencil are drawn again.
+        """
+        self.__queue_draw_pixels(self.__context.get_pencil_area())
+
+    def __queue_draw_pixels(self, area):
+        """Invalidate a rectangle of pixels of the glyph including the
+        outline of the pencil around them.
+
+        Args:
+            area (tuple): The x and y coordinate of the upper left pixel
+                and the width and height of the rectangle in pixels or
+                None
+        """
+        if area is None:
+            return
+        x, y, width, height = area
+        pixel_size = self.__get_pixel_size()
+        # The outline of the pencil is wider than the pixels.
+        padding = 2
+        self.queue_draw_area(
+            x * pixel_size - padding,
+            y * pixel_size - padding,
+            width * pixel_size + 2 * padding,
+            height * pixel_size + 2 * padding
+        )
 
     def get_data(self):
         """Get a reference to the data representing the pixels of a
@@ -664,7 +891,6 @@ class GlyphEditor(Gtk.Widget):
             context (GlyphEditorContext): The context of the widget
         """
         self.__context = context
-        self.__pixels = context.get_pixels()
 
         self.make_size_request()
 
@@ -676,12 +902,41 @@ class GlyphEditor(Gtk.Widget):
         """
         return self.__context
 
+    def __get_pixel_size(self):
+        """Get the total size of a pixel of the glyph on the screen. The
+        zoom of the widget overrides the stored pixel size.
+
+        Returns:
+            int: The total size of a pixel on the screen
+        """
+        if self.__pixel_size is not None:
+
+            return self.__pixel_size
+
+        return self.__attrs.get_pixel_size()
+
+    def __get_pixel_draw_size(self):
+        """Get the width and height of a pixel drawn on the screen.
+
+        Returns:
+            int: Width and height of a pixel drawn on the screen
+        """
+        return self.__get_pixel_size() - 2 * self.__attrs.get_pixel_margin()
+
+    def reset_zoom(self):
+        """Drop the zoom of the widget and use the stored pixel size
+        again.
+        """
+        self.__pixel_size = None
+        self.__zoom_delta = 0
+        self.make_size_request()
+
     def make_size_request(self):
         """Let the widget request the size it needs for itself.
         Should be called before realization.
         """
         if self.__context and self.__attrs:
-            pixel_size = self.__attrs.get_pixel_size()
+            pixel_size = self.__get_pixel_size()
             glyph_size = self.__context.get_glyph_size()
 
             self.requested_size = (
@@ -713,6 +968,226 @@ class GlyphEditor(Gtk.Widget):
         """
         return self.__attrs
 
+    def __get_visible_tiles(self, columns, rows):
+        """Get the tiles covering the visible pixels.
+
+        Args:
+            columns (range): The visible columns of pixels
+            rows (range): The visible rows of pixels
+
+        Returns:
+            tuple: The number of pixels of the glyph per tile in each
+                direction and a list with the column and the row of
+                each visible tile
+        """
+        cells = max(1, self.TILE_SIZE // self.__get_pixel_size())
+        if not columns or not rows:
+
+            return cells, []
+
+        return cells, [
+            (tile_column, tile_row)
+                for tile_row in range(rows.start // cells,
+                    (rows.stop - 1) // cells + 1)
+                    for tile_column in range(columns.start // cells,
+                        (columns.stop - 1) // cells + 1)
+        ]
+
+    def __get_tile_size(self, tile_column, tile_row, cells):
+        """Get the number of columns and rows of pixels of a tile, which
+        is smaller at the right and the bottom of the glyph.
+
+        Args:
+            tile_column (int): The column of the tile
+            tile_row (int): The row of the tile
+            cells (int): The number of pixels of the glyph per tile in
+                each direction
+
+        Returns:
+            tuple: The number of columns and rows
+        """
+        width, height = self.__context.get_glyph_size()
+
+        return (min(cells, width - tile_column * cells),
+            min(cells, height - tile_row * cells))
+
+    def __draw_grid(self, cr, columns, rows):
+        """Paint the tiles of the grid layer over the visible pixels.
+        The tiles are rendered again if the size or the color of the
+        separation lines changed.
+
+        Args:
+            cr (cairo.Context): The cairo context of the widget
+            columns (range): The visible columns of pixels
+            rows (range): The visible rows of pixels
+        """
+        glyph_size = tuple(self.__context.get_glyph_size())
+        pixel_size = self.__get_pixel_size()
+        color = tuple(self.__attrs.get_seperation_line_color())
+        key = glyph_size, pixel_size, color
+        if key != self.__grid_key:
+            self.__grid_key = key
+            self.__grid_tiles.clear()
+        width, height = glyph_size
+        cells, tiles = self.__get_visible_tiles(columns, rows)
+        for tile_column, tile_row in tiles:
+            tile_columns, tile_rows = self.__get_tile_size(tile_column,
+                tile_row, cells)
+            # The outer lines of the glyph are not drawn.
+            shape = (tile_columns, tile_rows, tile_column == 0,
+                tile_row == 0,
+                tile_column * cells + tile_columns == width,
+                tile_row * cells + tile_rows == height)
+            surface = self.__grid_tiles.get(shape)
+            if surface is None:
+                surface = self.__grid_tiles[shape] = \
+                    self.__render_grid_tile(cr, shape)
+            cr.set_source_surface(surface,
+                tile_column * cells * pixel_size,
+                tile_row * cells * pixel_size)
+            cr.paint()
+
+    def __render_grid_tile(self, cr, shape):
+        """Render the separation lines of a tile. The lines between two
+        tiles are split between both of them.
+
+        Args:
+            cr (cairo.Context): The cairo context of the widget
+            shape (tuple): The number of columns and rows of the tile
+                and whether it is at the left, the top, the right or the
+                bottom of the glyph
+
+        Returns:
+            cairo.Surface: The surface of the tile
+        """
+        columns, rows, left, top, right, bottom = shape
+        pixel_size = self.__get_pixel_size()
+        surface = cr.get_target().create_similar(
+            cairo.CONTENT_COLOR_ALPHA, columns * pixel_size,
+            rows * pixel_size)
+        layer_cr = cairo.Context(surface)
+        layer_cr.set_source_rgba(*self.__attrs.get_seperation_line_color())
+        layer_cr.set_line_width(1)
+        for i in range(int(left), columns + 1 - int(right)):
+            layer_cr.move_to(i * pixel_size, 0)
+            layer_cr.line_to(i * pixel_size, rows * pixel_size)
+        for i in range(int(top), rows + 1 - int(bottom)):
+            layer_cr.move_to(0, i * pixel_size)
+            layer_cr.line_to(columns * pixel_size, i * pixel_size)
+        layer_cr.stroke()
+
+        return surface
+
+    def __draw_pixels(self, cr, columns, rows):
+        """Paint the tiles covering the visible pixels. The rows of the
+        tiles, that changed since they were drawn the last time, are
+        rendered again before. All tiles are dropped if the size or the
+        colors of the pixels changed.
+
+        Args:
+            cr (cairo.Context): The cairo context of the widget
+            columns (range): The visible columns of pixels
+            rows (range): The visible rows of pixels. The other rows of
+                the tiles are updated when they become visible.
+        """
+        glyph_size = tuple(self.__context.get_glyph_size())
+        pixel_size = self.__get_pixel_size()
+        pixel_margin = self.__attrs.get_pixel_margin()
+        colors = [(tuple(self.__attrs.get_pixel_color()), True)]
+        if self.__attrs.get_draw_unset_pixels():
+            colors.append(
+                (tuple(self.__attrs.get_unset_pixel_color()), False))
+        key = glyph_size, pixel_size, pixel_margin, tuple(colors)
+        if key != self.__pixel_key:
+            self.__pixel_key = key
+            self.__tiles.clear()
+
+        pixels = self.__context.get_pixels()
+        cells, tiles = self.__get_visible_tiles(columns, rows)
+        for tile_column, tile_row in tiles:
+            surface, drawn_rows = self.__get_tile(cr, tile_column,
+                tile_row, cells)
+            left = tile_column * cells
+            right = left + self.__get_tile_size(tile_column, tile_row,
+                cells)[0]
+            top = tile_row * cells
+            dirty = [y for y in range(max(top, rows.start),
+                    min(top + cells, rows.stop))
+                if pixels[y][left:right] != drawn_rows[y - top]]
+            if dirty:
+                self.__render_rows(surface, left, right, top, dirty,
+                    colors)
+                for y in dirty:
+                    drawn_rows[y - top] = pixels[y][left:right]
+            cr.set_source_surface(surface, left * pixel_size,
+                top * pixel_size)
+            cr.paint()
+        # The least recently shown tiles are dropped first.
+        while len(self.__tiles) > self.MAX_TILES + len(tiles):
+            self.__tiles.popitem(last=False)
+
+    def __get_tile(self, cr, tile_column, tile_row, cells):
+        """Get a tile of the pixels and create it if it does not exist.
+
+        Args:
+            cr (cairo.Context): The cairo context of the widget
+            tile_column (int): The column of the tile
+            tile_row (int): The row of the tile
+            cells (int): The number of pixels of the glyph per tile in
+                each direction
+
+        Returns:
+            list: The surface of the tile and the parts of the rows of
+                the glyph as they are drawn on it
+        """
+        tile = self.__tiles.get((tile_column, tile_row))
+        if tile is not None:
+            self.__tiles.move_to_end((tile_column, tile_row))
+
+            return tile
+        pixel_size = self.__get_pixel_size()
+        columns, rows = self.__get_tile_size(tile_column, tile_row, cells)
+        surface = cr.get_target().create_similar(
+            cairo.CONTENT_COLOR_ALPHA, columns * pixel_size,
+            rows * pixel_size)
+        tile = self.__tiles[tile_column, tile_row] = [surface,
+            [None] * rows]
+
+        return tile
+
+    def __render_rows(self, surface, left, right, top, rows, colors):
+        """Render rows of pixels into a tile.
+
+        Args:
+            surface (cairo.Surface): The surface of the tile
+            left (int): The first column of pixels of the tile
+            right (int): The column of pixels after the tile
+            top (int): The first row of pixels of the tile
+            rows (list): The rows of pixels to render
+            colors (list): The colors of the set and unset pixels
+        """
+        pixel_size = self.__get_pixel_size()
+        pixel_draw_size = self.__get_pixel_draw_size()
+        pixel_margin = self.__attrs.get_pixel_margin()
+        pixels = self.__context.get_pixels()
+        layer_cr = cairo.Context(surface)
+        layer_cr.set_operator(cairo.OPERATOR_CLEAR)
+        for y in rows:
+            layer_cr.rectangle(0, (y - top) * pixel_size,
+                (right - left) * pixel_size, pixel_size)
+        layer_cr.fill()
+        layer_cr.set_operator(cairo.OPERATOR_OVER)
+        # One path per color
+        for color, value in colors:
+            layer_cr.set_source_rgba(*color)
+            for y in rows:
+                y0 = (y - top) * pixel_size + pixel_margin
+                for x, pixel in enumerate(pixels[y][left:right]):
+                    if bool(pixel) == value:
+                        layer_cr.rectangle(x * pixel_size + pixel_margin,
+                            y0, pixel_draw_size, pixel_draw_size)
+            layer_cr.fill()
+
     def do_draw(self, cr):
         """Gets called, wenn the widget should draw itself.
 
@@ -726,53 +1201,21 @@ class GlyphEditor(Gtk.Widget):
         )
         cr.set_source_rgba(*list(bg_color))
         cr.paint()
-        # draw a diagonal line
-        allocation = self.get_allocation()
-        cr.set_source_rgba(*self.__attrs.get_pixel_color())
-        cr.set_line_width(1)
+
+        # Only the pixels intersecting the clip rectangle are drawn.
         glyph_size = self.__context.get_glyph_size()
-        pixels = self.__pixels
-        pixel_size = self.__attrs.get_pixel_size()
-        pixel_draw_size = self.__attrs.get_pixel_draw_size()
-        pixel_margin = self.__attrs.get_pixel_margin()
+        pixel_size = self.__get_pixel_size()
+        x1, y1, x2, y2 = cr.clip_extents()
+        columns = range(max(int(x1 // pixel_size), 0),
+            min(int(-(-x2 // pixel_size)), glyph_size[0]))
+        rows = range(max(int(y1 // pixel_size), 0),
+            min(int(-(-y2 // pixel_size)), glyph_size[1]))
 
-        for y, row in zip(range(glyph_size[1]), pixels):
-            for x, i in zip(range(glyph_size[0]), row):
-                if i:
-                    cr.rectangle(
-                        x * pixel_size + pixel_margin,
-                        y * pixel_size + pixel_margin,
-                        pixel_draw_size,
-                        pixel_draw_size
-                    )
-                    cr.fill()
-        cr.stroke()
-
-        if self.__attrs.get_draw_unset_pixels():
-            cr.set_source_rgba(*self.__attrs.get_unset_pixel_color())
-
-            for y, row in zip(range(glyph_size[1]), pixels):
-                for x, i in zip(range(glyph_size[0]), row):
-                    if not i:
-                        cr.rectangle(
-                            x * pixel_size + pixel_margin,
-                            y * pixel_size + pixel_margin,
-                            pixel_draw_size,
-                            pixel_draw_size
-                        )
-                        cr.fill()
-            cr.stroke()
+        self.__draw_pixels(cr, columns, rows)
 
         # Seperation lines
         if self.__attrs.get_seperation_lines():
-            cr.set_source_rgba(*self.__attrs.get_seperation_line_color())
-            for i in range(1, glyph_size[0]):
-                cr.move_to(i * pixel_size, 0)
-                cr.line_to(i * pixel_size, pixel_size * glyph_size[1])
-                for i in range(1, glyph_size[1]):
-                    cr.move_to(0, i * pixel_size)
-                    cr.line_to(pixel_size * glyph_size[0], i * pixel_size)
-            cr.stroke()
+            self.__draw_grid(cr, columns, rows)
 
         # Pencil
         if self.__context.get_mouse_over_widget():
@@ -781,6 +1224,8 @@ class GlyphEditor(Gtk.Widget):
             affected_pixels = self.__context.get_pencil_affected_pixels()
 
             for pixel in affected_pixels:
+                if pixel[0] not in columns or pixel[1] not in rows:
+                    continue
                 cr.rectangle(
                     pixel[0] * pixel_size,
                     pixel[1] * pixel_size,
@@ -789,7 +1234,6 @@ class GlyphEditor(Gtk.Widget):
                 )
             cr.stroke()
 
-
     def do_motion_notify_event(self, e):
         """This method gets called, when there is a mouse motion over
         the widget.
@@ -805,8 +1249,8 @@ class GlyphEditor(Gtk.Widget):
             state = e.state
 
         if 0 < x < self.requested_size[0] and 0 < y < self.requested_size[1]:
-            x = int(x / self.__attrs.get_pixel_size())
-            y = int(y / self.__attrs.get_pixel_size())
+            x = int(x / self.__get_pixel_size())
+            y = int(y / self.__get_pixel_size())
 
             if state & Gdk.ModifierType.BUTTON1_MASK:
                 action = GlyphEditorContext.SET_PIXEL
@@ -815,8 +1259,11 @@ class GlyphEditor(Gtk.Widget):
             else:
                 action = GlyphEditorContext.NONE
 
-            self.__context.handle_pixel_event(x,y, action)
-            self.queue_draw()
+            # The pencil is drawn at its old and at its new position.
+            self.__queue_draw_pencil()
+            self.__queue_draw_pixels(
+                self.__context.handle_pixel_event(x,y, action))
+            self.__queue_draw_pencil()
 
     def do_button_press_event(self, event):
         """This method gets called, when a mousebutton gets pressed in
@@ -830,9 +1277,12 @@ class GlyphEditor(Gtk.Widget):
         button = event.button
 
         if 0 < x < self.requested_size[0] and 0 < y < self.requested_size[1]:
-            x = int(x / self.__attrs.get_pixel_size())
-            y = int(y / self.__attrs.get_pixel_size())
+            x = int(x / self.__get_pixel_size())
+            y = int(y / self.__get_pixel_size())
 
+            self.__queue_draw_pencil()
+            # Each press starts a new stroke.
+            self.__context.end_stroke()
             if button == 1: # Left mouse button
                 self.__context.handle_pixel_event(
                     x, y, GlyphEditorContext.SET_PIXEL
@@ -841,7 +1291,59 @@ class GlyphEditor(Gtk.Widget):
                 self.__context.handle_pixel_event(
                     x, y, GlyphEditorContext.CLEAR_PIXEL
                 )
-            self.queue_draw()
+            self.__queue_draw_pencil()
+
+    def do_button_release_event(self, event):
+        """This method gets called, when a mousebutton gets released and
+        ends the current stroke.
+
+        Args:
+            event (Gdk.EventButton): The event of the button release
+        """
+        self.__context.end_stroke()
+
+    def do_scroll_event(self, event):
+        """This method gets called, when the mouse wheel is turned over
+        the widget. With the control key pressed it zooms the glyph,
+        otherwise the event is left to a surrounding scrolled window.
+
+        Args:
+            event (Gdk.EventScroll): The event of the scrolling
+
+        Returns:
+            bool: True if the glyph has been zoomed
+        """
+        if not event.state & Gdk.ModifierType.CONTROL_MASK:
+
+            return False
+
+        if event.direction == Gdk.ScrollDirection.UP:
+            step = 1
+        elif event.direction == Gdk.ScrollDirection.DOWN:
+            step = -1
+        elif event.direction == Gdk.ScrollDirection.SMOOTH:
+            # Touchpads send many small deltas, which are summed up
+            # until they make a whole step.
+            self.__zoom_delta -= event.delta_y
+            step = int(self.__zoom_delta)
+            self.__zoom_delta -= step
+        else:
+            step = 0
+        if not step:
+
+            return True
+        pixel_size = min(max(
+            self.__get_pixel_size() + step * self.ZOOM_STEP,
+            GlyphEditorAttributes.MIN_PIXEL_SIZE),
+            GlyphEditorAttributes.MAX_PIXEL_SIZE)
+        # The zoom only lasts for the widget, the stored pixel size is
+        # the default of the user.
+        self.__pixel_size = max(pixel_size,
+            2 * self.__attrs.get_pixel_margin() + 1)
+        self.make_size_request()
+        self.queue_draw()
+
+        return True
 
     def do_realize(self):
         """This method creates the Gdk ressources associated with the
@@ -861,9 +1363,12 @@ class GlyphEditor(Gtk.Widget):
             Gdk.EventMask.BUTTON1_MOTION_MASK |
             Gdk.EventMask.BUTTON3_MOTION_MASK |
             Gdk.EventMask.BUTTON_PRESS_MASK |
+            Gdk.EventMask.BUTTON_RELEASE_MASK |
             Gdk.EventMask.POINTER_MOTION_HINT_MASK |
             Gdk.EventMask.ENTER_NOTIFY_MASK |
-            Gdk.EventMask.LEAVE_NOTIFY_MASK
+            Gdk.EventMask.LEAVE_NOTIFY_MASK |
+            Gdk.EventMask.SCROLL_MASK |
+            Gdk.EventMask.SMOOTH_SCROLL_MASK
         )
 
         WAT = Gdk.WindowAttributesType
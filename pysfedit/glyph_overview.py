@@ -0,0 +1,482 @@
+#! /usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Copyright (c) 2018 by Karsten Lehmann <mail@kalehmann.de>
+#
+#    This file is part of PySFedit.
+#
+#    PySFedit is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    PySFedit is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    long with PySFedit. If not, see <http://www.gnu.org/licenses/>.
+
+
+"""
+This module contains an overview of all glyphs of a font, like a
+character map.
+
+The overview is a single widget drawn with cairo. The glyphs are
+rendered into an atlas surface once and copied from there onto the
+screen, so even fonts with tens of thousands of glyphs need no widget
+per glyph. Only the visible glyphs are rendered and a glyph edited in
+the glyph editor only redraws its own cell.
+"""
+
+import math
+
+import cairo
+import gi
+gi.require_version("Gtk", "3.0")
+gi.require_foreign("cairo")
+from gi.repository import Gtk
+from gi.repository import Gdk
+
+# Maps pixels with the value 1 to opaque pixels of an A8 surface.
+A8_TABLE = bytes([0, 255]) + bytes(254)
+
+class GlyphAtlas(object):
+    """An alpha only surface with the bitmaps of all glyphs of a font.
+
+    The glyphs are arranged in a grid that is about as wide as high,
+    so that the surface stays within the size limits of cairo. Glyphs
+    are rendered on demand and after they have been invalidated.
+
+    Args:
+        font (psflib.PcScreenFont): The font
+    """
+    def __init__(self, font):
+        self.__font = font
+        self.__surface = None
+        self.__columns = 0
+        self.__capacity = 0
+        self.__rendered = bytearray()
+        self.refresh()
+
+    def refresh(self):
+        """Invalidate all glyphs, for example after glyphs have been
+        added, removed or moved. The surface is reallocated if the grid
+        is too small for the font.
+        """
+        width, height = self.__font.get_header().size
+        count = len(self.__font)
+        columns = max(1, math.ceil(math.sqrt(count)))
+        if self.__surface is None or count > self.__capacity:
+            rows = max(1, math.ceil(count / columns))
+            self.__columns = columns
+            self.__capacity = columns * rows
+            self.__surface = cairo.ImageSurface(cairo.FORMAT_A8,
+                columns * width, rows * height)
+        self.__rendered = bytearray(count)
+
+    def invalidate(self, index):
+        """Render a glyph again the next time it is needed.
+
+        Args:
+            index (int): The index of the glyph
+        """
+        if 0 <= index < len(self.__rendered):
+            self.__rendered[index] = 0
+
+    def get_surface(self):
+        """Get the surface of the atlas.
+
+        Returns:
+            cairo.ImageSurface: The surface
+        """
+
+        return self.__surface
+
+    def get_glyph_position(self, index):
+        """Get the position of a glyph on the surface of the atlas,
+        rendering it if necessary.
+
+        Args:
+            index (int): The index of the glyph
+
+        Returns:
+            tuple: The x and y coordinates of the glyph on the surface
+        """
+        width, height = self.__font.get_header().size
+        row, column = divmod(index, self.__columns)
+        x, y = column * width, row * height
+        if not self.__rendered[index]:
+            self.__render(index, x, y)
+            self.__rendered[index] = 1
+
+        return x, y
+
+    def __render(self, index, x, y):
+        """Render a glyph onto the surface.
+
+        Args:
+            index (int): The index of the glyph
+            x (int): The x coordinate of the glyph on the surface
+            y (int): The y coordinate of the glyph on the surface
+        """
+        glyph = self.__font.get_glyph(index)
+        width = glyph.get_size()[0]
+        stride = self.__surface.get_stride()
+        self.__surface.flush()
+        data = self.__surface.get_data()
+        offset = y * stride + x
+        for row in glyph.get_data():
+            data[offset:offset + width] = bytes(row).translate(A8_TABLE)
+            offset += stride
+        self.__surface.mark_dirty()
+
+class GlyphOverview(Gtk.DrawingArea):
+    """A grid with all glyphs of a font.
+
+    Clicking a glyph selects it, dragging a glyph onto another one moves
+    it there. The overview shows the rows of glyphs starting at the
+    value of its adjustment in pixels, which should be attached to a
+    scrollbar.
+
+    Args:
+        font (psflib.PcScreenFont): The font
+    """
+    DEFAULT_SCALE = 2
+    # The space around each glyph in pixels
+    PADDING = 2
+    SELECTION_COLOR = (0.21, 0.52, 0.89, 0.5)
+    DROP_TARGET_COLOR = (0.21, 0.52, 0.89, 1.0)
+    # The number of rows scrolled by one step of the mouse wheel.
+    SCROLL_ROWS = 3
+
+    def __init__(self, font):
+        Gtk.DrawingArea.__init__(self)
+        self.__font = font
+        self.__atlas = GlyphAtlas(font)
+        self.__scale = self.DEFAULT_SCALE
+        self.__columns = 1
+        self.__selected_index = None
+        self.__drag_index = None
+        self.__drop_index = None
+        self.__on_selected_callbacks = []
+        self.__on_moved_callbacks = []
+        self.__adjustment = Gtk.Adjustment(0, 0, 0, 1, 1, 1)
+        self.__adjustment.connect('value-changed',
+            lambda adjustment: self.queue_draw())
+
+        self.add_events(
+            Gdk.EventMask.BUTTON_PRESS_MASK |
+            Gdk.EventMask.BUTTON_RELEASE_MASK |
+            Gdk.EventMask.BUTTON1_MOTION_MASK |
+            Gdk.EventMask.SCROLL_MASK |
+            Gdk.EventMask.SMOOTH_SCROLL_MASK
+        )
+        self.connect('size-allocate', self.__on_size_allocate)
+        width, height = self.get_cell_size()
+        self.set_size_request(width, height)
+
+    def get_adjustment(self):
+        """Get the adjustment with the offset of the first visible row
+        in pixels.
+
+        Returns:
+            Gtk.Adjustment: The adjustment of the overview
+        """
+
+        return self.__adjustment
+
+    def register_on_selected_callback(self, callback):
+        """Register a function that gets called with the index of a
+        glyph when it has been clicked.
+
+        Args:
+            callback (callable): The function
+        """
+        self.__on_selected_callbacks.append(callback)
+
+    def register_on_moved_callback(self, callback):
+        """Register a function that gets called with the old and the
+        new index of a glyph when it has been dragged onto another
+        glyph. The function is responsible for moving the glyph in the
+        font and calling refresh afterwards.
+
+        Args:
+            callback (callable): The function
+        """
+        self.__on_moved_callbacks.append(callback)
+
+    def get_cell_size(self):
+        """Get the size of the cell of each glyph on the screen.
+
+        Returns:
+            tuple: The width and the height of a cell in pixels
+        """
+        width, height = self.__font.get_header().size
+
+        return (width * self.__scale + 2 * self.PADDING,
+            height * self.__scale + 2 * self.PADDING)
+
+    def get_cell_rectangle(self, index):
+        """Get the area of the cell of a glyph on the screen.
+
+        Args:
+            index (int): The index of the glyph
+
+        Returns:
+            tuple: The x and y coordinates, the width and the height of
+                the cell in pixels
+        """
+        width, height = self.get_cell_size()
+        row, column = divmod(index, self.__columns)
+
+        return (column * width,
+            row * height - int(self.__adjustment.get_value()),
+            width, height)
+
+    def get_index_at(self, x, y):
+        """Get the glyph at a position on the screen.
+
+        Args:
+            x (float): The x coordinate in pixels
+            y (float): The y coordinate in pixels
+
+        Returns:
+            int: The index of the glyph or None if there is no glyph
+        """
+        width, height = self.get_cell_size()
+        column = int(x // width)
+        row = int((y + self.__adjustment.get_value()) // height)
+        if not 0 <= column < self.__columns or row < 0:
+
+            return None
+        index = row * self.__columns + column
+
+        return index if index < len(self.__font) else None
+
+    def get_selected_index(self):
+        """Get the index of the highlighted glyph.
+
+        Returns:
+            int: The index of the glyph or None
+        """
+
+        return self.__selected_index
+
+    def set_selected_index(self, index):
+        """Highlight a glyph and scroll to it.
+
+        Args:
+            index (int): The index of the glyph or None
+        """
+        if index == self.__selected_index:
+            return
+
+        for damaged in (self.__selected_index, index):
+            if damaged is not None:
+                self.queue_draw_area(*self.get_cell_rectangle(damaged))
+        self.__selected_index = index
+        if index is not None:
+            self.scroll_to_index(index)
+
+    def scroll_to_index(self, index):
+        """Scroll the overview so that a glyph is visible.
+
+        Args:
+            index (int): The index of the glyph
+        """
+        _, y, _, height = self.get_cell_rectangle(index)
+        value = self.__adjustment.get_value()
+        page_size = self.__adjustment.get_page_size()
+        if y < 0:
+            self.__adjustment.set_value(value + y)
+        elif y + height > page_size:
+            self.__adjustment.set_value(value + y + height - page_size)
+
+    def update_glyph(self, index):
+        """Render a glyph again after its bitmap has changed and redraw
+        only its cell.
+
+        Args:
+            index (int): The index of the glyph
+        """
+        self.__atlas.invalidate(index)
+        self.queue_draw_area(*self.get_cell_rectangle(index))
+
+    def refresh(self):
+        """Render all glyphs again, for example after glyphs have been
+        added, removed or moved.
+        """
+        self.__atlas.refresh()
+        self.__update_adjustment()
+        self.queue_draw()
+
+    def __update_adjustment(self):
+        """Configure the adjustment for the size of the widget and the
+        number of glyphs.
+        """
+        width, height = self.get_cell_size()
+        self.__columns = max(1, self.get_allocated_width() // width)
+        rows = math.ceil(len(self.__font) / self.__columns)
+        page_size = max(self.get_allocated_height(), 1)
+        self.__adjustment.configure(self.__adjustment.get_value(), 0,
+            max(rows * height, page_size), height, page_size, page_size)
+
+    def __on_size_allocate(self, widget, allocation):
+        """This method gets called when the size of the widget changes.
+
+        Args:
+            widget (Gtk.Widget): The widget
+            allocation (Gdk.Rectangle): The new size of the widget
+        """
+        self.__update_adjustment()
+
+    def do_draw(self, cr):
+        """Draw the visible cells. The glyphs are masked from the atlas
+        with the foreground color of the widget.
+
+        Args:
+            cr (cairo.Context): The cairo context, the widget should
+                draw itself on.
+        """
+        style = self.get_style_context()
+        Gtk.render_background(style, cr, 0, 0, self.get_allocated_width(),
+            self.get_allocated_height())
+        color = style.get_color(Gtk.StateFlags.NORMAL)
+
+        x1, y1, x2, y2 = cr.clip_extents()
+        width, height = self.get_cell_size()
+        glyph_width, glyph_height = self.__font.get_header().size
+        offset = self.__adjustment.get_value()
+        first_row = max(0, int((y1 + offset) // height))
+        last_row = int((y2 + offset) // height)
+        first_column = max(0, int(x1 // width))
+        last_column = min(self.__columns - 1, int(x2 // width))
+
+        pattern = cairo.SurfacePattern(self.__atlas.get_surface())
+        pattern.set_filter(cairo.FILTER_NEAREST)
+        for row in range(first_row, last_row + 1):
+            for column in range(first_column, last_column + 1):
+                index = row * self.__columns + column
+                if index >= len(self.__font):
+                    break
+                x = column * width
+                y = row * height - offset
+                if index in (self.__selected_index, self.__drop_index):
+                    cr.set_source_rgba(*(self.SELECTION_COLOR
+                        if index == self.__selected_index
+                        else self.DROP_TARGET_COLOR))
+                    cr.rectangle(x, y, width, height)
+                    cr.fill()
+
+                atlas_x, atlas_y = self.__atlas.get_glyph_position(index)
+                cr.save()
+                cr.translate(x + self.PADDING, y + self.PADDING)
+                cr.scale(self.__scale, self.__scale)
+                cr.rectangle(0, 0, glyph_width, glyph_height)
+                cr.clip()
+                pattern.set_matrix(cairo.Matrix(x0=atlas_x, y0=atlas_y))
+                cr.set_source_rgba(*color)
+                cr.mask(pattern)
+                cr.restore()
+
+    def do_button_press_event(self, event):
+        """Start selecting or dragging a glyph.
+
+        Args:
+            event (Gdk.EventButton): The event of the button press
+        """
+        if event.button == Gdk.BUTTON_PRIMARY:
+            self.__drag_index = self.get_index_at(event.x, event.y)
+
+        return True
+
+    def do_motion_notify_event(self, event):
+        """Highlight the glyph under the pointer while dragging.
+
+        Args:
+            event (Gdk.EventMotion): The event of the motion
+        """
+        if self.__drag_index is None:
+
+            return False
+        index = self.get_index_at(event.x, event.y)
+        if index == self.__drag_index:
+            index = None
+        if index != self.__drop_index:
+            for damaged in (self.__drop_index, index):
+                if damaged is not None:
+                    self.queue_draw_area(*self.get_cell_rectangle(damaged))
+            self.__drop_index = index
+
+        return True
+
+    def do_button_release_event(self, event):
+        """Select the clicked glyph or move the dragged glyph.
+
+        Args:
+            event (Gdk.EventButton): The event of the button release
+        """
+        if event.button != Gdk.BUTTON_PRIMARY or self.__drag_index is None:
+
+            return False
+        old_index = self.__drag_index
+        new_index = self.get_index_at(event.x, event.y)
+        if self.__drop_index is not None:
+            self.queue_draw_area(
+                *self.get_cell_rectangle(self.__drop_index))
+        self.__drag_index = self.__drop_index = None
+
+        if new_index is None:
+
+            return True
+        if new_index == old_index:
+            for callback in self.__on_selected_callbacks:
+                callback(new_index)
+        else:
+            for callback in self.__on_moved_callbacks:
+                callback(old_index, new_index)
+
+        return True
+
+    def do_scroll_event(self, event):
+        """Scroll the overview with the mouse wheel.
+
+        Args:
+            event (Gdk.EventScroll): The event of the scrolling
+        """
+        has_deltas, _, delta = event.get_scroll_deltas()
+        if not has_deltas:
+            delta = {
+                Gdk.ScrollDirection.UP: -1,
+                Gdk.ScrollDirection.DOWN: 1,
+            }.get(event.direction, 0)
+        self.__adjustment.set_value(self.__adjustment.get_value() +
+            delta * self.SCROLL_ROWS * self.get_cell_size()[1])
+
+        return True
+
+class GlyphOverviewView(Gtk.Box):
+    """The glyph overview with a scrollbar.
+
+    Args:
+        glyph_overview (GlyphOverview): The glyph overview
+    """
+    def __init__(self, glyph_overview):
+        Gtk.Box.__init__(self, orientation=Gtk.Orientation.HORIZONTAL)
+        self.__glyph_overview = glyph_overview
+        self.pack_start(glyph_overview, True, True, 0)
+
+        self.scrollbar = Gtk.Scrollbar(
+            orientation=Gtk.Orientation.VERTICAL,
+            adjustment=glyph_overview.get_adjustment())
+        self.pack_start(self.scrollbar, False, False, 0)
+
+    def get_glyph_overview(self):
+        """Get the glyph overview of the view.
+
+        Returns:
+            GlyphOverview: The glyph overview
+        """
+
+        return self.__glyph_overview
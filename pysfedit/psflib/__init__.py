@@ -27,10 +27,13 @@ files and importing these.
 """
 
 from abc import ABC, abstractmethod
-import gzip
+import io
 
 from .byteutils import Byte, ByteArray
 from .asmutils import AsmParser
+from .coverage import Coverage
+from . import formats
+from . import gziputils
 
 PSF1_VERSION = 1
 PSF2_VERSION = 2
@@ -123,14 +126,72 @@ def get_codepoint(char):
     codepoint = ord(char)
     return codepoint
 
+def get_importer_for_file(file_path):
+    """Get the importer for an existing file. The format of the file is
+    detected from its first bytes and only if that is not possible from
+    its extension, see the formats module.
+
+    Args:
+        file_path (str): The path of the file to import
+
+    Returns:
+        type: The Importer subclass for the file
+
+    Raises:
+        ValueError: If the format of the file is not supported
+    """
+
+    return formats.get_format_for_file(file_path).get_importer()
+
+def get_exporter_for_file(file_path):
+    """Get the exporter for a file by its extension.
+
+    Args:
+        file_path (str): The path of the file to export to
+
+    Returns:
+        type: The Exporter subclass for the file
+
+    Raises:
+        ValueError: If the extension of the file is not supported
+    """
+    font_format = formats.get_format_for_extension(file_path)
+    if font_format is None:
+        raise ValueError(
+            "Can not export to %s, unknown file extension" % file_path)
+
+    return font_format.get_exporter()
+
+def strip_font_extension(file_path):
+    """Remove the extension of a font file from its path.
+
+    Args:
+        file_path (str): The path of a font file
+
+    Returns:
+        str: The path without the extension if it is a known extension
+            of a font file, else the unchanged path.
+    """
+    for extension in formats.get_extensions():
+        if file_path.lower().endswith(extension):
+
+            return file_path[:-len(extension)]
+
+    return file_path
+
 class Exporter(ABC):
     """Base class of an exporter for a pc screen font.
 
     Args:
         font (PcScreenFont): The font to export
+        encoding (FontEncoding): The binary encoding of the font. Pass
+            the same encoding to several exporters of a font to encode
+            its glyphs and unicode table only once. Optional, by default
+            the exporter creates its own encoding.
     """
-    def __init__(self, font):
+    def __init__(self, font, encoding=None):
         self.__font = font
+        self.__encoding = encoding
 
     def export_to_data(self):
         """Export the font of this exporter as data.
@@ -207,6 +268,187 @@ class Exporter(ABC):
         """
         return self.__font
 
+    def _get_encoding(self):
+        """Get the binary encoding of the font of the exporter.
+
+        Returns:
+            FontEncoding: The encoding of the font of the exporter.
+        """
+        if self.__encoding is None:
+            self.__encoding = FontEncoding(self.__font)
+
+        return self.__encoding
+
+class FontEncoding(object):
+    """The binary encoding of a pc screen font as stored in psf files.
+
+    The header, the glyph bitmaps and the unicode table are encoded when
+    they are requested for the first time and kept afterwards. Share one
+    encoding between the exporters of a font to serialize it only once
+    for multiple formats.
+
+    Notes:
+        The encoding does not notice changes of the font made after the
+        parts of it have been encoded. Create a new encoding instead.
+
+    Args:
+        font (PcScreenFont): The font to encode
+    """
+    def __init__(self, font):
+        self.__font = font
+        self.__header = None
+        self.__bitmaps = None
+        self.__unicode_descriptions = None
+        self.__psf_data = None
+
+    def get_font(self):
+        """Get the font of the encoding.
+
+        Returns:
+            PcScreenFont: The font of the encoding
+        """
+        return self.__font
+
+    def get_mode(self):
+        """Get the mode of an old pc screen font as it gets exported.
+
+        The mode of the header is adjusted if any glyph is described by
+        an unicode sequence.
+
+        Returns:
+            int: The mode of the old pc screen font
+        """
+        mode = self.__font.get_header().mode
+        if self.__font.has_sequences():
+            mode = (mode & PSF1_MODE512) | PSF1_MODEHASSEQ
+
+        return mode
+
+    def get_header(self):
+        """Get the header of the font as it is stored in psf files.
+
+        Returns:
+            bytes: The encoded header
+        """
+        if self.__header is not None:
+
+            return self.__header
+        header = self.__font.get_header()
+        data = bytearray(int(b) for b in header.magic_bytes)
+        if header.version_psf == PSF1_VERSION:
+            data.append(self.get_mode())
+            data.append(header.charsize)
+        else:
+            for value in (header.version, header.headersize,
+                          header.flags, header.length, header.charsize,
+                          header.height, header.width):
+                data += value.to_bytes(4, 'little')
+        self.__header = bytes(data)
+
+        return self.__header
+
+    def get_bitmaps(self):
+        """Get the encoded bitmaps of all glyphs of the font.
+
+        Returns:
+            list: A bytes object for the bitmap of each glyph
+        """
+        if self.__bitmaps is None:
+            self.__bitmaps = [glyph.to_bytes() for glyph, _ in self.__font]
+
+        return self.__bitmaps
+
+    def get_unicode_descriptions(self):
+        """Get the entries of the unicode table of the font. Each entry
+        already ends with the separator.
+
+        Returns:
+            list: A bytes object for the unicode description of each
+                glyph or an empty list, if the font has no unicode table
+        """
+        if self.__unicode_descriptions is not None:
+
+            return self.__unicode_descriptions
+        if not self.__font.has_unicode_table():
+            self.__unicode_descriptions = []
+        elif self.__font.get_header().version_psf == PSF1_VERSION:
+            self.__unicode_descriptions = [
+                self.__encode_description_psf1(description)
+                    for _, description in self.__font
+            ]
+        else:
+            self.__unicode_descriptions = [
+                self.__encode_description_psf2(description)
+                    for _, description in self.__font
+            ]
+
+        return self.__unicode_descriptions
+
+    def get_psf_data(self):
+        """Get the complete content of a psf file with the font.
+
+        Returns:
+            bytes: The encoded font
+        """
+        if self.__psf_data is None:
+            self.__psf_data = b''.join(
+                [self.get_header()] +
+                self.get_bitmaps() +
+                self.get_unicode_descriptions()
+            )
+
+        return self.__psf_data
+
+    @staticmethod
+    def __encode_description_psf1(description):
+        """Encode the unicode description of a glyph of an old pc screen
+        font with 16 bit little endian values.
+
+        Args:
+            description (UnicodeDescription): The unicode description
+
+        Returns:
+            bytes: The encoded unicode description
+
+        Raises:
+            ValueError: If a codepoint can not be encoded with 16 bits
+        """
+        values = [int(uc) for uc in description.unicode_values]
+        for seq in description.sequences:
+            values.append(PSF1_STARTSEQ)
+            values += seq.codepoints
+        values.append(PSF1_SEPARATOR)
+        try:
+
+            return b''.join(v.to_bytes(2, 'little') for v in values)
+        except OverflowError:
+            raise ValueError(
+                "The unicode table of an old pc screen font can only " +
+                "hold codepoints up to 0xFFFF"
+            )
+
+    @staticmethod
+    def __encode_description_psf2(description):
+        """Encode the unicode description of a glyph of a new pc screen
+        font with utf-8.
+
+        Args:
+            description (UnicodeDescription): The unicode description
+
+        Returns:
+            bytes: The encoded unicode description
+        """
+        data = bytearray(
+            ''.join(str(uc) for uc in description.unicode_values)
+                .encode('utf8')
+        )
+        for seq in description.sequences:
+            data.append(PSF2_STARTSEQ)
+            data += seq.get_printable().encode('utf8')
+        data.append(PSF2_SEPARATOR)
+
+        return bytes(data)
+
 class Importer(ABC):
     """Base class of an importer for a pc screen font.
 
@@ -245,6 +487,39 @@ class Importer(ABC):
 
         return cls.import_from_data(data)
 
+    @classmethod
+    def import_header_from_data(cls, data):
+        """Build only the header of a font from given data.
+
+        Neither the glyphs nor the unicode table get parsed, so this is
+        much cheaper than import_from_data if just the metadata of a
+        font is needed.
+
+        Args:
+            data: The data to import the header from
+
+        Returns:
+            PsfHeader: The header built from the given data
+        """
+        importer = cls(data)
+
+        return importer._build_header()
+
+    @classmethod
+    def import_header_from_file(cls, file_path):
+        """Build only the header of a font from the data in a file.
+
+        Args:
+            file_path (str): The path to the file to read the data
+                from
+
+        Returns:
+            PsfHeader: The header built from the data in the file
+        """
+        data = cls._read_data(file_path)
+
+        return cls.import_header_from_data(data)
+
     @staticmethod
     @abstractmethod
     def _read_data(file_path):
@@ -548,27 +823,13 @@ class AsmExporter(Exporter):
 
     Args:
         font (PcScreenFont): The font to export
+        encoding (FontEncoding): Optionally the encoding of the font
     """
-    def __init__(self, font):
-        Exporter.__init__(self, font)
+    def __init__(self, font, encoding=None):
+        Exporter.__init__(self, font, encoding)
         self.__header = font.get_header()
         self.version =self.__header.version_psf
 
-    def __glyph_to_asm(self, glyph, label):
-        """Convert the bitmap of a glyph into a string with data in the
-        nasm assembler syntax.
-
-        Args:
-            glyph (Glyph): The glyph to get the bitmap from
-            label (str): The label to put before the data
-
-        Returns:
-            str: A string containing data in the nasm assembler syntax
-                representing the bitmap of the given glyph.
-        """
-
-        return glyph.to_bytearray().to_asm(label)
-
     def _write_data(self, file_path, data):
         """Write the data made from the font into a file.
 
@@ -590,9 +851,7 @@ class AsmExporter(Exporter):
         """
         data = "font_header:\n"
         if self.version == PSF1_VERSION:
-            mode = self.__header.mode
-            if self._get_font().has_sequences():
-                mode = (mode & 1) | PSF1_MODEHASSEQ
+            mode = self._get_encoding().get_mode()
 
             magic_bytes = ByteArray(self.__header.magic_bytes)
             data += magic_bytes.to_asm("magic_bytes")
@@ -624,21 +883,12 @@ class AsmExporter(Exporter):
             str: The string containing the data from the bitmaps of the
                 font of the exporter.
         """
-        data = "font_bitmaps:\n"
-        font = self._get_font()
-        if self.__header.has_unicode_table():
-            for i, (glyph, _) in zip(range(len(font)), font):
-                data += self.__glyph_to_asm(glyph, "glyph_%d" % i)
+        bitmaps = self._get_encoding().get_bitmaps()
 
-            return data
-
-        glyph_count = self.__header.get_length()
-
-        for i in range(glyph_count):
-            glyph = font.get_glyph(i)
-            data += self.__glyph_to_asm(glyph, "glyph_%d" % i)
-
-        return data
+        return "font_bitmaps:\n" + "".join(
+            ByteArray.from_bytes(bitmap).to_asm("glyph_%d" % i)
+                for i, bitmap in enumerate(bitmaps)
+        )
 
     def _build_unicode_table(self):
         """Convert the unicode table of the font of the exporter into a
@@ -649,37 +899,13 @@ class AsmExporter(Exporter):
             str: The string containing the data from the unicode table
                 of the font of the exporter.
         """
-        data = "unicode_table:\n"
-        font = self._get_font()
-        if self.version == PSF1_VERSION:
-            glyph_count = self.__header.get_length()
-            for (glyph, description), i in zip(font, range(len(font))):
-                _bytes = ByteArray()
-                for uc in description.unicode_values:
-                    _bytes += ByteArray.from_int(int(uc), 2)
-                for seq in description.sequences:
-                    _bytes += ByteArray.from_int(0xFFFE, 2)
-                    for uc in seq.values:
-                        _bytes += ByteArray.from_int(int(uc), 2)
-                _bytes += ByteArray.from_int(0xFFFF, 2)
-                data += _bytes.to_asm('Unicodedescription%d' % i)
-
-            return data
-        # psf2
-        for (glyph, description), i in zip(font, range(len(font))):
-            _bytes = ByteArray()
-            for uc in description.unicode_values:
-                _bytes += ByteArray.from_bytes(str(uc).encode('utf8'))
-            for seq in description.sequences:
-                _bytes += ByteArray.from_int(0xFE, 1)
-                seq_str = u""
-                for uc in seq.values:
-                    seq_str += str(uc)
-                _bytes += ByteArray.from_bytes(seq_str.encode('utf8'))
-            _bytes += ByteArray.from_int(0xFF, 1)
-            data += _bytes.to_asm('Unicodedescription%d' % i)
+        descriptions = self._get_encoding().get_unicode_descriptions()
 
-        return data
+        return "unicode_table:\n" + "".join(
+            ByteArray.from_bytes(description).to_asm(
+                'Unicodedescription%d' % i)
+                for i, description in enumerate(descriptions)
+        )
 
 class PsfExporter(Exporter):
     """Implementation for exporting a PCScreenFont to a psf file.
@@ -687,9 +913,10 @@ class PsfExporter(Exporter):
 
     Args:
         font (PcScreenFont): The font to export
+        encoding (FontEncoding): Optionally the encoding of the font
     """
-    def __init__(self, font):
-        Exporter.__init__(self, font)
+    def __init__(self, font, encoding=None):
+        Exporter.__init__(self, font, encoding)
         self.__header = font.get_header()
         self.version = self.__header.version_psf
 
@@ -723,8 +950,15 @@ class PsfExporter(Exporter):
             bytearray: The bytearray built from the bitmap of the glyph.
         """
 
+        return bytearray(glyph.to_bytes())
+
+    def export_to_data(self):
+        """Export the font as the content of a psf file.
 
-        return glyph.to_bytearray().to_bytearray()
+        Returns:
+            bytes: The psf data
+        """
+        return self._get_encoding().get_psf_data()
 
     def _write_data(self, file_path, data):
         """Write the data made from the font into a file.
@@ -742,93 +976,30 @@ class PsfExporter(Exporter):
         bytearray.
 
         Returns:
-            bytearray: The bytearray containing the data from the header
-                of the font of the exporter.
+            bytes: The bytes containing the data from the header of the
+                font of the exporter.
         """
-        _bytes = bytearray()
-        for i in self.__header.magic_bytes:
-            _bytes.append(i)
-        if self.version == PSF1_VERSION:
-            mode = self.__header.mode
-            if self._get_font().has_sequences():
-                mode = (mode & 1) | PSF1_MODEHASSEQ
-            _bytes.append(mode)
-            _bytes.append(self.__header.charsize)
-        elif self.version == PSF2_VERSION:
-            _bytes += self.int_to_bytes(self.__header.version)
-            _bytes += self.int_to_bytes(self.__header.headersize)
-            _bytes += self.int_to_bytes(self.__header.flags)
-            _bytes += self.int_to_bytes(self.__header.length)
-            _bytes += self.int_to_bytes(self.__header.charsize)
-            _bytes += self.int_to_bytes(self.__header.height)
-            _bytes += self.int_to_bytes(self.__header.width)
-
-        return _bytes
+        return self._get_encoding().get_header()
 
     def _build_bitmaps(self):
         """Convert the bitmaps of the font of the exporter into a
         bytearray.
 
         Returns:
-            bytearray: The bytearray containing the bitmaps from the
-                font from the exporter.
+            bytes: The bytes containing the bitmaps from the font from
+                the exporter.
         """
-        _bytes = bytearray()
-        font = self._get_font()
-        if self.__header.has_unicode_table():
-            for glyph, _ in font:
-                _bytes += self.glyph_to_bytearray(glyph)
-
-            return _bytes
-
-        # Has no Unicode table
-        glyph_count = self.__header.get_length()
-
-        for i in range(glyph_count):
-            glyph = font.get_glyph(i)
-            _bytes += self.glyph_to_bytearray(glyph)
-
-        return _bytes
+        return b''.join(self._get_encoding().get_bitmaps())
 
     def _build_unicode_table(self):
         """Convert the unicode table from the font from the exporter
         into a bytearray.
 
         Returns:
-            bytearray: The bytearray containing the unicode table from
-                the font from the exporter.
+            bytes: The bytes containing the unicode table from the font
+                from the exporter.
         """
-        ba = ByteArray()
-        font = self._get_font()
-        if self.version == PSF1_VERSION:
-            glyph_count = self.__header.get_length()
-            for glyph, ud in font:
-                _bytes = ByteArray()
-                for uc in ud.unicode_values:
-                    _bytes += ByteArray.from_int(int(uc), 2)
-                for seq in ud.sequences:
-                    _bytes += ByteArray.from_int(0xFFFE, 2)
-                    for uc in seq.values:
-                        _bytes += ByteArray.from_int(int(uc), 2)
-                _bytes += ByteArray.from_int(0xFFFF, 2)
-                ba += _bytes
-        else:   # psf2
-            for glyph, ud in font:
-                _bytes = ByteArray()
-                for uc in ud.unicode_values:
-                    _bytes += ByteArray.from_bytes(
-                        str(uc).encode('utf8'))
-                for seq in ud.sequences:
-                    _bytes += ByteArray.from_int(0xFE, 1)
-                    seq_str = u''
-                    for uc in seq.values:
-                        seq_str += str(uc)
-                    seq_bytes = bytes(seq_str, 'utf8')
-                    _bytes += ByteArray.from_bytes(seq_bytes)
-                _bytes += ByteArray.from_int(0xFF, 1)
-                ba += _bytes
-
-        return ba.to_bytearray()
+        return b''.join(self._get_encoding().get_unicode_descriptions())
 
 class PsfImporter(Importer):
     """Implementation for importing a PCScreenFont from a psf file.
@@ -1065,7 +1236,18 @@ class PsfGzExporter(PsfExporter):
 
     Args:
         font (PcScreenFont): The font to export
+        encoding (FontEncoding): Optionally the encoding of the font
+        compresslevel (int): The compression level from 0 to 9
+        threads (int): The number of threads to compress the font with.
+            More than one thread only pays off for fonts larger than
+            the block size of the compression, see the gziputils module.
     """
+    def __init__(self, font, encoding=None,
+            compresslevel=gziputils.DEFAULT_COMPRESS_LEVEL, threads=1):
+        PsfExporter.__init__(self, font, encoding)
+        self.__compresslevel = compresslevel
+        self.__threads = threads
+
     def export_to_data(self):
         """We simply override the export_to_data method of the psf
         exporter to compress our data before exporting.
@@ -1073,18 +1255,44 @@ class PsfGzExporter(PsfExporter):
         Returns:
             bytes: A bytes object with the compressed psf data.
         """
-        data = super(PsfExporter, self).export_to_data()
 
-        return gzip.compress(data)
+        return b''.join(self.__iter_compressed())
 
-class PsfGzImporter(PsfImporter):
-    """Implementation for importing a PCScreenFont from a gzip
-    compressed psf file.
+    def export_to_file(self, file_path):
+        """Export the font to a file. The compressed data is written
+        while it is produced.
+
+        Args:
+            file_path (str): The path of the file to export the font to.
+        """
+        with open(file_path, "wb") as f:
+            for chunk in self.__iter_compressed():
+                f.write(chunk)
+
+    def __iter_compressed(self):
+        """Compress the psf data of the font.
+
+        Yields:
+            bytes: The parts of the gzip stream
+        """
+        data = self._get_encoding().get_psf_data()
+
+        return gziputils.iter_compress(
+            data, self.__compresslevel, self.__threads)
+
+class CompressedPsfImporter(PsfImporter):
+    """Base class for importing a PcScreenFont from a compressed psf
+    file. Subclasses set the compression attribute.
     For usage see the Importer base class.
 
     Args:
         data (bytes): The data to build the font from
     """
+    # The formats.Compression of the files
+    compression = None
+    # The number of bytes needed to build the header of any psf version
+    HEADER_SIZE = 32
+
     @classmethod
     def import_from_data(cls, data):
         """We simply override the import_to_data method of the psf
@@ -1097,10 +1305,345 @@ class PsfGzImporter(PsfImporter):
         Returns:
             PcScreenFont: The font imported from the compressed data.
         """
-        data = gzip.decompress(data)
+        data = cls.compression.decompress(data)
 
         return PsfImporter.import_from_data(data)
 
+    @classmethod
+    def import_from_file(cls, file_path):
+        """Build a font from a compressed file, which gets decompressed
+        while reading it.
+
+        Args:
+            file_path (str): The path to the file to read the data
+                from
+
+        Returns:
+            PcScreenFont: The font build from the data in the file
+        """
+        with cls.compression.open(file_path) as f:
+            data = f.read()
+
+        return PsfImporter.import_from_data(data)
+
+    @classmethod
+    def import_header_from_data(cls, data):
+        """Decompress only the start of the data and build the header
+        from it.
+
+        Args:
+            data (bytes): The binary data containing the compressed psf
+                data.
+
+        Returns:
+            PsfHeader: The header imported from the compressed data.
+        """
+        with cls.compression.open(io.BytesIO(data)) as f:
+            data = f.read(cls.HEADER_SIZE)
+
+        return PsfImporter.import_header_from_data(data)
+
+    @classmethod
+    def import_header_from_file(cls, file_path):
+        """Decompress only the start of a compressed file and build the
+        header from it.
+
+        Args:
+            file_path (str): The path to the file to read the data
+                from
+
+        Returns:
+            PsfHeader: The header built from the data in the file
+        """
+        with cls.compression.open(file_path) as f:
+            data = f.read(cls.HEADER_SIZE)
+
+        return PsfImporter.import_header_from_data(data)
+
+class PsfGzImporter(CompressedPsfImporter):
+    """Implementation for importing a PCScreenFont from a gzip
+    compressed psf file.
+    For usage see the Importer base class.
+
+    Args:
+        data (bytes): The data to build the font from
+    """
+    compression = formats.GZIP
+
+class CompressedPsfExporter(PsfExporter):
+    """Base class for exporting a PcScreenFont to a compressed psf file.
+    Subclasses set the compression attribute.
+    For usage see the Exporter base class.
+
+    Args:
+        font (PcScreenFont): The font to export
+        encoding (FontEncoding): Optionally the encoding of the font
+        compresslevel (int): The compression level or None for the
+            default level of the compression
+    """
+    # The formats.Compression of the files
+    compression = None
+
+    def __init__(self, font, encoding=None, compresslevel=None):
+        PsfExporter.__init__(self, font, encoding)
+        self.__compresslevel = compresslevel
+
+    def export_to_data(self):
+        """Compress the psf data of the font.
+
+        Returns:
+            bytes: A bytes object with the compressed psf data.
+        """
+        data = self._get_encoding().get_psf_data()
+
+        return self.compression.compress(data, self.__compresslevel)
+
+class PsfXzImporter(CompressedPsfImporter):
+    """Implementation for importing a PCScreenFont from a xz compressed
+    psf file.
+    For usage see the Importer base class.
+
+    Args:
+        data (bytes): The data to build the font from
+    """
+    compression = formats.XZ
+
+class PsfXzExporter(CompressedPsfExporter):
+    """Implementation for exporting a PcScreenFont to a xz compressed
+    psf file. For usage see the CompressedPsfExporter base class.
+    """
+    compression = formats.XZ
+
+class PsfBz2Importer(CompressedPsfImporter):
+    """Implementation for importing a PCScreenFont from a bzip2
+    compressed psf file.
+    For usage see the Importer base class.
+
+    Args:
+        data (bytes): The data to build the font from
+    """
+    compression = formats.BZ2
+
+class PsfBz2Exporter(CompressedPsfExporter):
+    """Implementation for exporting a PcScreenFont to a bzip2 compressed
+    psf file. For usage see the CompressedPsfExporter base class.
+    """
+    compression = formats.BZ2
+
+PSF_MAGIC = [bytes(PSF1_MAGIC_BYTES), bytes(PSF2_MAGIC_BYTES)]
+
+for font_format in [
+        formats.FontFormat('psf', ['.psf'], PsfImporter, PsfExporter,
+            PSF_MAGIC),
+        formats.FontFormat('psf.gz', ['.psf.gz'], PsfGzImporter,
+            PsfGzExporter, PSF_MAGIC, formats.GZIP),
+        formats.FontFormat('psf.xz', ['.psf.xz'], PsfXzImporter,
+            PsfXzExporter, PSF_MAGIC, formats.XZ),
+        formats.FontFormat('psf.bz2', ['.psf.bz2'], PsfBz2Importer,
+            PsfBz2Exporter, PSF_MAGIC, formats.BZ2),
+        formats.FontFormat('asm', ['.asm'], AsmImporter, AsmExporter),
+    ]:
+    formats.register_format(font_format)
+
+def export_to_files(font, file_paths, options=None):
+    """Export a font to several files at once.
+
+    The exporters are chosen by the extensions of the files. They share
+    one FontEncoding, so the glyphs and the unicode table of the font
+    are encoded only once, the gzip compressed psf is made from the same
+    psf data as an uncompressed one and the asm file is formatted from
+    the same buffers.
+
+    Args:
+        font (PcScreenFont): The font to export
+        file_paths (list): The paths of the files to export the font to
+        options (dict): Optional keyword arguments for the exporters
+            with the exporter classes as keys. For example
+            {PsfGzExporter: {'compresslevel': 6}}
+
+    Raises:
+        ValueError: If the extension of a file is not supported. No file
+            is written in this case.
+    """
+    exporters = [get_exporter_for_file(path) for path in file_paths]
+    encoding = FontEncoding(font)
+    options = options or {}
+    for exporter, path in zip(exporters, file_paths):
+        exporter(font, encoding, **options.get(exporter, {})).export_to_file(
+            path)
+
+class FontInfo(object):
+    """The metadata of a font file as returned by inspect.
+
+    Attributes:
+        path (str): The path of the font file
+        format (formats.FontFormat): The format of the file
+        header (PsfHeader): The header of the font
+        header_size (int): The size of the header in bytes
+        bitmaps_offset (int): The offset of the glyph bitmaps in the
+            uncompressed data
+        bitmaps_size (int): The size of all glyph bitmaps in bytes
+        unicode_table_offset (int): The offset of the unicode table in
+            the uncompressed data or None if the font has no unicode
+            table
+        unicode_value_count (int): The number of unicode values mapped
+            to glyphs, not counting the values in sequences. None if
+            the unicode table has not been counted.
+        sequence_count (int): The number of unicode sequences mapped to
+            glyphs. None if the unicode table has not been counted.
+
+    Notes:
+        The offsets and sizes are None for formats without a binary
+        layout, like asm files.
+    """
+    def __init__(self, path, font_format, header):
+        self.path = path
+        self.format = font_format
+        self.header = header
+        self.header_size = None
+        self.bitmaps_offset = None
+        self.bitmaps_size = None
+        self.unicode_table_offset = None
+        self.unicode_value_count = None
+        self.sequence_count = None
+
+    def read_unicode_table(self):
+        """Read the encoded unicode table of the font from its file
+        without reading the glyph bitmaps.
+
+        Returns:
+            bytes: The unicode table as stored in a psf file of the
+                version of the font. Empty if the font has no unicode
+                table.
+        """
+        if not self.header.has_unicode_table():
+
+            return b''
+        if self.unicode_table_offset is None:
+            font = self.format.get_importer().import_from_file(self.path)
+
+            return b''.join(FontEncoding(font).get_unicode_descriptions())
+
+        if self.format.compression:
+            f = self.format.compression.open(self.path)
+        else:
+            f = open(self.path, 'rb')
+        with f:
+            # Compressed streams skip forward by decompressing
+            f.seek(self.unicode_table_offset)
+
+            return f.read()
+
+def decode_unicode_table(data, version_psf):
+    """Decode an encoded unicode table without building unicode
+    descriptions.
+
+    Args:
+        data (bytes): The unicode table as stored in a psf file
+        version_psf (int): The version of the pc screen font, either
+            PSF1_VERSION or PSF2_VERSION
+
+    Returns:
+        list: A tuple for each glyph with the list of its codepoints and
+            the list of its sequences, each a list of codepoints
+    """
+    descriptions = []
+    if version_psf == PSF1_VERSION:
+        description = ([], [])
+        current = description[0]
+        for i in range(0, len(data) - 1, 2):
+            value = data[i] | data[i + 1] << 8
+            if value == PSF1_SEPARATOR:
+                descriptions.append(description)
+                description = ([], [])
+                current = description[0]
+            elif value == PSF1_STARTSEQ:
+                current = []
+                description[1].append(current)
+            else:
+                current.append(value)
+
+        return descriptions
+
+    for entry in data.split(bytes([PSF2_SEPARATOR]))[:-1]:
+        parts = entry.split(bytes([PSF2_STARTSEQ]))
+        descriptions.append((
+            [ord(c) for c in parts[0].decode('utf8')],
+            [[ord(c) for c in seq.decode('utf8')] for seq in parts[1:]]
+        ))
+
+    return descriptions
+
+def count_unicode_table(data, version_psf):
+    """Count the entries of an encoded unicode table.
+
+    Args:
+        data (bytes): The unicode table as stored in a psf file
+        version_psf (int): The version of the pc screen font, either
+            PSF1_VERSION or PSF2_VERSION
+
+    Returns:
+        tuple: The number of unicode values and the number of sequences
+            in the unicode table
+    """
+    descriptions = decode_unicode_table(data, version_psf)
+
+    return (
+        sum(len(values) for values, _ in descriptions),
+        sum(len(sequences) for _, sequences in descriptions)
+    )
+
+def inspect(file_path, count_unicode=False):
+    """Read the metadata of a font file without importing the font.
+
+    For psf files only the header is read and for compressed psf files
+    only the start of the stream is decompressed. The glyph bitmaps are
+    never decoded.
+
+    Args:
+        file_path (str): The path of the font file
+        count_unicode (bool): Whether to count the entries of the
+            unicode table. This reads the unicode table, but still skips
+            the glyph bitmaps.
+
+    Returns:
+        FontInfo: The metadata of the font
+
+    Raises:
+        ValueError: If the format of the file is unknown
+    """
+    font_format = formats.get_format_for_file(file_path)
+    if not font_format.magic:
+        # No binary layout, the header can only be built by the importer
+        info = FontInfo(file_path, font_format,
+            font_format.get_importer().import_header_from_file(file_path))
+    else:
+        if font_format.compression:
+            f = font_format.compression.open(file_path)
+        else:
+            f = open(file_path, 'rb')
+        with f:
+            data = f.read(CompressedPsfImporter.HEADER_SIZE)
+        header = PsfImporter.import_header_from_data(data)
+        info = FontInfo(file_path, font_format, header)
+        if header.version_psf == PSF1_VERSION:
+            info.header_size = 4
+            charsize = header.charsize
+        else:
+            info.header_size = int.from_bytes(data[8:12], 'little')
+            charsize = int.from_bytes(data[20:24], 'little')
+        info.bitmaps_offset = info.header_size
+        info.bitmaps_size = header.get_length() * charsize
+        if header.has_unicode_table():
+            info.unicode_table_offset = (
+                info.bitmaps_offset + info.bitmaps_size)
+    if count_unicode and info.header.has_unicode_table():
+        info.unicode_value_count, info.sequence_count = (
+            count_unicode_table(
+                info.read_unicode_table(), info.header.version_psf))
+
+    return info
+
 class PsfHeader(ABC):
     """This class is the base for a header for the PC Screen Font
 
@@ -1464,11 +2007,275 @@ class PcScreenFont(object):
 
             return unicode_value < self.__len__()
         for unicode_description in self.__unicode_info:
-            values = unicode_description.get_unicode_values()
+            values = unicode_description.codepoints
             if unicode_value in values:
 
                 return True
 
+        return False
+
+    def get_coverage(self):
+        """Get the codepoints the font has glyphs for.
+
+        For fonts with an unicode table these are the unicode values of
+        all unicode descriptions, the values in sequences do not count.
+        A font without unicode table covers the codepoints below its
+        number of glyphs.
+
+        Notes:
+            The coverage is not updated, when the font changes. Get a
+            new one instead, but reuse it for many lookups. A single
+            lookup is cheaper with has_glyph_for_unicode_value.
+
+        Returns:
+            Coverage: The codepoints covered by the font
+        """
+        if not self.__header.has_unicode_table():
+
+            return Coverage.from_ranges([(0, self.__len__() - 1)])
+
+        return Coverage(
+            codepoint
+                for unicode_description in self.__unicode_info
+                for codepoint in unicode_description.codepoints
+        )
+
+    def subset(self, codepoints=(), text=None, psf1=False):
+        """Create a new font with only the glyphs needed for a set of
+        codepoints or the characters of a text.
+
+        A glyph is kept if one of its unicode values is needed or one of
+        its sequences consists only of needed codepoints. Its unicode
+        description in the new font contains only these values and
+        sequences. The kept glyphs keep their order and are renumbered.
+        Without an unicode table the index of a glyph is its codepoint
+        and the new font gets an unicode table. The time needed is
+        linear in the size of the font and of the text.
+
+        Args:
+            codepoints (iterable): The needed codepoints, for example a
+                Coverage
+            text (object): A text or an iterable of text chunks, for
+                example the lines of a file, whose characters are needed
+                as well
+            psf1 (bool): Whether to create an old pc screen font with
+                256 or 512 glyphs if the subset fits into one. Otherwise
+                the new font is a psf2 font.
+
+        Returns:
+            PcScreenFont: The new font
+        """
+        needed = codepoints if isinstance(codepoints, Coverage) \
+            else Coverage(codepoints)
+        if text is not None:
+            characters = set()
+            for chunk in [text] if isinstance(text, str) else text:
+                characters.update(chunk)
+            needed = needed | Coverage(ord(c) for c in characters)
+
+        has_unicode_table = self.has_unicode_table()
+        kept = []
+        for i, (glyph, description) in enumerate(self):
+            if not has_unicode_table:
+                if i in needed:
+                    kept.append((glyph, [i], []))
+
+                continue
+            values = [cp for cp in description.codepoints if cp in needed]
+            sequences = [
+                seq.codepoints for seq in description.sequences
+                    if all(cp in needed for cp in seq.codepoints)
+            ]
+            if values or sequences:
+                kept.append((glyph, values, sequences))
+
+        return PcScreenFont.__from_glyphs(self.__header.size, kept, psf1)
+
+    def convert(self, version):
+        """Convert the font into another version of the pc screen font
+        format.
+
+        The bitmaps are copied row by row, as both versions store them
+        the same way. An old pc screen font stores its unicode table in
+        UCS-2, so it can only hold codepoints up to U+FFFF. Glyphs after
+        the 512th, codepoints above U+FFFF and sequences containing them
+        are dropped and reported. Old pc screen fonts are padded with
+        empty glyphs to 256 or 512 glyphs.
+
+        Args:
+            version (int): The version of the new font, either
+                PSF1_VERSION or PSF2_VERSION
+
+        Returns:
+            tuple: The new font and a dictionary with the indices of the
+                dropped "glyphs", the dropped "codepoints" and the
+                dropped "sequences" as lists
+
+        Raises:
+            ValueError: If the version is unknown or the glyphs of the
+                font are not 8 pixels wide for an old pc screen font
+        """
+        size = list(self.__header.size)
+        has_unicode_table = self.__header.has_unicode_table()
+        dropped = {'glyphs': [], 'codepoints': [], 'sequences': []}
+        if version == PSF1_VERSION:
+            if size[0] != 8:
+                raise ValueError(
+                    "Can not convert to psf1, the width must be 8")
+            header = PsfHeaderv1(size)
+            if len(self) > 256:
+                header.set_mode(PSF1_MODE512)
+            if has_unicode_table:
+                header.set_mode(PSF1_MODEHASTAB)
+            dropped['glyphs'] = list(range(512, len(self)))
+            length = min(len(self), 512)
+            max_codepoint = 0xFFFF
+        elif version == PSF2_VERSION:
+            header = PsfHeaderv2(size)
+            if has_unicode_table:
+                header.set_flags(PSF2_HAS_UNICODE_TABLE)
+            length = len(self)
+            max_codepoint = 0x10FFFF
+        else:
+            raise ValueError("Unknown psf version %r" % version)
+        font = PcScreenFont(header)
+
+        for i in range(length):
+            glyph, description = self[i]
+            if version == PSF1_VERSION:
+                new_glyph, new_description = font[i]
+            else:
+                new_glyph, new_description = font.add_glyph()
+            new_glyph.set_data(glyph.get_data())
+            if not has_unicode_table:
+
+                continue
+            for value in description.codepoints:
+                if value > max_codepoint:
+                    dropped['codepoints'].append(value)
+
+                    continue
+                new_description.add_unicode_value(value)
+            for sequence in description.seq_codepoints:
+                if max(sequence) > max_codepoint:
+                    dropped['sequences'].append(sequence)
+
+                    continue
+                new_description.add_sequence(UnicodeSequence(sequence))
+
+        return font, dropped
+
+    @staticmethod
+    def merge(fonts):
+        """Merge fonts with glyphs of the same size into one font.
+
+        The fonts are used in the given order, the first one is the base
+        and the others are fallbacks. A glyph of a font is only added
+        for the unicode values and sequences that none of the previous
+        fonts has. Glyphs with identical bitmaps are stored only once
+        and share their unicode values. Without an unicode table the
+        index of a glyph is its codepoint. The codepoints and bitmaps
+        are looked up in hash tables, so the time needed is linear in
+        the total number of glyphs.
+
+        Args:
+            fonts (iterable): The fonts, the one with the highest
+                priority first
+
+        Returns:
+            PcScreenFont: The merged psf2 font with an unicode table
+
+        Raises:
+            ValueError: If there are no fonts or the sizes of their
+                glyphs differ
+        """
+        fonts = list(fonts)
+        if not fonts:
+            raise ValueError("No fonts to merge")
+        size = tuple(fonts[0].get_header().size)
+
+        covered = set()
+        covered_sequences = set()
+        bitmaps = {}
+        glyphs = []
+        for font in fonts:
+            if tuple(font.get_header().size) != size:
+                raise ValueError(
+                    "Can not merge fonts with glyphs of different sizes")
+            has_unicode_table = font.has_unicode_table()
+            for i, (glyph, description) in enumerate(font):
+                values = []
+                sequences = []
+                for value in (description.codepoints if has_unicode_table
+                        else [i]):
+                    if value not in covered:
+                        covered.add(value)
+                        values.append(value)
+                if has_unicode_table:
+                    for sequence in description.seq_codepoints:
+                        if tuple(sequence) not in covered_sequences:
+                            covered_sequences.add(tuple(sequence))
+                            sequences.append(sequence)
+                if not (values or sequences):
+
+                    continue
+                key = glyph.to_bytes()
+                if key in bitmaps:
+                    _, old_values, old_sequences = glyphs[bitmaps[key]]
+                    old_values += values
+                    old_sequences += sequences
+
+                    continue
+                bitmaps[key] = len(glyphs)
+                glyphs.append((glyph, values, sequences))
+
+        return PcScreenFont.__from_glyphs(list(size), glyphs)
+
+    @staticmethod
+    def __from_glyphs(size, glyphs, psf1=False):
+        """Create a font with an unicode table from glyphs and their
+        unicode values and sequences.
+
+        Args:
+            size (list): The width and the height of the glyphs
+            glyphs (list): A tuple with the glyph bitmap, the list of
+                codepoints and the list of sequences, each a list of
+                codepoints, for each glyph
+            psf1 (bool): Whether to create an old pc screen font if the
+                glyphs fit into one
+
+        Returns:
+            PcScreenFont: The new font
+        """
+        fits_psf1 = (psf1 and size[0] == 8 and len(glyphs) <= 512 and
+            all(cp <= 0xFFFF
+                for _, values, sequences in glyphs
+                for cp in values + [c for s in sequences for c in s]))
+        if fits_psf1:
+            header = PsfHeaderv1(size)
+            header.set_mode(PSF1_MODEHASTAB)
+            if any(sequences for _, _, sequences in glyphs):
+                header.set_mode(PSF1_MODEHASSEQ)
+            if len(glyphs) > 256:
+                header.set_mode(PSF1_MODE512)
+        else:
+            header = PsfHeaderv2(size)
+            header.set_flags(PSF2_HAS_UNICODE_TABLE)
+        font = PcScreenFont(header)
+
+        for i, (glyph, values, sequences) in enumerate(glyphs):
+            if fits_psf1:
+                new_glyph, description = font[i]
+            else:
+                new_glyph, description = font.add_glyph()
+            new_glyph.set_data(glyph.get_data())
+            for value in values:
+                description.add_unicode_value(value)
+            for sequence in sequences:
+                description.add_sequence(UnicodeSequence(sequence))
+
+        return font
+
     def get_glyph_for_unicode_value(self, unicode_value):
         """Use this method to get a glyph bitmap for a given unicode
         value.
@@ -1490,7 +2297,7 @@ class PcScreenFont(object):
             return None
         for i in range(self.__len__()):
             unicode_description = self.__unicode_info[i]
-            values = unicode_description.get_unicode_values()
+            values = unicode_description.codepoints
             if unicode_value in values:
 
                 return self.__glyph_bitmaps[i]
@@ -1562,9 +2369,8 @@ class GlyphBitmap(object):
         self.__size = size
         self.__width = size[0]
         self.__height = size[1]
-        self.__data = [
-            [0 for _ in range(size[0])] for _ in range(size[1])
-        ]
+        self.__data = [[0] * size[0] for _ in range(size[1])]
+        self.__generation = 0
 
     def get_size(self):
         """Get the size of the glyph in pixels.
@@ -1575,6 +2381,24 @@ class GlyphBitmap(object):
         """
         return tuple(self.__size)
 
+    def get_generation(self):
+        """Get the generation of the bitmap. It is incremented each time
+        the data is replaced with set_data or set_data_from_bytes and
+        by mark_changed, but not when the list returned by get_data is
+        modified in place.
+
+        Returns:
+            int: The generation of the bitmap
+        """
+
+        return self.__generation
+
+    def mark_changed(self):
+        """Increment the generation of the bitmap. Call this method after
+        modifying the list returned by get_data in place.
+        """
+        self.__generation += 1
+
     def get_data(self):
         """Get the data representing the bitmap of the glyph.
 
@@ -1615,9 +2439,9 @@ class GlyphBitmap(object):
                 "Expected data to have the same dimensions as the " +
                 "GlyphBitmap"
             )
-        for j in range(self.__height):
-            for i in range(self.__width):
-                self.__data[j][i] = data[j][i]
+        for row, new_row in zip(self.__data, data):
+            row[:] = new_row
+        self.__generation += 1
 
     def set_data_from_bytes(self, _bytes):
         """Set the data of the bitmap from bytes
@@ -1640,6 +2464,27 @@ class GlyphBitmap(object):
             for j in range(self.__width):
                 line.append(bits[i * bits_per_line + j])
             self.__data.append(line)
+        self.__generation += 1
+
+    def to_bytes(self):
+        """Get the data of the glyph bitmap as stored in psf files.
+
+        Each row is padded with zeros to whole bytes and the leftmost
+        pixel of a row is the most significant bit of its first byte.
+
+        Returns:
+            bytes: The encoded bitmap
+        """
+        row_length = (self.__width + 7) // 8
+        padding = row_length * 8 - self.__width
+        data = bytearray()
+        for row in self.__data:
+            value = 0
+            for pixel in row:
+                value = value << 1 | (1 if pixel else 0)
+            data += (value << padding).to_bytes(row_length, 'big')
+
+        return bytes(data)
 
     def to_bytearray(self):
         """Get a byte array from the data of the glyph bitmap.
@@ -0,0 +1,396 @@
+#! /usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Copyright (c) 2018 by Karsten Lehmann <mail@kalehmann.de>
+#
+#    This file is part of PySFedit.
+#
+#    PySFedit is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    PySFedit is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    long with PySFedit. If not, see <http://www.gnu.org/licenses/>.
+
+
+"""
+This module converts many font files at once.
+
+The input files are given as glob patterns or directories. The
+conversions are distributed over a pool of worker processes and their
+results are yielded as dictionaries as soon as they are finished, so
+they can be streamed as JSON lines while the batch is still running.
+"""
+
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import glob
+import hashlib
+import json
+import os
+
+from . import (get_importer_for_file, get_exporter_for_file,
+               strip_font_extension)
+from . import formats
+from .cache import install_file, IGNORED_OPTIONS
+
+CHECK_NONE = 'none'
+CHECK_MTIME = 'mtime'
+CHECK_HASH = 'hash'
+
+STATUS_CONVERTED = 'converted'
+STATUS_SKIPPED = 'skipped'
+STATUS_UNCHANGED = 'unchanged'
+STATUS_ERROR = 'error'
+
+# The file in the output directory with the hashes of the conversions
+# for CHECK_HASH
+HASH_FILE_NAME = '.pysfedit-batch.json'
+
+def find_font_files(patterns):
+    """Find all font files matching the given patterns.
+
+    Args:
+        patterns (list): Glob patterns (supporting "**") or directories.
+            Directories are searched recursively. Files are accepted if
+            they have a known font file extension or their format can be
+            detected from their first bytes.
+
+    Returns:
+        list: The sorted paths of all matching font files without
+            duplicates.
+    """
+    extensions = formats.get_extensions()
+    paths = set()
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            pattern = os.path.join(pattern, '**', '*')
+        for path in glob.iglob(pattern, recursive=True):
+            if not os.path.isfile(path) or path in paths:
+
+                continue
+            if path.lower().endswith(extensions):
+                paths.add(path)
+
+                continue
+            try:
+                if formats.sniff_file(path):
+                    paths.add(path)
+            except OSError:
+                # Unreadable files are no font files we could convert.
+                pass
+
+    return sorted(paths)
+
+def get_output_path(input_path, base_directory, output_directory,
+        extension):
+    """Get the path of the output file for an input file.
+
+    The directory structure of the input file below the base directory
+    is preserved in the output directory.
+
+    Args:
+        input_path (str): The path of the input file
+        base_directory (str): The directory all input files are in
+        output_directory (str): The directory for the output files
+        extension (str): The extension of the output file, for example
+            ".psf.gz"
+
+    Returns:
+        str: The path of the output file
+    """
+    relative_path = os.path.relpath(input_path, base_directory)
+
+    return os.path.join(
+        output_directory, strip_font_extension(relative_path) + extension)
+
+def is_up_to_date(input_path, output_path):
+    """Check whether an output file is newer than its input file.
+
+    Args:
+        input_path (str): The path of the input file
+        output_path (str): The path of the output file
+
+    Returns:
+        bool: Whether the output file exists and was modified after
+            the input file.
+    """
+    try:
+        output_mtime = os.stat(output_path).st_mtime_ns
+    except FileNotFoundError:
+
+        return False
+
+    return output_mtime >= os.stat(input_path).st_mtime_ns
+
+def file_digest(file_path):
+    """Get the sha256 digest of the content of a file.
+
+    Args:
+        file_path (str): The path of the file
+
+    Returns:
+        bytes: The digest or None if the file does not exist
+    """
+    try:
+        with open(file_path, 'rb') as f:
+
+            return hashlib.sha256(f.read()).digest()
+    except FileNotFoundError:
+
+        return None
+
+def get_conversion_digest(input_path, extension, options):
+    """Get a digest identifying the conversion of an input file.
+
+    Args:
+        input_path (str): The path of the input file
+        extension (str): The extension of the output file
+        options (dict): The keyword arguments for the exporter
+
+    Returns:
+        str: The hexadecimal digest of the content of the input file,
+            the extension and the options except the IGNORED_OPTIONS
+    """
+    digest = hashlib.sha256()
+    with open(input_path, 'rb') as f:
+        digest.update(f.read())
+    options = sorted(
+        (name, value) for name, value in options.items()
+            if name not in IGNORED_OPTIONS
+    )
+    digest.update(repr((extension, options)).encode())
+
+    return digest.hexdigest()
+
+def load_hashes(output_directory):
+    """Load the hashes stored by previous conversions with CHECK_HASH.
+
+    Args:
+        output_directory (str): The directory of the output files
+
+    Returns:
+        dict: The hashes for each output path relative to the output
+            directory. It is empty if no valid hash file exists.
+    """
+    try:
+        with open(os.path.join(output_directory, HASH_FILE_NAME)) as f:
+            hashes = json.load(f)
+    except (OSError, ValueError):
+
+        return {}
+
+    return hashes if isinstance(hashes, dict) else {}
+
+def store_hashes(output_directory, hashes):
+    """Store the hashes of conversions for later runs with CHECK_HASH.
+
+    Args:
+        output_directory (str): The directory of the output files
+        hashes (dict): The hashes for each output path relative to the
+            output directory
+    """
+    os.makedirs(output_directory, exist_ok=True)
+    path = os.path.join(output_directory, HASH_FILE_NAME)
+    temporary_path = '%s.%d.tmp' % (path, os.getpid())
+    with open(temporary_path, 'w') as f:
+        json.dump(hashes, f, sort_keys=True)
+    os.replace(temporary_path, path)
+
+def convert_file(job):
+    """Convert a single font file.
+
+    This function runs in the worker processes and therefore never
+    raises, but reports errors in its result.
+
+    Args:
+        job (tuple): A tuple with the path of the input file, the path
+            of the output file, the check that was requested, the
+            ConversionCache to use or None, whether to hard link
+            outputs to the cache, the keyword arguments for the
+            exporter and for CHECK_HASH the hashes stored for the output
+            file by the previous conversion or None.
+
+    Returns:
+        dict: The result of the conversion with the keys "input",
+            "output", "status" and for failed conversions "error". With
+            a cache there is also the key "cached". With CHECK_HASH the
+            key "hashes" contains the hashes to store for the output.
+    """
+    input_path, output_path, check, cache, link, options, stored = job
+    result = {'input': input_path, 'output': output_path}
+    try:
+        if check == CHECK_HASH:
+            # Skip the conversion if neither the input nor the output
+            # changed since the previous conversion.
+            digest = get_conversion_digest(input_path,
+                os.path.splitext(output_path)[1], options)
+            output_digest = file_digest(output_path)
+            if (stored and stored.get('input') == digest and
+                    output_digest is not None and
+                    stored.get('output') == output_digest.hex()):
+                result['status'] = STATUS_UNCHANGED
+                result['hashes'] = stored
+
+                return result
+        if cache is not None:
+            exporter = get_exporter_for_file(output_path)
+            cached_path, result['cached'] = cache.export(
+                input_path, exporter, options)
+            new_digest = file_digest(cached_path)
+            if check == CHECK_HASH and output_digest == new_digest:
+                result['status'] = STATUS_UNCHANGED
+            else:
+                install_file(cached_path, output_path, link)
+                result['status'] = STATUS_CONVERTED
+            if check == CHECK_HASH:
+                result['hashes'] = {
+                    'input': digest, 'output': new_digest.hex()}
+
+            return result
+        font = get_importer_for_file(input_path).import_from_file(
+            input_path)
+        exporter = get_exporter_for_file(output_path)(font, **options)
+        data = exporter.export_to_data()
+        if isinstance(data, str):
+            data = data.encode('utf8')
+        new_digest = hashlib.sha256(data).digest()
+        if check == CHECK_HASH:
+            result['hashes'] = {'input': digest, 'output': new_digest.hex()}
+            if output_digest == new_digest:
+                result['status'] = STATUS_UNCHANGED
+
+                return result
+        directory = os.path.dirname(output_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(output_path, 'wb') as f:
+            f.write(data)
+        result['status'] = STATUS_CONVERTED
+    except Exception as e:
+        result['status'] = STATUS_ERROR
+        result['error'] = '%s: %s' % (type(e).__name__, e)
+
+    return result
+
+def convert_chunk(jobs):
+    """Convert several font files in a worker process.
+
+    Args:
+        jobs (list): The jobs, see convert_file
+
+    Returns:
+        list: The results of the conversions
+    """
+
+    return [convert_file(job) for job in jobs]
+
+def convert_files(patterns, output_directory, extension, workers=None,
+        chunksize=1, check=CHECK_MTIME, cache=None, link=False,
+        options=None):
+    """Convert all font files matching the given patterns.
+
+    Args:
+        patterns (list): Glob patterns or directories of the input files
+        output_directory (str): The directory for the output files
+        extension (str): The extension of the output files, which
+            selects the exporter. For example ".psf".
+        workers (int): The number of worker processes. Defaults to the
+            number of processors. With 1 the files are converted in the
+            calling process.
+        chunksize (int): The number of files sent to a worker at once
+        check (str): How to detect output files that are up to date.
+            CHECK_MTIME skips input files older than their output file.
+            CHECK_HASH skips input files whose content, output format
+            and options match the hashes stored in the output directory
+            by the previous run, as long as the output file is
+            unchanged. Output files with unchanged content are not
+            rewritten either. CHECK_NONE always writes the output files.
+        cache (ConversionCache): An optional cache for the outputs of
+            the conversions
+        link (bool): Whether to hard link the output files to the cache
+            entries instead of copying them
+        options (dict): Keyword arguments for the exporter, for example
+            the compression level of the PsfGzExporter
+
+    Yields:
+        dict: The result of each conversion in the order they finish,
+            see convert_file. Input files skipped by the mtime check
+            have the status STATUS_SKIPPED. Input files that would be
+            converted into the same output file, like "a.psf" and
+            "a.psf.gz", have the status STATUS_ERROR.
+    """
+    # Fail early for an unsupported output format
+    get_exporter_for_file(extension)
+
+    paths = find_font_files(patterns)
+    if not paths:
+
+        return
+    base_directory = os.path.commonpath(
+        [os.path.dirname(os.path.abspath(p)) for p in paths])
+
+    inputs = {}
+    for path in paths:
+        output_path = get_output_path(os.path.abspath(path),
+            base_directory, output_directory, extension)
+        inputs.setdefault(output_path, []).append(path)
+
+    hashes = load_hashes(output_directory) if check == CHECK_HASH else {}
+    jobs = []
+    for output_path, input_paths in inputs.items():
+        if len(input_paths) > 1:
+            for path in input_paths:
+                yield {
+                    'input': path,
+                    'output': output_path,
+                    'status': STATUS_ERROR,
+                    'error': 'The output file is shared with %s' %
+                        ', '.join(p for p in input_paths if p != path)
+                }
+
+            continue
+        path = input_paths[0]
+        if check == CHECK_MTIME and is_up_to_date(path, output_path):
+            yield {
+                'input': path,
+                'output': output_path,
+                'status': STATUS_SKIPPED
+            }
+
+            continue
+        key = os.path.relpath(output_path, output_directory)
+        jobs.append((path, output_path, check, cache, link, options or {},
+            hashes.get(key)))
+
+    if workers == 1:
+        results = map(convert_file, jobs)
+    else:
+        executor = ProcessPoolExecutor(max_workers=workers)
+        chunks = [jobs[i:i + chunksize]
+            for i in range(0, len(jobs), max(chunksize, 1))]
+        futures = [executor.submit(convert_chunk, c) for c in chunks]
+        results = (
+            result
+                for future in as_completed(futures)
+                    for result in future.result()
+        )
+
+    try:
+        for result in results:
+            if 'hashes' in result:
+                key = os.path.relpath(result['output'], output_directory)
+                hashes[key] = result.pop('hashes')
+            yield result
+    finally:
+        if workers != 1:
+            # Python before 3.9 can not cancel the futures on shutdown.
+            for future in futures:
+                future.cancel()
+            executor.shutdown()
+        if check == CHECK_HASH and jobs:
+            store_hashes(output_directory, hashes)
@@ -0,0 +1,371 @@
+#! /usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Copyright (c) 2018 by Karsten Lehmann <mail@kalehmann.de>
+#
+#    This file is part of PySFedit.
+#
+#    PySFedit is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    PySFedit is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    long with PySFedit. If not, see <http://www.gnu.org/licenses/>.
+
+
+"""
+This module provides a content addressed cache for font conversions.
+
+The output of a conversion only depends on the content of the input
+file, the exporter and its options. The cache stores each output under a
+hash of these, so repeated conversions of unchanged fonts are plain file
+copies or hard links. The size of the cache is bounded and the least
+recently used entries are evicted first.
+
+Only files laid out like entries, "key[:2]/key" below the directory of
+the cache, are ever evicted, so other files in the directory and the
+temporary files of other processes are left alone.
+"""
+
+import hashlib
+import os
+import re
+import shutil
+
+from . import get_importer_for_file, get_exporter_for_file, FontEncoding
+
+# Increase this whenever the output of an exporter changes for the same
+# input, to invalidate all existing cache entries.
+CACHE_FORMAT_VERSION = 1
+
+DEFAULT_MAX_SIZE = 256 * 1024 * 1024
+
+# When the cache grows too large, entries are evicted until its size is
+# this fraction of the maximum size, so the cache is not scanned again
+# with the next entry.
+EVICTION_TARGET = 0.8
+
+# Options of exporters that do not change their output
+IGNORED_OPTIONS = ('threads',)
+
+KEY_PATTERN = re.compile('[0-9a-f]+$')
+
+def get_default_cache_directory():
+    """Get the default directory of the conversion cache.
+
+    Returns:
+        str: The directory "pysfedit" in $XDG_CACHE_HOME or ~/.cache
+    """
+    cache_home = os.environ.get('XDG_CACHE_HOME') or os.path.join(
+        os.path.expanduser('~'), '.cache')
+
+    return os.path.join(cache_home, 'pysfedit')
+
+def get_temporary_path(path):
+    """Get a path next to a file for writing its new content, before it
+    atomically replaces the file.
+
+    Args:
+        path (str): The path of the file
+
+    Returns:
+        str: The temporary path, which is unique per process
+    """
+    directory, name = os.path.split(path)
+
+    return os.path.join(directory, '.%s.%d.tmp' % (name, os.getpid()))
+
+def install_file(source, destination, link=False):
+    """Copy or hard link a file to a destination, replacing an existing
+    file there atomically.
+
+    Args:
+        source (str): The path of the file to install
+        destination (str): The path to install the file to
+        link (bool): Whether to create a hard link instead of a copy.
+            Falls back to copying if linking is not possible, for
+            example across file systems.
+    """
+    directory = os.path.dirname(destination)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = get_temporary_path(destination)
+    try:
+        if link:
+            try:
+                os.link(source, tmp_path)
+            except OSError:
+                link = False
+        if not link:
+            shutil.copyfile(source, tmp_path)
+        os.replace(tmp_path, destination)
+    except BaseException:
+        if os.path.lexists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+class ConversionCache(object):
+    """A size bounded cache for the outputs of font conversions.
+
+    The cache can be shared between processes. All writes are atomic and
+    entries that vanish because another process evicted them are simply
+    created again.
+
+    Args:
+        directory (str): The directory of the cache. Defaults to
+            get_default_cache_directory()
+        max_size (int): The maximum size of all cached files in bytes
+    """
+    def __init__(self, directory=None, max_size=DEFAULT_MAX_SIZE):
+        self.__directory = directory or get_default_cache_directory()
+        self.__max_size = max_size
+        # The size of all entries, which is only known after the first
+        # scan and does not include entries of other processes.
+        self.__size = None
+
+    def get_directory(self):
+        """Get the directory of the cache.
+
+        Returns:
+            str: The directory of the cache
+        """
+        return self.__directory
+
+    def get_key(self, data, exporter, options=None):
+        """Get the key of a conversion.
+
+        Args:
+            data (bytes): The content of the input file
+            exporter (type): The Exporter subclass of the conversion
+            options (dict): The keyword arguments for the exporter. The
+                IGNORED_OPTIONS, which do not change the output, are not
+                part of the key.
+
+        Returns:
+            str: The key as hexadecimal string
+        """
+        options = sorted(
+            (name, value) for name, value in (options or {}).items()
+                if name not in IGNORED_OPTIONS
+        )
+        h = hashlib.sha256()
+        h.update(b'%d\0' % CACHE_FORMAT_VERSION)
+        h.update(('%s.%s\0' % (
+            exporter.__module__, exporter.__qualname__)).encode('utf8'))
+        h.update(repr(options).encode('utf8'))
+        h.update(b'\0')
+        h.update(hashlib.sha256(data).digest())
+
+        return h.hexdigest()
+
+    def get_path(self, key):
+        """Get the path of a cache entry.
+
+        Args:
+            key (str): The key of the entry
+
+        Returns:
+            str: The path of the entry, which might not exist
+        """
+        return os.path.join(self.__directory, key[:2], key)
+
+    def lookup(self, key):
+        """Look up an entry of the cache and mark it as recently used.
+
+        Args:
+            key (str): The key of the entry
+
+        Returns:
+            str: The path of the cached file or None if the cache has no
+                entry for the key
+        """
+        path = self.get_path(key)
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+
+            return None
+
+        return path
+
+    def store(self, key, data):
+        """Add an entry to the cache and evict old entries if the cache
+        grows too large.
+
+        Args:
+            key (str): The key of the entry
+            data (bytes): The content of the entry
+
+        Returns:
+            str: The path of the cached file
+        """
+        path = self.get_path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        try:
+            old_size = os.stat(path).st_size
+        except FileNotFoundError:
+            old_size = 0
+        tmp_path = get_temporary_path(path)
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+        if self.__size is None:
+            self.__size = sum(size for _, size, _ in self.__iter_entries())
+        else:
+            self.__size += len(data) - old_size
+        if self.__size > self.__max_size:
+            self.evict(keep=path)
+
+        return path
+
+    def __iter_entries(self):
+        """Iterate over the entries of the cache.
+
+        Yields:
+            tuple: The modification time in nanoseconds, the size and
+                the path of each entry
+        """
+        try:
+            directories = os.scandir(self.__directory)
+        except FileNotFoundError:
+            return
+        with directories:
+            for directory in directories:
+                if (len(directory.name) != 2 or
+                        not KEY_PATTERN.match(directory.name) or
+                        not directory.is_dir(follow_symlinks=False)):
+                    continue
+                with os.scandir(directory.path) as files:
+                    for entry in files:
+                        if (not entry.name.startswith(directory.name) or
+                                not KEY_PATTERN.match(entry.name)):
+                            continue
+                        try:
+                            st = entry.stat(follow_symlinks=False)
+                        except FileNotFoundError:
+                            continue
+                        yield st.st_mtime_ns, st.st_size, entry.path
+
+    def evict(self, keep=None):
+        """Remove the least recently used entries until the size of the
+        cache is at most EVICTION_TARGET times its maximum size.
+
+        Args:
+            keep (str): The path of an entry, that should not be removed
+        """
+        entries = sorted(self.__iter_entries())
+        total = sum(size for _, size, _ in entries)
+        target = self.__max_size * EVICTION_TARGET
+        for _, size, path in entries:
+            if total <= target:
+
+                break
+            if path == keep:
+                continue
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+        self.__size = total
+
+    def export(self, input_path, exporter, options=None):
+        """Get the cached output of a conversion, converting the input
+        file on a cache miss.
+
+        Args:
+            input_path (str): The path of the input file
+            exporter (type): The Exporter subclass of the conversion
+            options (dict): The keyword arguments for the exporter
+
+        Returns:
+            tuple: The path of the cached output file and whether it
+                was already cached.
+        """
+        with open(input_path, 'rb') as f:
+            data = f.read()
+        key = self.get_key(data, exporter, options)
+        path = self.lookup(key)
+        if path:
+
+            return path, True
+
+        font = get_importer_for_file(input_path).import_from_file(
+            input_path)
+        output = exporter(font, **(options or {})).export_to_data()
+        if isinstance(output, str):
+            output = output.encode('utf8')
+
+        return self.store(key, bytes(output)), False
+
+    def convert(self, input_path, output_path, options=None, link=False):
+        """Convert a font file through the cache. The exporter is chosen
+        by the extension of the output file.
+
+        Args:
+            input_path (str): The path of the input file
+            output_path (str): The path of the output file
+            options (dict): The keyword arguments for the exporter
+            link (bool): Whether to hard link the output file to the
+                cache entry instead of copying it. Do not modify hard
+                linked outputs in place, since that would alter the
+                cache entry as well.
+
+        Returns:
+            bool: Whether the output was already cached
+        """
+        exporter = get_exporter_for_file(output_path)
+
+        return self.convert_to_files(input_path, [output_path],
+            {exporter: options}, link)[0]
+
+    def convert_to_files(self, input_path, output_paths, options=None,
+            link=False):
+        """Convert a font file into several files through the cache. The
+        exporters are chosen by the extensions of the output files. The
+        font is imported and encoded at most once for all outputs that
+        are not cached yet, see export_to_files.
+
+        Args:
+            input_path (str): The path of the input file
+            output_paths (list): The paths of the output files
+            options (dict): Optional keyword arguments for the exporters
+                with the exporter classes as keys
+            link (bool): Whether to hard link the output files to the
+                cache entries instead of copying them, see convert
+
+        Returns:
+            list: Whether each output was already cached
+
+        Raises:
+            ValueError: If the extension of an output file is not
+                supported. No file is written in this case.
+        """
+        exporters = [get_exporter_for_file(path) for path in output_paths]
+        options = options or {}
+        with open(input_path, 'rb') as f:
+            data = f.read()
+        encoding = None
+        cached = []
+        for exporter, output_path in zip(exporters, output_paths):
+            exporter_options = options.get(exporter) or {}
+            key = self.get_key(data, exporter, exporter_options)
+            path = self.lookup(key)
+            cached.append(path is not None)
+            if path is None:
+                if encoding is None:
+                    encoding = FontEncoding(get_importer_for_file(
+                        input_path).import_from_file(input_path))
+                output = exporter(encoding.get_font(), encoding,
+                    **exporter_options).export_to_data()
+                if isinstance(output, str):
+                    output = output.encode('utf8')
+                path = self.store(key, bytes(output))
+            install_file(path, output_path, link)
+
+        return cached
@@ -0,0 +1,364 @@
+#! /usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Copyright (c) 2018 by Karsten Lehmann <mail@kalehmann.de>
+#
+#    This file is part of PySFedit.
+#
+#    PySFedit is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    PySFedit is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    long with PySFedit. If not, see <http://www.gnu.org/licenses/>.
+
+
+"""
+This module provides a persistent catalog of font files.
+
+The catalog stores the metadata from the headers of fonts and the
+codepoints covered by their unicode tables in a SQLite database. Fonts
+are scanned by a pool of worker processes and only files that are new or
+whose modification time or size changed since the last scan are read
+again. Queries for sizes and coverage are answered from the database
+alone, without touching the font files.
+
+The coverage of a font is stored as a zlib compressed bitset, where bit
+n is set if codepoint n is mapped to a glyph. Unicode sequences do not
+count as coverage of their codepoints. Like PcScreenFont.get_coverage,
+a font without unicode table covers the codepoints below its number of
+glyphs.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+import os
+import sqlite3
+import zlib
+
+from . import inspect, decode_unicode_table
+from .coverage import Coverage
+from .batch import find_font_files
+
+# Increase this whenever the schema or the content of the database
+# changes. Catalogs with another version are rebuilt on the next scan.
+SCHEMA_VERSION = 2
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS fonts (
+    path TEXT PRIMARY KEY,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    format TEXT,
+    version INTEGER,
+    width INTEGER,
+    height INTEGER,
+    length INTEGER,
+    has_unicode_table INTEGER,
+    codepoint_count INTEGER,
+    coverage BLOB,
+    error TEXT
+);
+CREATE INDEX IF NOT EXISTS fonts_size ON fonts (width, height);
+'''
+
+COLUMNS = ('path', 'mtime_ns', 'size', 'format', 'version', 'width',
+    'height', 'length', 'has_unicode_table', 'codepoint_count',
+    'coverage', 'error')
+
+# The columns returned by FontCatalog.find
+FIND_COLUMNS = tuple(column for column in COLUMNS if column != 'coverage')
+
+def get_default_data_directory():
+    """Get the default directory for persistent data of PySFedit.
+
+    The catalog is not stored in the cache directory, since the
+    ConversionCache evicts files from there.
+
+    Returns:
+        str: The directory "pysfedit" in $XDG_DATA_HOME or
+            ~/.local/share
+    """
+    data_home = os.environ.get('XDG_DATA_HOME') or os.path.join(
+        os.path.expanduser('~'), '.local', 'share')
+
+    return os.path.join(data_home, 'pysfedit')
+
+def get_default_catalog_path():
+    """Get the default path of the catalog database.
+
+    Returns:
+        str: The file catalog.sqlite in the data directory of PySFedit
+    """
+
+    return os.path.join(get_default_data_directory(), 'catalog.sqlite')
+
+def encode_coverage(bitset):
+    """Compress the bitset of a coverage for storing it.
+
+    Args:
+        bitset (int): The bitset of the coverage
+
+    Returns:
+        bytes: The compressed bitset
+    """
+    data = bitset.to_bytes((bitset.bit_length() + 7) // 8, 'little')
+
+    return zlib.compress(data)
+
+def decode_coverage(data):
+    """Decompress the stored bitset of a coverage.
+
+    Args:
+        data (bytes): The compressed bitset
+
+    Returns:
+        int: The bitset of the coverage
+    """
+
+    return int.from_bytes(zlib.decompress(data), 'little')
+
+def scan_file(job):
+    """Read the metadata and the coverage of a font file.
+
+    This function runs in the worker processes and therefore never
+    raises, but reports errors in its result.
+
+    Args:
+        job (tuple): The path of the file, its modification time in
+            nanoseconds and its size
+
+    Returns:
+        dict: The row of the font in the catalog
+    """
+    path, mtime_ns, size = job
+    row = dict.fromkeys(COLUMNS)
+    row.update(path=path, mtime_ns=mtime_ns, size=size)
+    try:
+        info = inspect(path)
+        header = info.header
+        if header.has_unicode_table():
+            coverage = Coverage(
+                codepoint
+                    for values, _ in decode_unicode_table(
+                        info.read_unicode_table(), header.version_psf)
+                    for codepoint in values
+            )
+        elif header.get_length():
+            coverage = Coverage.from_ranges([(0, header.get_length() - 1)])
+        else:
+            coverage = Coverage()
+        row.update(
+            format=info.format.name,
+            version=header.version_psf,
+            width=header.size[0],
+            height=header.size[1],
+            length=header.get_length(),
+            has_unicode_table=int(header.has_unicode_table()),
+            codepoint_count=len(coverage),
+            coverage=encode_coverage(coverage.to_bitset()),
+        )
+    except Exception as e:
+        row['error'] = '%s: %s' % (type(e).__name__, e)
+
+    return row
+
+class FontCatalog(object):
+    """A catalog of font files in a SQLite database.
+
+    Args:
+        path (str): The path of the database. Defaults to
+            get_default_catalog_path()
+    """
+    def __init__(self, path=None):
+        self.__path = path or get_default_catalog_path()
+        directory = os.path.dirname(self.__path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.__connection = sqlite3.connect(self.__path)
+        self.__connection.row_factory = sqlite3.Row
+        self.__create_schema()
+
+    def __create_schema(self):
+        """Create the tables of the catalog and drop catalogs of other
+        schema versions.
+        """
+        connection = self.__connection
+        version = connection.execute('PRAGMA user_version').fetchone()[0]
+        with connection:
+            if version != SCHEMA_VERSION:
+                connection.execute('DROP TABLE IF EXISTS fonts')
+                connection.execute(
+                    'PRAGMA user_version = %d' % SCHEMA_VERSION)
+            connection.executescript(SCHEMA)
+
+    def get_path(self):
+        """Get the path of the database of the catalog.
+
+        Returns:
+            str: The path of the database
+        """
+        return self.__path
+
+    def close(self):
+        """Close the database of the catalog."""
+        self.__connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def scan(self, patterns, workers=None, chunksize=1):
+        """Add the font files matching the given patterns to the
+        catalog and update the entries of changed files. Entries of
+        files that no longer exist are removed.
+
+        Args:
+            patterns (list): Glob patterns or directories of the font
+                files, see batch.find_font_files
+            workers (int): The number of worker processes. Defaults to
+                the number of processors. With 1 the files are scanned
+                in the calling process.
+            chunksize (int): The number of files sent to a worker at
+                once
+
+        Returns:
+            dict: The number of "added", "updated", "unchanged",
+                "removed" and "failed" files
+        """
+        summary = dict.fromkeys(
+            ['added', 'updated', 'unchanged', 'removed', 'failed'], 0)
+        known = {
+            row['path']: (row['mtime_ns'], row['size'])
+                for row in self.__connection.execute(
+                    'SELECT path, mtime_ns, size FROM fonts')
+        }
+        jobs = []
+        for path in find_font_files(patterns):
+            path = os.path.abspath(path)
+            stat = os.stat(path)
+            state = (stat.st_mtime_ns, stat.st_size)
+            if known.get(path) == state:
+                summary['unchanged'] += 1
+
+                continue
+            summary['updated' if path in known else 'added'] += 1
+            jobs.append((path,) + state)
+
+        if workers == 1 or len(jobs) < 2:
+            rows = map(scan_file, jobs)
+            self.__store(rows, summary)
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                rows = executor.map(scan_file, jobs, chunksize=chunksize)
+                self.__store(rows, summary)
+
+        removed = [(p,) for p in known if not os.path.exists(p)]
+        with self.__connection:
+            self.__connection.executemany(
+                'DELETE FROM fonts WHERE path = ?', removed)
+        summary['removed'] = len(removed)
+
+        return summary
+
+    def __store(self, rows, summary):
+        """Store scanned rows in the database.
+
+        Args:
+            rows (iterable): The rows from scan_file
+            summary (dict): The summary of the scan to count failed
+                files in
+        """
+        statement = 'INSERT OR REPLACE INTO fonts (%s) VALUES (%s)' % (
+            ', '.join(COLUMNS), ', '.join('?' * len(COLUMNS)))
+        with self.__connection:
+            for row in rows:
+                if row['error']:
+                    summary['failed'] += 1
+                self.__connection.execute(
+                    statement, [row[c] for c in COLUMNS])
+
+    def get_errors(self):
+        """Get the files that could not be scanned.
+
+        Returns:
+            list: Tuples with the path of each file and its error
+        """
+
+        return [
+            (row['path'], row['error'])
+                for row in self.__connection.execute(
+                    'SELECT path, error FROM fonts '
+                    'WHERE error IS NOT NULL ORDER BY path')
+        ]
+
+    def find(self, covers=None, width=None, height=None,
+            min_length=None, version=None):
+        """Find the fonts in the catalog matching all given criteria.
+
+        Args:
+            covers (iterable): Codepoints or tuples with the first and
+                the last codepoint of ranges, which must all be covered
+                by a font, see PcScreenFont.get_coverage
+            width (int): The width of the glyphs
+            height (int): The height of the glyphs
+            min_length (int): The minimum number of glyphs
+            version (int): The version of the pc screen font, either
+                PSF1_VERSION or PSF2_VERSION
+
+        Returns:
+            list: The rows of the matching fonts as sqlite3.Row objects
+                with the columns of the fonts table except the coverage,
+                sorted by path
+        """
+        conditions = ['error IS NULL']
+        parameters = []
+        for column, value in [('width', width), ('height', height),
+                              ('version', version)]:
+            if value is not None:
+                conditions.append('%s = ?' % column)
+                parameters.append(value)
+        if min_length is not None:
+            conditions.append('length >= ?')
+            parameters.append(min_length)
+        covers = Coverage.from_ranges(
+            r if isinstance(r, tuple) else (r, r) for r in covers or [])
+        mask = covers.to_bitset()
+        if mask:
+            conditions.append('codepoint_count >= ?')
+            parameters.append(len(covers))
+            # The bitsets do not fit into the integers of SQLite, so they
+            # are compared by a function.
+            self.__connection.create_function('covers', 1,
+                lambda data: decode_coverage(data) & mask == mask)
+            conditions.append('covers(coverage)')
+
+        return self.__connection.execute(
+            'SELECT %s FROM fonts WHERE %s ORDER BY path' % (
+                ', '.join(FIND_COLUMNS), ' AND '.join(conditions)),
+            parameters).fetchall()
+
+    def get_coverage(self, path):
+        """Get the codepoints covered by a font in the catalog.
+
+        Args:
+            path (str): The path of the font file
+
+        Returns:
+            Coverage: The covered codepoints or None if the font is not
+                in the catalog
+        """
+        row = self.__connection.execute(
+            'SELECT coverage FROM fonts WHERE path = ? AND error IS NULL',
+            (os.path.abspath(path),)).fetchone()
+        if row is None:
+
+            return None
+
+        return Coverage.from_bitset(decode_coverage(row['coverage']))
@@ -0,0 +1,319 @@
+#! /usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Copyright (c) 2018 by Karsten Lehmann <mail@kalehmann.de>
+#
+#    This file is part of PySFedit.
+#
+#    PySFedit is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    PySFedit is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    long with PySFedit. If not, see <http://www.gnu.org/licenses/>.
+
+
+
+"""
+This module profiles the characters of large text corpora, for example
+logs or translations, against a font.
+
+Files are read in blocks, so they never need to fit into memory. Large
+files are split into segments at UTF-8 character boundaries, which can
+be counted by a pool of worker processes. The resulting profile reports
+the codepoints missing from the unicode table of a font and suggests an
+ordering of the glyphs by frequency.
+"""
+
+import codecs
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+import os
+
+from .coverage import Coverage
+
+DEFAULT_BLOCK_SIZE = 1024 * 1024
+DEFAULT_SEGMENT_SIZE = 64 * 1024 * 1024
+
+# A character in UTF-8 has at most three continuation bytes.
+MAX_CONTINUATION_BYTES = 3
+
+def is_control(codepoint):
+    """Check whether a codepoint is a C0 or C1 control character. These
+    characters like newlines or tabulators are interpreted by terminals
+    and do not need a glyph.
+
+    Args:
+        codepoint (int): The codepoint
+
+    Returns:
+        bool: Whether the codepoint is a control character
+    """
+
+    return codepoint < 0x20 or 0x7F <= codepoint < 0xA0
+
+def count_continuation_bytes(data):
+    """Count the UTF-8 continuation bytes at the start of some data.
+
+    Args:
+        data (bytes): The data
+
+    Returns:
+        int: The number of leading continuation bytes, at most
+            MAX_CONTINUATION_BYTES
+    """
+    count = 0
+    for byte in data[:MAX_CONTINUATION_BYTES]:
+        if byte & 0xC0 != 0x80:
+            break
+        count += 1
+
+    return count
+
+def get_segments(path, segment_size=DEFAULT_SEGMENT_SIZE):
+    """Split a file into segments, which can be counted independently.
+
+    Args:
+        path (str): The path of the file
+        segment_size (int): The size of each segment in bytes
+
+    Returns:
+        list: A tuple with the path, the start and the end of each
+            segment
+    """
+    if segment_size <= MAX_CONTINUATION_BYTES:
+        raise ValueError("The segment size must be at least %d bytes" %
+            (MAX_CONTINUATION_BYTES + 1))
+    size = os.path.getsize(path)
+
+    return [
+        (path, start, min(start + segment_size, size))
+            for start in range(0, max(size, 1), segment_size)
+    ]
+
+def count_segment(job):
+    """Count the characters of a segment of an UTF-8 encoded file.
+
+    The segment contains all characters whose first byte lies between
+    the start and the end of the segment. Malformed data is counted as
+    the replacement character U+FFFD.
+
+    Args:
+        job (tuple): The path, the start and the end of the segment and
+            the number of bytes to read at once
+
+    Returns:
+        collections.Counter: The number of occurrences of each
+            character
+    """
+    path, start, end, block_size = job
+    counts = Counter()
+    decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+    with open(path, 'rb') as f:
+        f.seek(start)
+        data = f.read(min(max(block_size, MAX_CONTINUATION_BYTES + 1),
+            end - start))
+        if start:
+            # These bytes belong to the last character of the previous
+            # segment.
+            data = data[count_continuation_bytes(data):]
+        while data:
+            if f.tell() >= end:
+                tail = f.read(MAX_CONTINUATION_BYTES)
+                data += tail[:count_continuation_bytes(tail)]
+            counts.update(decoder.decode(data))
+            data = f.read(max(min(block_size, end - f.tell()), 0))
+    counts.update(decoder.decode(b'', final=True))
+
+    return counts
+
+def profile_files(paths, workers=None, segment_size=DEFAULT_SEGMENT_SIZE,
+    block_size=DEFAULT_BLOCK_SIZE):
+    """Count the characters of UTF-8 encoded text files.
+
+    Args:
+        paths (list): The paths of the text files
+        workers (int): The number of worker processes. Defaults to the
+            number of processors. With 1 the files are counted in the
+            calling process.
+        segment_size (int): The number of bytes counted by a worker at
+            once
+        block_size (int): The number of bytes read at once
+
+    Returns:
+        CorpusProfile: The profile of the text files
+    """
+    jobs = [
+        segment + (block_size,)
+            for path in paths
+            for segment in get_segments(path, segment_size)
+    ]
+    profile = CorpusProfile()
+    if workers == 1 or len(jobs) < 2:
+        for counts in map(count_segment, jobs):
+            profile.add_counts(counts)
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            for counts in executor.map(count_segment, jobs):
+                profile.add_counts(counts)
+
+    return profile
+
+class CorpusProfile(object):
+    """The number of occurrences of each character in a text corpus.
+
+    Text can be added in arbitrary chunks, the counts of all chunks add
+    up.
+    """
+    def __init__(self):
+        self.__characters = Counter()
+
+    def add_text(self, text):
+        """Count the characters of a text.
+
+        Args:
+            text (str): The text
+        """
+        self.__characters.update(text)
+
+    def add_counts(self, counts):
+        """Add the counts of characters from another source, for example
+        from count_segment.
+
+        Args:
+            counts (collections.Counter): The number of occurrences of
+                each character
+        """
+        self.__characters.update(counts)
+
+    def get_total(self):
+        """Get the number of characters in the corpus.
+
+        Returns:
+            int: The number of characters
+        """
+
+        return sum(self.__characters.values())
+
+    def get_counts(self):
+        """Get the number of occurrences of each codepoint.
+
+        Returns:
+            collections.Counter: The number of occurrences by codepoint
+        """
+
+        return Counter({ord(c): n for c, n in self.__characters.items()})
+
+    def get_coverage(self):
+        """Get the codepoints used in the corpus.
+
+        Returns:
+            Coverage: The codepoints
+        """
+
+        return Coverage(ord(c) for c in self.__characters)
+
+    def get_missing(self, font, controls=False):
+        """Get the codepoints of the corpus without a glyph in a font.
+
+        Args:
+            font (PcScreenFont): The font
+            controls (bool): Whether to report control characters, which
+                usually do not need a glyph
+
+        Returns:
+            list: A tuple with the codepoint and its number of
+                occurrences for each missing codepoint, the most
+                frequent first
+        """
+        coverage = font.get_coverage()
+
+        return [
+            (codepoint, count)
+                for codepoint, count in self.get_counts().most_common()
+                if codepoint not in coverage
+                    and (controls or not is_control(codepoint))
+        ]
+
+    def get_glyph_frequencies(self, font):
+        """Get the number of occurrences of each glyph of a font in the
+        corpus. A glyph occurs with each of its unicode values, unicode
+        sequences are not counted. Without an unicode table the index
+        of a glyph is its codepoint.
+
+        Args:
+            font (PcScreenFont): The font
+
+        Returns:
+            list: The number of occurrences for each glyph
+        """
+        counts = self.get_counts()
+        if not font.has_unicode_table():
+
+            return [counts[i] for i in range(len(font))]
+
+        return [
+            sum(counts[codepoint] for codepoint in description.codepoints)
+                for _, description in font
+        ]
+
+    def get_glyph_order(self, font):
+        """Suggest an ordering of the glyphs of a font with the most
+        frequent glyphs first. Glyphs with the same frequency keep their
+        relative order.
+
+        Args:
+            font (PcScreenFont): The font
+
+        Returns:
+            list: The current indices of the glyphs in the suggested
+                order
+        """
+        frequencies = self.get_glyph_frequencies(font)
+
+        return sorted(range(len(font)), key=lambda i: -frequencies[i])
+
+    def get_glyph_moves(self, font):
+        """Get the moves to reorder the glyphs of a font as suggested by
+        get_glyph_order. Glyphs that are already in place are not moved.
+
+        Notes:
+            Reordering only makes sense for fonts with an unicode table,
+            otherwise the index of a glyph is its codepoint.
+
+        Args:
+            font (PcScreenFont): The font
+
+        Returns:
+            list: The old and the new index for each call of
+                PcScreenFont.move_glyph, in the order they have to be
+                applied
+        """
+        # The glyphs in front of new_index are in place, the others
+        # keep their original order behind them. A glyph is therefore
+        # found after the placed glyphs, shifted by the unplaced glyphs
+        # with a lower original index. The placed glyphs are counted
+        # with a binary indexed tree.
+        size = len(font)
+        placed = [0] * (size + 1)
+        moves = []
+        for new_index, glyph in enumerate(self.get_glyph_order(font)):
+            placed_before = 0
+            position = glyph
+            while position > 0:
+                placed_before += placed[position]
+                position &= position - 1
+            old_index = new_index + glyph - placed_before
+            if old_index != new_index:
+                moves.append((old_index, new_index))
+            position = glyph + 1
+            while position <= size:
+                placed[position] += 1
+                position += position & -position
+
+        return moves
@@ -0,0 +1,412 @@
+#! /usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Copyright (c) 2018 by Karsten Lehmann <mail@kalehmann.de>
+#
+#    This file is part of PySFedit.
+#
+#    PySFedit is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    PySFedit is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    long with PySFedit. If not, see <http://www.gnu.org/licenses/>.
+
+
+"""
+This module provides a compact set of codepoints, for example the
+codepoints covered by the unicode table of a font.
+
+The codepoint space is split into chunks of 256 codepoints. Runs of
+completely covered chunks are stored as sorted ranges, the other
+chunks as bitsets. So the large contiguous blocks of fonts with many
+glyphs take almost no space, while sparse or fragmented blocks still
+need only 32 bytes per chunk. Membership tests are O(log n) in the
+number of runs, set operations are linear in the number of chunks.
+"""
+
+from bisect import bisect_right
+
+from .unicodeblocks import BLOCKS, NO_BLOCK, UnicodeBlock
+
+CHUNK_BITS = 8
+CHUNK_SIZE = 1 << CHUNK_BITS
+CHUNK_MASK = CHUNK_SIZE - 1
+FULL_CHUNK = (1 << CHUNK_SIZE) - 1
+
+def iter_bits(bits):
+    """Iterate over the indices of the set bits of an integer.
+
+    Args:
+        bits (int): The integer
+
+    Yields:
+        int: The indices of the set bits in ascending order
+    """
+    while bits:
+        lowest = bits & -bits
+        yield lowest.bit_length() - 1
+        bits ^= lowest
+
+def iter_bit_runs(bits):
+    """Iterate over the runs of consecutive set bits of an integer.
+
+    Args:
+        bits (int): The integer
+
+    Yields:
+        tuple: The index of the first and the last bit of each run in
+            ascending order
+    """
+    while bits:
+        start = (bits & -bits).bit_length() - 1
+        shifted = bits >> start
+        length = (~shifted & (shifted + 1)).bit_length() - 1
+        yield start, start + length - 1
+        bits &= ~(((1 << length) - 1) << start)
+
+def parse_ranges(spec):
+    """Parse codepoint ranges like "U+0400-U+04FF,2500-257F,41".
+
+    Args:
+        spec (str): Comma separated hexadecimal codepoints or ranges of
+            codepoints, optionally prefixed with "U+"
+
+    Returns:
+        list: Tuples with the first and the last codepoint of each range
+
+    Raises:
+        ValueError: If the spec is malformed
+    """
+    ranges = []
+    for part in spec.split(','):
+        part = part.strip()
+        if not part:
+
+            continue
+        first, _, last = part.partition('-')
+        first = int(first.strip().upper().replace('U+', ''), 16)
+        last = int(last.strip().upper().replace('U+', ''), 16) if last \
+            else first
+        if last < first:
+            raise ValueError("Invalid codepoint range %s" % part)
+        ranges.append((first, last))
+
+    return ranges
+
+class Coverage(object):
+    """An immutable set of codepoints.
+
+    Args:
+        codepoints (iterable): The codepoints of the set
+    """
+    def __init__(self, codepoints=()):
+        chunks = {}
+        for codepoint in codepoints:
+            chunk = codepoint >> CHUNK_BITS
+            chunks[chunk] = chunks.get(chunk, 0) | (
+                1 << (codepoint & CHUNK_MASK))
+        self.__set_chunks(chunks)
+
+    def __set_chunks(self, chunks):
+        """Store the chunks of the set. Full chunks are merged into
+        runs.
+
+        Args:
+            chunks (dict): The bitsets of the chunks by their index
+        """
+        self.__runs = []
+        self.__chunks = {}
+        for chunk in sorted(chunks):
+            bits = chunks[chunk]
+            if bits == FULL_CHUNK:
+                if self.__runs and self.__runs[-1][1] == chunk - 1:
+                    self.__runs[-1][1] = chunk
+                else:
+                    self.__runs.append([chunk, chunk])
+            elif bits:
+                self.__chunks[chunk] = bits
+        self.__run_starts = [first for first, _ in self.__runs]
+        self.__length = sum(
+            (last - first + 1) * CHUNK_SIZE for first, last in self.__runs
+        ) + sum(bin(bits).count('1') for bits in self.__chunks.values())
+
+    @classmethod
+    def from_chunks(cls, chunks):
+        """Create a set from the bitsets of its chunks.
+
+        Args:
+            chunks (dict): The bitsets of the chunks of 256 codepoints
+                by the index of the chunk
+
+        Returns:
+            Coverage: The set
+        """
+        coverage = cls()
+        coverage.__set_chunks(chunks)
+
+        return coverage
+
+    @classmethod
+    def from_ranges(cls, ranges):
+        """Create a set from ranges of codepoints.
+
+        Args:
+            ranges (iterable): Tuples with the first and the last
+                codepoint of each range
+
+        Returns:
+            Coverage: The set
+        """
+        chunks = {}
+        for first, last in ranges:
+            for chunk in range(first >> CHUNK_BITS,
+                               (last >> CHUNK_BITS) + 1):
+                low = max(first, chunk << CHUNK_BITS) & CHUNK_MASK
+                high = min(last, chunk << CHUNK_BITS | CHUNK_MASK) & \
+                    CHUNK_MASK
+                chunks[chunk] = chunks.get(chunk, 0) | (
+                    ((1 << (high - low + 1)) - 1) << low)
+
+        return cls.from_chunks(chunks)
+
+    @classmethod
+    def from_bitset(cls, bitset):
+        """Create a set from a bitset.
+
+        Args:
+            bitset (int): An integer with bit n set for each codepoint
+                n in the set
+
+        Returns:
+            Coverage: The set
+        """
+        size = CHUNK_SIZE // 8
+        data = bitset.to_bytes((bitset.bit_length() + 7) // 8, 'little')
+        chunks = {}
+        for offset in range(0, len(data), size):
+            bits = int.from_bytes(data[offset:offset + size], 'little')
+            if bits:
+                chunks[offset // size] = bits
+
+        return cls.from_chunks(chunks)
+
+    @classmethod
+    def from_text(cls, text):
+        """Create the set of the characters of a text.
+
+        Args:
+            text (str): The text
+
+        Returns:
+            Coverage: The set of the codepoints of the characters of
+                the text
+        """
+
+        return cls(ord(c) for c in set(text))
+
+    def get_chunks(self):
+        """Get the bitsets of all chunks of the set.
+
+        Returns:
+            dict: The bitsets of the chunks of 256 codepoints by the
+                index of the chunk
+        """
+        chunks = dict(self.__chunks)
+        for first, last in self.__runs:
+            for chunk in range(first, last + 1):
+                chunks[chunk] = FULL_CHUNK
+
+        return chunks
+
+    def to_bitset(self):
+        """Get the set as bitset.
+
+        Returns:
+            int: An integer with bit n set for each codepoint n in the
+                set
+        """
+        chunks = self.get_chunks()
+        if not chunks:
+
+            return 0
+        size = CHUNK_SIZE // 8
+        data = bytearray(size * (max(chunks) + 1))
+        for chunk, bits in chunks.items():
+            data[chunk * size:(chunk + 1) * size] = bits.to_bytes(
+                size, 'little')
+
+        return int.from_bytes(data, 'little')
+
+    def ranges(self):
+        """Iterate over the ranges of consecutive codepoints of the set.
+
+        Yields:
+            tuple: The first and the last codepoint of each range in
+                ascending order
+        """
+        current = None
+        for chunk, bits in sorted(self.get_chunks().items()):
+            base = chunk << CHUNK_BITS
+            for first, last in iter_bit_runs(bits):
+                if current and current[1] == base + first - 1:
+                    current[1] = base + last
+
+                    continue
+                if current:
+                    yield tuple(current)
+                current = [base + first, base + last]
+        if current:
+            yield tuple(current)
+
+    def blocks(self):
+        """Iterate over the set by the blocks of the Unicode standard.
+
+        Yields:
+            tuple: A unicodeblocks.UnicodeBlock and the part of the set
+                inside the block for each block with codepoints in the
+                set. Codepoints outside of all known blocks are yielded
+                last with a block named NO_BLOCK, whose first and last
+                codepoint are those of the remaining set.
+        """
+        chunks = self.get_chunks()
+        remaining = dict(chunks)
+        for block in BLOCKS:
+            part = {}
+            block_chunks = Coverage.from_ranges(
+                [(block.first, block.last)]).get_chunks()
+            for chunk, block_bits in block_chunks.items():
+                bits = chunks.get(chunk, 0) & block_bits
+                if bits:
+                    part[chunk] = bits
+                    remaining[chunk] &= ~bits
+            if part:
+                yield block, Coverage.from_chunks(part)
+        remaining = Coverage.from_chunks(remaining)
+        if remaining:
+            codepoints = list(remaining.ranges())
+            yield UnicodeBlock(
+                NO_BLOCK, codepoints[0][0], codepoints[-1][1]), remaining
+
+    def union(self, other):
+        """Get the union with another set.
+
+        Args:
+            other (Coverage): The other set
+
+        Returns:
+            Coverage: The codepoints in any of both sets
+        """
+        chunks = self.get_chunks()
+        for chunk, bits in other.get_chunks().items():
+            chunks[chunk] = chunks.get(chunk, 0) | bits
+
+        return Coverage.from_chunks(chunks)
+
+    def intersection(self, other):
+        """Get the intersection with another set.
+
+        Args:
+            other (Coverage): The other set
+
+        Returns:
+            Coverage: The codepoints in both sets
+        """
+        chunks = self.get_chunks()
+        other_chunks = other.get_chunks()
+
+        return Coverage.from_chunks({
+            chunk: bits & other_chunks[chunk]
+                for chunk, bits in chunks.items() if chunk in other_chunks
+        })
+
+    def difference(self, other):
+        """Get the difference to another set.
+
+        Args:
+            other (Coverage): The other set
+
+        Returns:
+            Coverage: The codepoints in this set, but not in the other
+        """
+        other_chunks = other.get_chunks()
+
+        return Coverage.from_chunks({
+            chunk: bits & ~other_chunks.get(chunk, 0)
+                for chunk, bits in self.get_chunks().items()
+        })
+
+    def issubset(self, other):
+        """Check whether all codepoints of this set are in another set.
+
+        Args:
+            other (Coverage): The other set
+
+        Returns:
+            bool: Whether this set is a subset of the other set
+        """
+
+        return not self.difference(other)
+
+    def issuperset(self, other):
+        """Check whether all codepoints of another set are in this set.
+
+        Args:
+            other (Coverage): The other set
+
+        Returns:
+            bool: Whether this set is a superset of the other set
+        """
+
+        return other.issubset(self)
+
+    __or__ = union
+    __and__ = intersection
+    __sub__ = difference
+    __le__ = issubset
+    __ge__ = issuperset
+
+    def __contains__(self, codepoint):
+        chunk = codepoint >> CHUNK_BITS
+        bits = self.__chunks.get(chunk)
+        if bits is not None:
+
+            return bool(bits >> (codepoint & CHUNK_MASK) & 1)
+        i = bisect_right(self.__run_starts, chunk) - 1
+
+        return i >= 0 and self.__runs[i][1] >= chunk
+
+    def __iter__(self):
+        for chunk, bits in sorted(self.get_chunks().items()):
+            base = chunk << CHUNK_BITS
+            for bit in iter_bits(bits):
+                yield base + bit
+
+    def __len__(self):
+        return self.__length
+
+    def __bool__(self):
+        return self.__length > 0
+
+    def __eq__(self, other):
+        if not isinstance(other, Coverage):
+
+            return NotImplemented
+
+        return (self.__runs == other.__runs and
+            self.__chunks == other.__chunks)
+
+    def __hash__(self):
+        return hash((
+            tuple(tuple(run) for run in self.__runs),
+            frozenset(self.__chunks.items())
+        ))
+
+    def __repr__(self):
+        return 'Coverage.from_ranges([%s])' % ', '.join(
+            '(0x%X, 0x%X)' % r for r in self.ranges())
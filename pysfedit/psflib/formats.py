@@ -0,0 +1,404 @@
+#! /usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Copyright (c) 2018 by Karsten Lehmann <mail@kalehmann.de>
+#
+#    This file is part of PySFedit.
+#
+#    PySFedit is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    PySFedit is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    long with PySFedit. If not, see <http://www.gnu.org/licenses/>.
+
+
+"""
+This module contains the registry of the file formats of fonts.
+
+A file format is described by a FontFormat with the extensions of its
+files, the magic bytes at the start of its uncompressed data, the
+compression of its files and its importer and exporter. The format of a
+file is detected from its first bytes, so a gzip compressed font named
+font.psf is still imported correctly. The extension is only used for
+formats without magic bytes, like asm files, and to choose the format of
+exported files.
+
+Importers and exporters can be registered as classes or as strings in
+the form "module:Class", which get imported on their first use. The
+modules of the compressions are imported lazily as well, so a format can
+be added without editing the callers and without slowing down the
+start of the application.
+"""
+
+import importlib
+import io
+
+# The number of bytes read from the start of a file to detect its format
+SNIFF_SIZE = 32
+
+def load_object(spec):
+    """Import an object given as string in the form "module:name".
+
+    Args:
+        spec (object): The string describing the object. Any other
+            object is returned unchanged.
+
+    Returns:
+        object: The imported object
+    """
+    if not isinstance(spec, str):
+
+        return spec
+    module_name, _, name = spec.partition(':')
+
+    return getattr(importlib.import_module(module_name), name)
+
+class Compression(object):
+    """A compression of font files.
+
+    Args:
+        name (str): The name of the compression
+        magic (bytes): The magic bytes at the start of compressed data
+        module (str): The name of the module with the functions open,
+            compress and decompress for the compression, like the
+            modules gzip, lzma and bz2 from the standard library. The
+            module is imported on its first use.
+        level_argument (str): The name of the keyword argument of the
+            compress function for the compression level
+    """
+    def __init__(self, name, magic, module, level_argument):
+        self.name = name
+        self.magic = magic
+        self.__module_name = module
+        self.__level_argument = level_argument
+        self.__module = None
+
+    def get_module(self):
+        """Get the module implementing the compression.
+
+        Returns:
+            module: The module of the compression
+        """
+        if self.__module is None:
+            self.__module = importlib.import_module(self.__module_name)
+
+        return self.__module
+
+    def matches(self, data):
+        """Check whether data is compressed with this compression.
+
+        Args:
+            data (bytes): The start of the data
+
+        Returns:
+            bool: Whether the data starts with the magic bytes of the
+                compression
+        """
+
+        return data.startswith(self.magic)
+
+    def open(self, file):
+        """Open compressed data for reading the decompressed data.
+
+        Args:
+            file (object): The path of a compressed file or a binary
+                file object with compressed data
+
+        Returns:
+            file object: A binary file object with the decompressed data
+        """
+
+        return self.get_module().open(file, 'rb')
+
+    def compress(self, data, level=None):
+        """Compress data.
+
+        Args:
+            data (bytes): The data to compress
+            level (int): The compression level or None for the default
+                level of the compression
+
+        Returns:
+            bytes: The compressed data
+        """
+        if level is None:
+
+            return self.get_module().compress(data)
+
+        return self.get_module().compress(
+            data, **{self.__level_argument: level})
+
+    def decompress(self, data):
+        """Decompress data.
+
+        Args:
+            data (bytes): The compressed data
+
+        Returns:
+            bytes: The decompressed data
+        """
+
+        return self.get_module().decompress(data)
+
+class FontFormat(object):
+    """A file format of fonts.
+
+    Args:
+        name (str): The name of the format, for example "psf.gz"
+        extensions (list): The extensions of files in this format
+        importer (object): The Importer subclass for the format or a
+            string in the form "module:Class"
+        exporter (object): The Exporter subclass for the format or a
+            string in the form "module:Class"
+        magic (list): The magic bytes at the start of the uncompressed
+            data of files in this format. Formats without magic bytes
+            are only detected by their extensions.
+        compression (Compression): The compression of files in this
+            format or None for uncompressed files
+    """
+    def __init__(self, name, extensions, importer=None, exporter=None,
+            magic=(), compression=None):
+        self.name = name
+        self.extensions = tuple(e.lower() for e in extensions)
+        self.magic = tuple(magic)
+        self.compression = compression
+        self.__importer = importer
+        self.__exporter = exporter
+
+    def get_importer(self):
+        """Get the importer of the format, importing it on first use.
+
+        Returns:
+            type: The Importer subclass
+
+        Raises:
+            ValueError: If fonts can not be imported from this format
+        """
+        if self.__importer is None:
+            raise ValueError(
+                "Can not import fonts from the format %s" % self.name)
+        self.__importer = load_object(self.__importer)
+
+        return self.__importer
+
+    def get_exporter(self):
+        """Get the exporter of the format, importing it on first use.
+
+        Returns:
+            type: The Exporter subclass
+
+        Raises:
+            ValueError: If fonts can not be exported to this format
+        """
+        if self.__exporter is None:
+            raise ValueError(
+                "Can not export fonts to the format %s" % self.name)
+        self.__exporter = load_object(self.__exporter)
+
+        return self.__exporter
+
+    def get_extension_length(self, file_path):
+        """Get the length of the extension of a file, if it is an
+        extension of this format.
+
+        Args:
+            file_path (str): The path of the file
+
+        Returns:
+            int: The length of the longest matching extension or 0 if no
+                extension matches
+        """
+        file_path = file_path.lower()
+
+        return max(
+            [len(e) for e in self.extensions if file_path.endswith(e)] or
+            [0]
+        )
+
+    def matches(self, data, compression):
+        """Check whether data belongs to this format.
+
+        Args:
+            data (bytes): The start of the uncompressed data
+            compression (Compression): The compression of the data or
+                None
+
+        Returns:
+            bool: Whether the data has the magic bytes and compression
+                of this format
+        """
+
+        return (compression is self.compression and
+            any(data.startswith(m) for m in self.magic))
+
+GZIP = Compression('gzip', b'\x1f\x8b', 'gzip', 'compresslevel')
+XZ = Compression('xz', b'\xfd7zXZ\x00', 'lzma', 'preset')
+BZ2 = Compression('bz2', b'BZh', 'bz2', 'compresslevel')
+
+_compressions = [GZIP, XZ, BZ2]
+_formats = []
+
+def register_compression(compression):
+    """Register a compression for the detection of compressed files.
+
+    Args:
+        compression (Compression): The compression to register
+    """
+    _compressions.append(compression)
+
+def register_format(font_format):
+    """Register a file format of fonts.
+
+    Args:
+        font_format (FontFormat): The format to register
+    """
+    _formats.append(font_format)
+
+def get_formats():
+    """Get all registered file formats of fonts.
+
+    Returns:
+        list: The registered FontFormat instances
+    """
+
+    return list(_formats)
+
+def get_extensions():
+    """Get the extensions of all registered file formats.
+
+    Returns:
+        tuple: The extensions, the longest first
+    """
+
+    return tuple(sorted(
+        set(e for f in _formats for e in f.extensions),
+        key=len, reverse=True
+    ))
+
+def get_compression(data):
+    """Detect the compression of data.
+
+    Args:
+        data (bytes): The start of the data
+
+    Returns:
+        Compression: The compression of the data or None, if the data
+            is not compressed with a registered compression
+    """
+    for compression in _compressions:
+        if compression.matches(data):
+
+            return compression
+
+    return None
+
+def _find_format(data, compression):
+    """Find the format of data by its magic bytes.
+
+    Args:
+        data (bytes): The start of the uncompressed data
+        compression (Compression): The compression of the data
+
+    Returns:
+        FontFormat: The format or None
+    """
+    for font_format in _formats:
+        if font_format.matches(data, compression):
+
+            return font_format
+
+    return None
+
+def sniff(data):
+    """Detect the format of font data by its first bytes.
+
+    Args:
+        data (bytes): The complete data of a font file
+
+    Returns:
+        FontFormat: The format of the data or None, if it could not be
+            detected
+    """
+    compression = get_compression(data[:SNIFF_SIZE])
+    if compression:
+        try:
+            with compression.open(io.BytesIO(data)) as f:
+                data = f.read(SNIFF_SIZE)
+        except Exception:
+            # Corrupt data, the importer will report the error
+
+            return None
+
+    return _find_format(data[:SNIFF_SIZE], compression)
+
+def sniff_file(file_path):
+    """Detect the format of a font file by its first bytes.
+
+    Only the start of the file is read and decompressed.
+
+    Args:
+        file_path (str): The path of the file
+
+    Returns:
+        FontFormat: The format of the file or None, if it could not be
+            detected
+    """
+    with open(file_path, 'rb') as f:
+        data = f.read(SNIFF_SIZE)
+    compression = get_compression(data)
+    if compression:
+        try:
+            with compression.open(file_path) as f:
+                data = f.read(SNIFF_SIZE)
+        except Exception:
+            # Corrupt data, the importer will report the error
+
+            return None
+
+    return _find_format(data, compression)
+
+def get_format_for_extension(file_path):
+    """Get the format of a file by its extension.
+
+    Args:
+        file_path (str): The path of the file
+
+    Returns:
+        FontFormat: The format with the longest extension matching the
+            path or None
+    """
+    best_format, best_length = None, 0
+    for font_format in _formats:
+        length = font_format.get_extension_length(file_path)
+        if length > best_length:
+            best_format, best_length = font_format, length
+
+    return best_format
+
+def get_format_for_file(file_path):
+    """Get the format of an existing font file. The format is detected
+    from the content of the file and only if that is not possible from
+    its extension.
+
+    Args:
+        file_path (str): The path of the file
+
+    Returns:
+        FontFormat: The format of the file
+
+    Raises:
+        ValueError: If the format of the file is unknown
+    """
+    font_format = sniff_file(file_path) or get_format_for_extension(
+        file_path)
+    if font_format is None:
+        raise ValueError(
+            "Can not import %s, unknown file format" % file_path)
+
+    return font_format
@@ -0,0 +1,147 @@
+#! /usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Copyright (c) 2018 by Karsten Lehmann <mail@kalehmann.de>
+#
+#    This file is part of PySFedit.
+#
+#    PySFedit is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    PySFedit is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    long with PySFedit. If not, see <http://www.gnu.org/licenses/>.
+
+
+"""
+This module compresses the data of gzip compressed pc screen fonts.
+
+The data gets compressed in independent blocks like pigz does. Each
+block is deflated on its own with the end of the previous block as
+dictionary and flushed to a byte boundary, so the compressed blocks can
+be simply concatenated to a single standard gzip member, which can be
+read by gzip, zcat and setfont. As zlib releases the global interpreter
+lock, the blocks can be compressed in a pool of threads. The output
+does not depend on the number of threads.
+"""
+
+import struct
+import zlib
+
+DEFAULT_COMPRESS_LEVEL = 9
+DEFAULT_BLOCK_SIZE = 128 * 1024
+# The size of the sliding window of deflate
+DICTIONARY_SIZE = 32 * 1024
+
+# The magic bytes, the compression method deflate, no flags and no
+# modification time for reproducible outputs
+GZIP_HEADER_START = b'\x1f\x8b\x08\x00\x00\x00\x00\x00'
+GZIP_OS_UNKNOWN = 255
+
+def get_gzip_header(level):
+    """Get the header of a gzip member.
+
+    Args:
+        level (int): The compression level of the member
+
+    Returns:
+        bytes: The header
+    """
+    if level == 9:
+        extra_flags = 2
+    elif level == 1:
+        extra_flags = 4
+    else:
+        extra_flags = 0
+
+    return GZIP_HEADER_START + bytes([extra_flags, GZIP_OS_UNKNOWN])
+
+def compress_block(block, dictionary, level, last):
+    """Deflate a block of data without a header.
+
+    Args:
+        block (bytes): The data to compress
+        dictionary (bytes): The data preceding the block or an empty
+            bytes object for the first block
+        level (int): The compression level
+        last (bool): Whether this is the last block of the stream
+
+    Returns:
+        bytes: The deflated block
+    """
+    if dictionary:
+        compressor = zlib.compressobj(level, zlib.DEFLATED,
+            -zlib.MAX_WBITS, zlib.DEF_MEM_LEVEL, zlib.Z_DEFAULT_STRATEGY,
+            dictionary)
+    else:
+        compressor = zlib.compressobj(level, zlib.DEFLATED,
+            -zlib.MAX_WBITS)
+
+    return compressor.compress(block) + compressor.flush(
+        zlib.Z_FINISH if last else zlib.Z_SYNC_FLUSH)
+
+def iter_compress(data, level=DEFAULT_COMPRESS_LEVEL, threads=1,
+        block_size=DEFAULT_BLOCK_SIZE):
+    """Compress data into a gzip stream.
+
+    Args:
+        data (bytes): The data to compress
+        level (int): The compression level from 0 to 9
+        threads (int): The number of threads to compress the blocks
+            with. With 1 all blocks are compressed in the calling
+            thread.
+        block_size (int): The size of the independently compressed
+            blocks
+
+    Yields:
+        bytes: The parts of the gzip stream in order
+
+    Raises:
+        ValueError: If the compression level, the number of threads or
+            the block size is invalid.
+    """
+    if not 0 <= level <= 9:
+        raise ValueError("The compression level must be between 0 and 9")
+    if threads < 1:
+        raise ValueError("At least one thread is needed for compression")
+    if block_size < 1:
+        raise ValueError("The block size must be positive")
+
+    view = memoryview(data)
+    offsets = range(0, len(view), block_size) if len(view) else [0]
+    jobs = (
+        (
+            view[offset:offset + block_size],
+            view[max(0, offset - DICTIONARY_SIZE):offset],
+            level,
+            offset + block_size >= len(view)
+        ) for offset in offsets
+    )
+
+    yield get_gzip_header(level)
+    if threads == 1 or len(offsets) == 1:
+        yield from (compress_block(*job) for job in jobs)
+    else:
+        from concurrent.futures import ThreadPoolExecutor
+
+        with ThreadPoolExecutor(max_workers=threads) as executor:
+            yield from executor.map(lambda job: compress_block(*job),
+                jobs)
+    yield struct.pack('<II', zlib.crc32(view), len(view) & 0xFFFFFFFF)
+
+def compress(data, level=DEFAULT_COMPRESS_LEVEL, threads=1,
+        block_size=DEFAULT_BLOCK_SIZE):
+    """Compress data into a gzip stream.
+
+    For the arguments see iter_compress.
+
+    Returns:
+        bytes: The gzip stream
+    """
+
+    return b''.join(iter_compress(data, level, threads, block_size))
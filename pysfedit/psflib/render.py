@@ -0,0 +1,390 @@
+#! /usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Copyright (c) 2018 by Karsten Lehmann <mail@kalehmann.de>
+#
+#    This file is part of PySFedit.
+#
+#    PySFedit is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    PySFedit is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    long with PySFedit. If not, see <http://www.gnu.org/licenses/>.
+
+
+
+"""
+This module lays out and renders text with the glyphs of a font.
+
+The renderer looks up single codepoints in a dictionary and unicode
+sequences in a trie, so a combining sequence like "A" followed by
+U+030A resolves to the glyph of the composed character if the font has
+one. Glyph rows are stored as integers and a line of text is blitted by
+shifting them together, one row of pixels at a time. The result is a
+packed bitmap with one bit per pixel, which can be written into portable
+bitmap files or converted into PIL images.
+
+Packed bitmaps are also expanded into RGBA pixels for the previews of
+the graphical user interface. The conversion works on whole bytes
+through a lookup table instead of single pixels.
+"""
+
+from functools import lru_cache
+
+@lru_cache(maxsize=16)
+def get_rgba_table(scale, foreground, background):
+    """Get a table with the RGBA pixels for each value of a byte of a
+    packed bitmap.
+
+    Args:
+        scale (int): How often each pixel is repeated horizontally
+        foreground (tuple): The RGBA color of set pixels
+        background (tuple): The RGBA color of unset pixels
+
+    Returns:
+        tuple: 256 bytes objects with 8 * scale RGBA pixels each
+    """
+    pixels = bytes(background) * scale, bytes(foreground) * scale
+
+    return tuple(
+        b''.join(pixels[i >> shift & 1] for shift in range(7, -1, -1))
+            for i in range(256)
+    )
+
+class PackedBitmap(object):
+    """A bitmap with one bit per pixel.
+
+    Each row is padded with zeros to whole bytes and the leftmost pixel
+    of a row is the most significant bit of its first byte, just like
+    the glyphs in pc screen fonts.
+
+    Args:
+        width (int): The width of the bitmap in pixels
+        height (int): The height of the bitmap in pixels
+        data (bytes): The packed rows, None for an empty bitmap
+    """
+    def __init__(self, width, height, data=None):
+        self.__width = width
+        self.__height = height
+        self.__stride = (width + 7) // 8
+        if data is None:
+            data = bytes(self.__stride * height)
+        if len(data) != self.__stride * height:
+            raise ValueError("Expected %d bytes of data, got %d" % (
+                self.__stride * height, len(data)))
+        self.__data = bytes(data)
+
+    @staticmethod
+    def from_rows(rows, width=None, height=None):
+        """Pack a bitmap from a list of rows.
+
+        Args:
+            rows (list): A list of lists, where each list represents a
+                row of the bitmap and contains 0s and 1s.
+            width (int): The width of the bitmap. Defaults to the length
+                of the rows, longer bitmaps are padded with unset
+                pixels on the right.
+            height (int): The height of the bitmap. Defaults to the
+                number of rows, higher bitmaps are padded with unset
+                pixels at the bottom.
+
+        Returns:
+            PackedBitmap: The packed bitmap
+        """
+        if width is None:
+            width = len(rows[0]) if rows else 0
+        if height is None:
+            height = len(rows)
+        stride = (width + 7) // 8
+        data = bytearray()
+        for row in rows[:height]:
+            value = 0
+            for pixel in row[:width]:
+                value = value << 1 | pixel
+            value <<= stride * 8 - min(len(row), width)
+            data += value.to_bytes(stride, 'big')
+        data += bytes(stride * (height - min(len(rows), height)))
+
+        return PackedBitmap(width, height, data)
+
+    def get_size(self):
+        """Get the size of the bitmap in pixels.
+
+        Returns:
+            tuple: The width and the height of the bitmap
+        """
+
+        return self.__width, self.__height
+
+    def get_stride(self):
+        """Get the number of bytes of each row.
+
+        Returns:
+            int: The number of bytes of each row
+        """
+
+        return self.__stride
+
+    def get_data(self):
+        """Get the packed rows of the bitmap.
+
+        Returns:
+            bytes: The packed rows
+        """
+
+        return self.__data
+
+    def to_rows(self):
+        """Unpack the bitmap.
+
+        Returns:
+            list: A list of lists, where each list represents a row of
+                the bitmap and contains 0s and 1s.
+        """
+        if not self.__width:
+
+            return [[] for _ in range(self.__height)]
+        rows = []
+        padding = self.__stride * 8 - self.__width
+        for start in range(0, len(self.__data), self.__stride):
+            value = int.from_bytes(
+                self.__data[start:start + self.__stride], 'big') >> padding
+            rows.append([
+                value >> shift & 1
+                    for shift in range(self.__width - 1, -1, -1)
+            ])
+
+        return rows
+
+    def to_pbm(self):
+        """Get the bitmap as binary portable bitmap (P4).
+
+        Returns:
+            bytes: The content of the pbm file
+        """
+
+        return b"P4\n%d %d\n" % (self.__width, self.__height) + self.__data
+
+    def to_image(self):
+        """Convert the bitmap into an image with the mode "1" of the
+        Python Imaging Library. Set pixels are white.
+
+        Returns:
+            PIL.Image.Image: The image
+        """
+        from PIL import Image
+
+        return Image.frombytes('1', (self.__width, self.__height),
+            self.__data)
+
+    def to_rgba(self, scale=1, foreground=(0, 0, 0, 255),
+                background=(0, 0, 0, 0)):
+        """Expand the bitmap into RGBA pixels with 8 bits per channel.
+
+        Args:
+            scale (int): The factor to enlarge the bitmap with in both
+                directions
+            foreground (tuple): The RGBA color of set pixels
+            background (tuple): The RGBA color of unset pixels
+
+        Returns:
+            bytes: The pixels without padding, the stride is
+                width * scale * 4 bytes.
+        """
+        if not self.__width:
+
+            return b''
+        table = get_rgba_table(scale, tuple(foreground), tuple(background))
+        length = self.__width * scale * 4
+        rows = []
+        for start in range(0, len(self.__data), self.__stride):
+            row = b''.join(map(table.__getitem__,
+                self.__data[start:start + self.__stride]))[:length]
+            rows.append(row * scale)
+
+        return b''.join(rows)
+
+class TextRenderer(object):
+    """This class renders text with the glyphs of a font.
+
+    The lookup tables are built once, so a renderer should be reused for
+    all texts rendered with a font. Changes of the font after creating
+    the renderer are not noticed.
+
+    Args:
+        font (PcScreenFont): The font
+        replacement (int): The codepoint whose glyph is used for
+            characters without a glyph, for example 0xFFFD. If the font
+            has no glyph for it either, these characters are left
+            blank.
+    """
+    def __init__(self, font, replacement=None):
+        self.__font = font
+        self.__width, self.__height = font.get_header().size
+        self.__glyph_rows = {}
+        self.__index = {}
+        self.__trie = {}
+        if font.has_unicode_table():
+            for i, (_, description) in enumerate(font):
+                for codepoint in description.codepoints:
+                    self.__index.setdefault(codepoint, i)
+                for sequence in description.seq_codepoints:
+                    self.__add_sequence(sequence, i)
+        else:
+            self.__index = {i: i for i in range(len(font))}
+        self.__replacement = self.__index.get(replacement)
+
+    def __add_sequence(self, sequence, glyph_index):
+        """Add an unicode sequence to the trie.
+
+        Args:
+            sequence (list): The codepoints of the sequence
+            glyph_index (int): The index of the glyph for the sequence
+        """
+        node = self.__trie
+        for codepoint in sequence:
+            node = node.setdefault(codepoint, {})
+        node.setdefault(None, glyph_index)
+
+    def get_glyph_size(self):
+        """Get the size of the glyphs and therefore of the cells of the
+        rendered text.
+
+        Returns:
+            tuple: The width and the height of a glyph in pixels
+        """
+
+        return self.__width, self.__height
+
+    def get_glyph_index(self, codepoint):
+        """Get the index of the glyph for a codepoint.
+
+        Args:
+            codepoint (int): The codepoint
+
+        Returns:
+            int: The index of the glyph or None if the font has no glyph
+                for the codepoint and no replacement glyph
+        """
+
+        return self.__index.get(codepoint, self.__replacement)
+
+    def get_glyph_rows(self, glyph_index):
+        """Get the rows of a glyph as integers, the leftmost pixel being
+        the most significant bit.
+
+        Args:
+            glyph_index (int): The index of the glyph or None for a
+                blank cell
+
+        Returns:
+            list: An integer for each row of the glyph
+        """
+        rows = self.__glyph_rows.get(glyph_index)
+        if rows is not None:
+
+            return rows
+        if glyph_index is None:
+            rows = [0] * self.__height
+        else:
+            row_length = (self.__width + 7) // 8
+            padding = row_length * 8 - self.__width
+            data = self.__font.get_glyph(glyph_index).to_bytes()
+            rows = [
+                int.from_bytes(data[i:i + row_length], 'big') >> padding
+                    for i in range(0, len(data), row_length)
+            ]
+        self.__glyph_rows[glyph_index] = rows
+
+        return rows
+
+    def layout_line(self, line):
+        """Map the characters of a line of text to glyphs. The longest
+        unicode sequence of the font that matches at a position wins
+        over the single codepoint.
+
+        Args:
+            line (str): The line without line breaks
+
+        Returns:
+            list: The index of the glyph for each cell of the line or
+                None for blank cells
+        """
+        codepoints = [ord(c) for c in line]
+        cells = []
+        i = 0
+        while i < len(codepoints):
+            node = self.__trie.get(codepoints[i])
+            match = None
+            j = i + 1
+            while node is not None:
+                if None in node and j - i > 1:
+                    match = node[None], j
+                if j == len(codepoints):
+                    break
+                node = node.get(codepoints[j])
+                j += 1
+            if match:
+                cells.append(match[0])
+                i = match[1]
+
+                continue
+            cells.append(self.get_glyph_index(codepoints[i]))
+            i += 1
+
+        return cells
+
+    def layout(self, text):
+        """Map the characters of a text to glyphs.
+
+        Args:
+            text (str): The text, it may span multiple lines
+
+        Returns:
+            list: The glyph indices for each line, see layout_line
+        """
+
+        return [self.layout_line(line) for line in text.split('\n')]
+
+    def render_cells(self, lines):
+        """Render lines of glyphs. Shorter lines are padded with blank
+        cells on the right.
+
+        Args:
+            lines (list): A list with the glyph indices for each line
+
+        Returns:
+            PackedBitmap: The rendered lines
+        """
+        columns = max((len(line) for line in lines), default=0)
+        width = columns * self.__width
+        stride = (width + 7) // 8
+        data = bytearray()
+        for line in lines:
+            glyphs = [self.get_glyph_rows(g) for g in line]
+            padding = stride * 8 - len(line) * self.__width
+            for y in range(self.__height):
+                row = 0
+                for rows in glyphs:
+                    row = row << self.__width | rows[y]
+                data += (row << padding).to_bytes(stride, 'big')
+
+        return PackedBitmap(width, len(lines) * self.__height, data)
+
+    def render(self, text):
+        """Render a text.
+
+        Args:
+            text (str): The text, it may span multiple lines
+
+        Returns:
+            PackedBitmap: The rendered text
+        """
+
+        return self.render_cells(self.layout(text))
@@ -0,0 +1,420 @@
+#! /usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Copyright (c) 2018 by Karsten Lehmann <mail@kalehmann.de>
+#
+#    This file is part of PySFedit.
+#
+#    PySFedit is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    PySFedit is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    long with PySFedit. If not, see <http://www.gnu.org/licenses/>.
+
+
+
+"""
+This module emulates the text screen of a terminal drawn with a font,
+for example the 80x25 cells of the linux console.
+
+Each cell holds a glyph with a foreground and a background color. Only
+the cells changed since the last redraw are drawn into the framebuffer.
+Glyphs are pre-rendered once per combination of colors into tiles,
+whose rows are copied into the framebuffer with slice assignments. When
+most of a line changed, the line is drawn at once by joining the rows of
+its tiles.
+"""
+
+from .render import TextRenderer
+
+MODE_RGBA = 'RGBA'
+MODE_MONO = '1'
+
+DEFAULT_COLORS = {
+    MODE_RGBA: ((0xAA, 0xAA, 0xAA, 0xFF), (0x00, 0x00, 0x00, 0xFF)),
+    MODE_MONO: (1, 0),
+}
+
+# The tile cache gets cleared when it holds more tiles.
+TILE_CACHE_SIZE = 4096
+
+class TerminalGrid(object):
+    """A grid of character cells drawn into a framebuffer.
+
+    In MODE_RGBA the framebuffer has four bytes per pixel, colors are
+    tuples with the red, green, blue and alpha values. In MODE_MONO the
+    framebuffer is packed with one bit per pixel like a PackedBitmap and
+    colors are either 0 or 1.
+
+    Args:
+        font (PcScreenFont): The font
+        columns (int): The number of cells per line
+        rows (int): The number of lines
+        mode (str): Either MODE_RGBA or MODE_MONO
+        foreground (object): The default foreground color
+        background (object): The default background color
+        replacement (int): The codepoint of the glyph for characters the
+            font has no glyph for, see TextRenderer
+    """
+    def __init__(self, font, columns=80, rows=25, mode=MODE_RGBA,
+        foreground=None, background=None, replacement=0xFFFD):
+        if mode not in DEFAULT_COLORS:
+            raise ValueError("Unknown mode %r" % mode)
+        if columns < 1 or rows < 1:
+            raise ValueError("The grid needs at least one cell")
+        self.__renderer = TextRenderer(font, replacement)
+        self.__cell_width, self.__cell_height = \
+            self.__renderer.get_glyph_size()
+        self.__columns = columns
+        self.__rows = rows
+        self.__mode = mode
+        default_foreground, default_background = DEFAULT_COLORS[mode]
+        self.__foreground = default_foreground if foreground is None \
+            else foreground
+        self.__background = default_background if background is None \
+            else background
+
+        width = columns * self.__cell_width
+        if mode == MODE_RGBA:
+            self.__cell_size = self.__cell_width * 4
+        elif self.__cell_width % 8 == 0:
+            self.__cell_size = self.__cell_width // 8
+        else:
+            # The cells do not start at byte boundaries, so their rows
+            # have to be shifted together.
+            self.__cell_size = None
+        self.__stride = width * 4 if mode == MODE_RGBA else (width + 7) // 8
+        self.__framebuffer = bytearray(
+            self.__stride * rows * self.__cell_height)
+        self.__tiles = {}
+        blank = (None, self.__foreground, self.__background)
+        self.__cells = [blank] * (columns * rows)
+        # The tiles of the cells, so drawing needs no lookups. They are
+        # None for cells not drawn since they changed.
+        self.__cell_tiles = [None] * (columns * rows)
+        self.__dirty = set(range(columns * rows))
+        self.__damage = []
+
+    def get_size(self):
+        """Get the size of the grid in cells.
+
+        Returns:
+            tuple: The number of columns and rows
+        """
+
+        return self.__columns, self.__rows
+
+    def get_pixel_size(self):
+        """Get the size of the framebuffer in pixels.
+
+        Returns:
+            tuple: The width and the height of the framebuffer
+        """
+
+        return (self.__columns * self.__cell_width,
+            self.__rows * self.__cell_height)
+
+    def get_mode(self):
+        """Get the mode of the framebuffer.
+
+        Returns:
+            str: Either MODE_RGBA or MODE_MONO
+        """
+
+        return self.__mode
+
+    def get_stride(self):
+        """Get the number of bytes per row of pixels of the framebuffer.
+
+        Returns:
+            int: The number of bytes per row
+        """
+
+        return self.__stride
+
+    def get_framebuffer(self):
+        """Get the framebuffer. It is updated in place by redraw, so it
+        can be shared with the code showing it.
+
+        Returns:
+            bytearray: The framebuffer
+        """
+
+        return self.__framebuffer
+
+    def get_cell(self, column, row):
+        """Get the content of a cell.
+
+        Args:
+            column (int): The column of the cell
+            row (int): The row of the cell
+
+        Returns:
+            tuple: The index of the glyph or None for a blank cell, the
+                foreground and the background color
+        """
+
+        return self.__cells[self.__get_index(column, row)]
+
+    def __get_index(self, column, row):
+        if not (0 <= column < self.__columns and 0 <= row < self.__rows):
+            raise IndexError("The cell %d, %d is outside of the grid" % (
+                column, row))
+
+        return row * self.__columns + column
+
+    def __set_cell(self, index, cell):
+        if self.__cells[index] != cell:
+            self.__cells[index] = cell
+            self.__cell_tiles[index] = None
+            self.__dirty.add(index)
+
+    def put_glyph(self, column, row, glyph_index, foreground=None,
+        background=None):
+        """Put a glyph into a cell.
+
+        Args:
+            column (int): The column of the cell
+            row (int): The row of the cell
+            glyph_index (int): The index of the glyph or None for a
+                blank cell
+            foreground (object): The foreground color, defaults to the
+                default foreground color of the grid
+            background (object): The background color, defaults to the
+                default background color of the grid
+        """
+        self.__set_cell(self.__get_index(column, row), (
+            glyph_index,
+            self.__foreground if foreground is None else foreground,
+            self.__background if background is None else background,
+        ))
+
+    def write(self, column, row, text, foreground=None, background=None):
+        """Write a line of text into the grid starting at a cell. Unicode
+        sequences of the font take a single cell and text beyond the end
+        of the line is cut off.
+
+        Args:
+            column (int): The column of the first cell
+            row (int): The row of the cells
+            text (str): The text without line breaks
+            foreground (object): The foreground color, see put_glyph
+            background (object): The background color, see put_glyph
+
+        Returns:
+            int: The number of cells written
+        """
+        cells = self.__renderer.layout_line(text)
+        cells = cells[:max(self.__columns - column, 0)]
+        for offset, glyph_index in enumerate(cells):
+            self.put_glyph(column + offset, row, glyph_index, foreground,
+                background)
+
+        return len(cells)
+
+    def clear(self, foreground=None, background=None):
+        """Clear all cells.
+
+        Args:
+            foreground (object): The foreground color, see put_glyph
+            background (object): The background color, see put_glyph
+        """
+        cell = (
+            None,
+            self.__foreground if foreground is None else foreground,
+            self.__background if background is None else background,
+        )
+        for index in range(len(self.__cells)):
+            self.__set_cell(index, cell)
+
+    def scroll(self, lines=1):
+        """Scroll the content of the grid up by a number of lines. The
+        framebuffer is moved along, so the scrolled cells need no
+        redraw. The new lines at the bottom are blank. The moved lines
+        are reported as changed area by the next redraw.
+
+        Args:
+            lines (int): The number of lines to scroll
+        """
+        lines = min(max(lines, 0), self.__rows)
+        if not lines:
+
+            return
+        self.__draw_dirty()
+        count = lines * self.__columns
+        blank = (None, self.__foreground, self.__background)
+        self.__cells[:-count] = self.__cells[count:]
+        self.__cells[-count:] = [blank] * count
+        self.__cell_tiles[:-count] = self.__cell_tiles[count:]
+        self.__cell_tiles[-count:] = [None] * count
+        offset = lines * self.__cell_height * self.__stride
+        self.__framebuffer[:-offset] = self.__framebuffer[offset:]
+        self.__dirty.update(range(len(self.__cells) - count,
+            len(self.__cells)))
+        # Everything above the new lines moved, including the areas
+        # not yet reported.
+        self.__damage = []
+        if lines < self.__rows:
+            self.__damage.append((0, 0, self.__columns * self.__cell_width,
+                (self.__rows - lines) * self.__cell_height))
+
+    def invalidate(self):
+        """Mark all cells for the next redraw."""
+        self.__dirty.update(range(len(self.__cells)))
+
+    def get_dirty_cells(self):
+        """Get the cells changed since the last redraw.
+
+        Returns:
+            list: The column and row of each changed cell
+        """
+
+        return [divmod(i, self.__columns)[::-1] for i in sorted(self.__dirty)]
+
+    def __get_tile(self, cell):
+        """Get the pre-rendered rows of a cell.
+
+        Args:
+            cell (tuple): The glyph index, foreground and background
+
+        Returns:
+            list: The rows as bytes or, if the cells do not start at byte
+                boundaries in MODE_MONO, as strings of the digits 0 and
+                1, which are joined and converted into the bytes of a
+                line at once
+        """
+        tile = self.__tiles.get(cell)
+        if tile is not None:
+
+            return tile
+        glyph_index, foreground, background = cell
+        rows = self.__renderer.get_glyph_rows(glyph_index)
+        width = self.__cell_width
+        if self.__mode == MODE_RGBA:
+            pixels = (bytes(background), bytes(foreground))
+            tile = [
+                b''.join(pixels[row >> shift & 1]
+                    for shift in range(width - 1, -1, -1))
+                    for row in rows
+            ]
+        else:
+            mask = (1 << width) - 1
+            tile = [
+                (row if foreground else 0) | (~row & mask if background
+                    else 0)
+                    for row in rows
+            ]
+            if self.__cell_size:
+                tile = [row.to_bytes(self.__cell_size, 'big')
+                    for row in tile]
+            else:
+                tile = ['{:0{}b}'.format(row, width) for row in tile]
+        if len(self.__tiles) >= TILE_CACHE_SIZE:
+            self.__tiles.clear()
+        self.__tiles[cell] = tile
+
+        return tile
+
+    def redraw(self):
+        """Draw the changed cells into the framebuffer.
+
+        Returns:
+            list: The changed areas of the framebuffer as tuples with the
+                x and y coordinates, the width and the height in pixels,
+                one for the lines moved by scroll and one for each line
+                with changed cells
+        """
+        areas = self.__damage + self.__draw_dirty()
+        self.__damage = []
+
+        return areas
+
+    def __draw_dirty(self):
+        """Draw the changed cells into the framebuffer.
+
+        Returns:
+            list: The changed areas of the framebuffer, see redraw
+        """
+        if not self.__dirty:
+
+            return []
+        if len(self.__dirty) == len(self.__cells):
+            # Grouping the cells of a full redraw is not needed.
+            lines = dict.fromkeys(range(self.__rows), range(self.__columns))
+        else:
+            lines = {}
+            for index in self.__dirty:
+                lines.setdefault(index // self.__columns, []).append(
+                    index % self.__columns)
+        self.__dirty.clear()
+
+        areas = []
+        for row, columns in sorted(lines.items()):
+            if (self.__cell_size is None or
+                    len(columns) * 4 >= self.__columns):
+                self.__draw_line(row)
+                first, last = 0, self.__columns - 1
+            else:
+                for column in columns:
+                    self.__draw_cell(column, row)
+                first, last = min(columns), max(columns)
+            areas.append((
+                first * self.__cell_width,
+                row * self.__cell_height,
+                (last - first + 1) * self.__cell_width,
+                self.__cell_height,
+            ))
+
+        return areas
+
+    def __get_cell_tiles(self, index, count):
+        """Get the tiles of consecutive cells.
+
+        Args:
+            index (int): The index of the first cell
+            count (int): The number of cells
+
+        Returns:
+            list: The tile of each cell, see __get_tile
+        """
+        tiles = self.__cell_tiles[index:index + count]
+        if None in tiles:
+            for i, tile in enumerate(tiles):
+                if tile is None:
+                    tiles[i] = self.__cell_tiles[index + i] = \
+                        self.__get_tile(self.__cells[index + i])
+
+        return tiles
+
+    def __draw_cell(self, column, row):
+        """Copy the tile of a cell into the framebuffer."""
+        tile = self.__get_cell_tiles(row * self.__columns + column, 1)[0]
+        size = self.__cell_size
+        start = row * self.__cell_height * self.__stride + column * size
+        for tile_row in tile:
+            self.__framebuffer[start:start + size] = tile_row
+            start += self.__stride
+
+    def __draw_line(self, row):
+        """Draw all cells of a line into the framebuffer."""
+        tiles = self.__get_cell_tiles(row * self.__columns, self.__columns)
+        start = row * self.__cell_height * self.__stride
+        stride = self.__stride
+        if self.__cell_size:
+            for line_row in zip(*tiles):
+                self.__framebuffer[start:start + stride] = \
+                    b''.join(line_row)
+                start += stride
+
+            return
+        padding = '0' * (stride * 8 - self.__columns * self.__cell_width)
+        for line_row in zip(*tiles):
+            self.__framebuffer[start:start + stride] = int(
+                ''.join(line_row) + padding, 2).to_bytes(stride, 'big')
+            start += stride
@@ -23,6 +23,7 @@ functionalities.
 """
 import collections
 import gzip
+import io
 from ... import psflib
 
 class TestFont(object):
@@ -113,9 +114,19 @@ class TestFont(object):
 
         return len(self.__glyphs)
 
+def gzip_compress(data):
+    """Compress data like the PsfGzExporter with no modification time
+    in the gzip header.
+    """
+    buffer = io.BytesIO()
+    with gzip.GzipFile(fileobj=buffer, mode='wb', mtime=0) as f:
+        f.write(data)
+
+    return buffer.getvalue()
+
 def getCompressedTestFont(test_font):
     old = test_font.get_data
-    test_font.get_data = lambda: gzip.compress(
+    test_font.get_data = lambda: gzip_compress(
             old()
         )
 
@@ -0,0 +1,144 @@
+#! /usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Copyright (c) 2018 by Karsten Lehmann <mail@kalehmann.de>
+#
+#    This file is part of PySFedit.
+#
+#    PySFedit is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    PySFedit is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    long with PySFedit. If not, see <http://www.gnu.org/licenses/>.
+
+
+"""
+This module tests the batch conversion of the psflib.
+"""
+
+import os
+import tempfile
+import unittest
+from .. import batch
+from ..cache import ConversionCache
+from .data_for_testing import *
+
+class BatchTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.input = os.path.join(self.directory.name, 'input')
+        self.output = os.path.join(self.directory.name, 'output')
+        os.makedirs(os.path.join(self.input, 'sub'))
+        self.write_file('a.psf', get_font_psf2_unicode().get_data())
+        self.write_file(os.path.join('sub', 'b.psf.gz'),
+                        get_font_psf_256_sequences_compressed().get_data())
+        self.write_file('ignored.txt', b'')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def write_file(self, name, data):
+        with open(os.path.join(self.input, name), 'wb') as f:
+            f.write(data)
+
+    def convert(self, **kwargs):
+        kwargs.setdefault('workers', 1)
+
+        return sorted(batch.convert_files(
+            [self.input], self.output, '.psf', **kwargs),
+            key=lambda result: result['input'])
+
+    def test_convert_files(self):
+        for workers in (1, 2):
+            with self.subTest(workers=workers):
+                results = self.convert(workers=workers, check='none')
+
+                self.assertEqual(
+                    [r['status'] for r in results],
+                    [batch.STATUS_CONVERTED, batch.STATUS_CONVERTED]
+                )
+                self.assertEqual(
+                    results[1]['output'],
+                    os.path.join(self.output, 'sub', 'b.psf')
+                )
+                with open(results[1]['output'], 'rb') as f:
+                    self.assertEqual(
+                        f.read(), get_font_psf_256_sequences().get_data())
+
+    def test_skip_up_to_date(self):
+        self.convert()
+        results = self.convert()
+
+        self.assertEqual(
+            [r['status'] for r in results],
+            [batch.STATUS_SKIPPED, batch.STATUS_SKIPPED]
+        )
+
+        results = self.convert(check=batch.CHECK_HASH)
+        self.assertEqual(
+            [r['status'] for r in results],
+            [batch.STATUS_UNCHANGED, batch.STATUS_UNCHANGED]
+        )
+
+    def test_stored_hashes(self):
+        results = self.convert(check=batch.CHECK_HASH)
+        self.assertEqual(
+            [r['status'] for r in results],
+            [batch.STATUS_CONVERTED, batch.STATUS_CONVERTED]
+        )
+        self.assertTrue(os.path.exists(
+            os.path.join(self.output, batch.HASH_FILE_NAME)))
+
+        results = self.convert(check=batch.CHECK_HASH)
+        self.assertEqual(
+            [r['status'] for r in results],
+            [batch.STATUS_UNCHANGED, batch.STATUS_UNCHANGED]
+        )
+        self.assertNotIn('hashes', results[0])
+
+        # Modified output files are converted again
+        with open(results[0]['output'], 'wb') as f:
+            f.write(b'modified')
+        results = self.convert(check=batch.CHECK_HASH)
+        self.assertEqual(
+            [r['status'] for r in results],
+            [batch.STATUS_CONVERTED, batch.STATUS_UNCHANGED]
+        )
+
+    def test_output_collision(self):
+        self.write_file('a.psf.gz',
+                        get_font_psf_256_sequences_compressed().get_data())
+        results = self.convert()
+
+        self.assertEqual(
+            [r['status'] for r in results],
+            [batch.STATUS_ERROR, batch.STATUS_ERROR,
+             batch.STATUS_CONVERTED]
+        )
+        self.assertIn('a.psf.gz', results[0]['error'])
+        self.assertFalse(os.path.exists(results[0]['output']))
+
+    def test_convert_files_with_cache(self):
+        cache = ConversionCache(os.path.join(self.directory.name, 'cache'))
+        results = self.convert(cache=cache)
+        self.assertEqual([r['cached'] for r in results], [False, False])
+
+        results = self.convert(cache=cache, check=batch.CHECK_NONE)
+        self.assertEqual([r['cached'] for r in results], [True, True])
+        with open(results[1]['output'], 'rb') as f:
+            self.assertEqual(
+                f.read(), get_font_psf_256_sequences().get_data())
+
+    def test_errors_are_reported(self):
+        self.write_file('broken.psf', b'no font')
+        results = self.convert()
+
+        self.assertEqual(results[1]['status'], batch.STATUS_ERROR)
+        self.assertIn('magic bytes', results[1]['error'])
+        self.assertEqual(results[0]['status'], batch.STATUS_CONVERTED)
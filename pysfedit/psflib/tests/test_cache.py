@@ -0,0 +1,154 @@
+#! /usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Copyright (c) 2018 by Karsten Lehmann <mail@kalehmann.de>
+#
+#    This file is part of PySFedit.
+#
+#    PySFedit is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    PySFedit is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    long with PySFedit. If not, see <http://www.gnu.org/licenses/>.
+
+
+"""
+This module tests the conversion cache of the psflib.
+"""
+
+import os
+import tempfile
+import unittest
+from unittest import mock
+from ... import psflib
+from ..cache import ConversionCache
+from .data_for_testing import *
+
+class ConversionCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.cache = ConversionCache(
+            os.path.join(self.directory.name, 'cache'))
+        self.input = self.get_path('font.psf')
+        with open(self.input, 'wb') as f:
+            f.write(get_font_psf2_sequences().get_data())
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def get_path(self, name):
+        return os.path.join(self.directory.name, name)
+
+    def test_convert(self):
+        font = psflib.PsfImporter.import_from_file(self.input)
+        for name, exporter in [('font.asm', psflib.AsmExporter),
+                               ('font.psf.gz', psflib.PsfGzExporter)]:
+            with self.subTest(name=name):
+                output = self.get_path(name)
+                self.assertFalse(self.cache.convert(self.input, output))
+                os.remove(output)
+                self.assertTrue(self.cache.convert(self.input, output))
+
+                with open(output, 'rb') as f:
+                    data = f.read()
+                expected = exporter(font).export_to_data()
+                if isinstance(expected, str):
+                    expected = expected.encode('utf8')
+                else:
+                    # The header of gzip streams contains a timestamp.
+                    data = gzip.decompress(data)
+                    expected = gzip.decompress(expected)
+                self.assertEqual(data, expected)
+
+    def test_convert_to_files(self):
+        outputs = [self.get_path('font.asm'), self.get_path('font.psf.gz')]
+        with mock.patch.object(psflib.PsfImporter, 'import_from_file',
+                               wraps=psflib.PsfImporter.import_from_file
+                               ) as import_from_file:
+            self.assertEqual(self.cache.convert_to_files(
+                self.input, outputs,
+                {psflib.PsfGzExporter: {'compresslevel': 1}}),
+                [False, False])
+            self.assertEqual(import_from_file.call_count, 1)
+            self.assertEqual(
+                self.cache.convert_to_files(self.input, outputs[:1]),
+                [True])
+            self.assertEqual(import_from_file.call_count, 1)
+
+        expected = psflib.PsfExporter(
+            psflib.PsfImporter.import_from_file(self.input)).export_to_data()
+        for output in outputs:
+            font = psflib.get_importer_for_file(output).import_from_file(
+                output)
+            self.assertEqual(psflib.PsfExporter(font).export_to_data(),
+                             expected)
+
+    def test_key(self):
+        data = get_font_psf2_sequences().get_data()
+        key = self.cache.get_key(data, psflib.PsfExporter)
+
+        self.assertEqual(key, self.cache.get_key(
+            bytes(data), psflib.PsfExporter, {}))
+        self.assertNotEqual(key, self.cache.get_key(
+            data, psflib.PsfGzExporter))
+        self.assertNotEqual(key, self.cache.get_key(
+            data, psflib.PsfExporter, {'option': 1}))
+        self.assertNotEqual(key, self.cache.get_key(
+            data + b'\0', psflib.PsfExporter))
+        self.assertEqual(
+            self.cache.get_key(data, psflib.PsfGzExporter, {'threads': 4}),
+            self.cache.get_key(data, psflib.PsfGzExporter))
+
+    def test_link(self):
+        output = self.get_path('font.psf')
+        os.remove(self.input)
+        with open(self.get_path('input.asm'), 'w') as f:
+            f.write(get_font_psf2_sequences_asm().get_data())
+        self.cache.convert(self.get_path('input.asm'), output, link=True)
+        key = self.cache.get_key(
+            get_font_psf2_sequences_asm().get_data().encode('utf8'),
+            psflib.PsfExporter)
+
+        self.assertTrue(os.path.samefile(output, self.cache.get_path(key)))
+
+    def test_evict_least_recently_used(self):
+        self.cache.store('aa', b'1' * 10)
+        self.cache.store('bb', b'2' * 10)
+        os.utime(self.cache.get_path('aa'), ns=(0, 0))
+        os.utime(self.cache.get_path('bb'), ns=(1, 1))
+        self.cache.lookup('aa')
+        cache = ConversionCache(self.cache.get_directory(), 25)
+        cache.store('cc', b'3' * 10)
+
+        self.assertIsNotNone(cache.lookup('aa'))
+        self.assertIsNone(cache.lookup('bb'))
+        self.assertIsNotNone(cache.lookup('cc'))
+
+    def test_evict_only_entries(self):
+        directory = self.cache.get_directory()
+        self.cache.store('aa', b'1' * 10)
+        foreign_paths = [
+            os.path.join(directory, 'catalog.sqlite'),
+            os.path.join(directory, 'aa', '.bb.1234.tmp'),
+            os.path.join(directory, 'xy', 'xyz'),
+        ]
+        for path in foreign_paths:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, 'wb') as f:
+                f.write(b'0' * 100)
+            os.utime(path, ns=(0, 0))
+        cache = ConversionCache(directory, 25)
+        cache.store('bb', b'2' * 10)
+        cache.store('cc', b'3' * 10)
+
+        self.assertIsNone(cache.lookup('aa'))
+        self.assertIsNotNone(cache.lookup('bb'))
+        self.assertIsNotNone(cache.lookup('cc'))
+        for path in foreign_paths:
+            self.assertTrue(os.path.exists(path))
@@ -0,0 +1,117 @@
+#! /usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Copyright (c) 2018 by Karsten Lehmann <mail@kalehmann.de>
+#
+#    This file is part of PySFedit.
+#
+#    PySFedit is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    PySFedit is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    long with PySFedit. If not, see <http://www.gnu.org/licenses/>.
+
+
+"""
+This module tests the font catalog of the psflib.
+"""
+
+import os
+import tempfile
+import unittest
+from ... import psflib
+from ..catalog import FontCatalog, get_default_catalog_path
+from ..cache import get_default_cache_directory
+from .data_for_testing import *
+
+class FontCatalogTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.fonts = os.path.join(self.directory.name, 'fonts')
+        os.makedirs(self.fonts)
+        self.catalog = FontCatalog(
+            os.path.join(self.directory.name, 'catalog.sqlite'))
+
+    def tearDown(self):
+        self.catalog.close()
+        self.directory.cleanup()
+
+    def write_font(self, name, test_font):
+        path = os.path.join(self.fonts, name)
+        with open(path, 'wb') as f:
+            f.write(test_font.get_data())
+
+        return path
+
+    def get_codepoints(self, test_font):
+        font = psflib.PsfImporter.import_from_data(test_font.get_data())
+
+        return sorted(
+            cp for _, description in font for cp in description.codepoints)
+
+    def test_scan(self):
+        self.write_font('a.psf', get_font_psf2_unicode())
+        self.write_font('b.psf.gz', get_font_psf_256_unicode_compressed())
+
+        self.assertEqual(self.catalog.scan([self.fonts], workers=1), {
+            'added': 2, 'updated': 0, 'unchanged': 0, 'removed': 0,
+            'failed': 0
+        })
+        self.assertEqual(
+            self.catalog.scan([self.fonts], workers=1)['unchanged'], 2)
+
+        path = self.write_font('a.psf', get_font_psf2_sequences())
+        os.utime(path, ns=(0, 0))
+        os.remove(os.path.join(self.fonts, 'b.psf.gz'))
+        summary = self.catalog.scan([self.fonts], workers=1)
+        self.assertEqual(summary['updated'], 1)
+        self.assertEqual(summary['removed'], 1)
+        self.assertEqual(len(self.catalog.find()), 1)
+
+    def test_scan_errors(self):
+        path = os.path.join(self.fonts, 'broken.psf')
+        with open(path, 'wb') as f:
+            f.write(b'\x36\x04')
+        summary = self.catalog.scan([self.fonts], workers=1)
+
+        self.assertEqual(summary['failed'], 1)
+        self.assertEqual(self.catalog.get_errors()[0][0], path)
+        self.assertEqual(self.catalog.find(), [])
+
+    def test_find(self):
+        unicode_path = self.write_font('a.psf', get_font_psf2_unicode())
+        simple_path = self.write_font('b.psf', get_font_psf_512_simple())
+        self.catalog.scan([self.fonts], workers=2)
+
+        codepoints = self.get_codepoints(get_font_psf2_unicode())
+        self.assertEqual(
+            list(self.catalog.get_coverage(unicode_path)), codepoints
+        )
+        rows = self.catalog.find(covers=codepoints)
+        self.assertEqual([r['path'] for r in rows],
+                         [unicode_path, simple_path])
+        self.assertEqual(rows[0]['codepoint_count'], len(codepoints))
+        self.assertNotIn('coverage', rows[0].keys())
+        self.assertEqual(
+            [r['path'] for r in self.catalog.find(
+                covers=[(codepoints[0], codepoints[-1] + 1)])],
+            [simple_path])
+        self.assertEqual(self.catalog.find(covers=[512]), [])
+        self.assertEqual(list(self.catalog.get_coverage(simple_path)),
+                         list(range(512)))
+        self.assertEqual(len(self.catalog.find(width=8, height=10)), 1)
+        self.assertEqual(len(self.catalog.find(min_length=512)), 1)
+
+    def test_default_path_outside_of_cache(self):
+        catalog_directory = os.path.dirname(get_default_catalog_path())
+        cache_directory = get_default_cache_directory()
+
+        self.assertNotEqual(
+            os.path.commonpath([catalog_directory, cache_directory]),
+            cache_directory)
@@ -0,0 +1,168 @@
+#! /usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Copyright (c) 2018 by Karsten Lehmann <mail@kalehmann.de>
+#
+#    This file is part of PySFedit.
+#
+#    PySFedit is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    PySFedit is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    long with PySFedit. If not, see <http://www.gnu.org/licenses/>.
+
+
+"""
+This module tests the command line interface of PySFedit.
+"""
+
+import contextlib
+import gzip
+import io
+import os
+import tempfile
+import unittest
+
+from ... import cli
+from ... import psflib
+from ..render import TextRenderer
+from .data_for_testing import *
+
+class CliTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def write_font(self, name, test_font):
+        path = os.path.join(self.directory.name, name)
+        with open(path, 'wb') as f:
+            f.write(test_font.get_data())
+
+        return path
+
+    def run_cli(self, *args):
+        out = io.StringIO()
+        with contextlib.redirect_stdout(out):
+            status = cli.main(list(args))
+
+        return status, out.getvalue()
+
+    def test_info(self):
+        path = self.write_font('font.psf.gz',
+                               get_font_psf2_unicode_compressed())
+        status, out = self.run_cli('info', path)
+
+        self.assertEqual(status, 0)
+        self.assertEqual(
+            out, '%s: PSF2, 10x8, 2 glyphs, unicode table\n' % path)
+
+    def test_convert(self):
+        path = self.write_font('font.psf', get_font_psf_256_sequences())
+        output = os.path.join(self.directory.name, 'font.psf.gz')
+        status, _ = self.run_cli('convert', path, output)
+
+        self.assertEqual(status, 0)
+        with open(output, 'rb') as f:
+            self.assertEqual(
+                gzip.decompress(f.read()),
+                get_font_psf_256_sequences().get_data()
+            )
+
+    def test_extract(self):
+        path = self.write_font('font.psf', get_font_psf2_simple())
+        directory = os.path.join(self.directory.name, 'glyphs')
+        status, _ = self.run_cli('extract', path, directory, '-g', '1')
+
+        self.assertEqual(status, 0)
+        self.assertEqual(os.listdir(directory), ['glyph_1.pbm'])
+        with open(os.path.join(directory, 'glyph_1.pbm'), 'rb') as f:
+            data = f.read()
+        self.assertEqual(
+            data,
+            b'P4\n10 8\n' + bytes(get_font_psf2_simple().get_data()[48:])
+        )
+
+    def test_render(self):
+        path = self.write_font('font.psf', get_font_psf2_unicode())
+        font = psflib.PsfImporter.import_from_file(path)
+        rows = TextRenderer(font).render('AB\nC').to_rows()
+
+        self.assertEqual(len(rows), 16)
+        self.assertEqual(len(rows[0]), 20)
+        self.assertEqual(rows[0][:10], font.get_glyph(0).get_data()[0])
+        self.assertEqual(rows[0][10:], font.get_glyph(1).get_data()[0])
+        self.assertEqual(rows[8:], [[0] * 20 for _ in range(8)])
+
+    def test_render_empty_text(self):
+        path = self.write_font('font.psf', get_font_psf2_unicode())
+        status, out = self.run_cli('render', path, '')
+
+        self.assertEqual(status, 0)
+
+    def test_detect_format(self):
+        path = self.write_font('font.txt', get_font_psf2_simple())
+        status, out = self.run_cli('info', path)
+
+        self.assertEqual(status, 0)
+        self.assertIn('PSF2', out)
+
+    def test_unknown_format(self):
+        path = os.path.join(self.directory.name, 'font.txt')
+        with open(path, 'wb') as f:
+            f.write(b'no font')
+        err = io.StringIO()
+        with contextlib.redirect_stderr(err):
+            status, _ = self.run_cli('info', path)
+
+        self.assertEqual(status, 1)
+        self.assertIn('unknown file format', err.getvalue())
+
+    def test_subset(self):
+        path = self.write_font('font.psf', get_font_psf2_unicode())
+        corpus = os.path.join(self.directory.name, 'corpus.txt')
+        with open(corpus, 'w', encoding='utf-8') as f:
+            f.write('BBB\n')
+        output = os.path.join(self.directory.name, 'subset.psf')
+        status, _ = self.run_cli('subset', path, output, '-f', corpus)
+
+        self.assertEqual(status, 0)
+        font = psflib.PsfImporter.import_from_file(output)
+        self.assertEqual(len(font), 1)
+        self.assertEqual(font.get_glyph(0).get_data(),
+                         psflib.PsfImporter.import_from_file(path)
+                         .get_glyph(1).get_data())
+
+    def test_profile(self):
+        path = self.write_font('font.psf', get_font_psf2_unicode())
+        corpus = os.path.join(self.directory.name, 'corpus.txt')
+        with open(corpus, 'w', encoding='utf-8') as f:
+            f.write('ABBä\n')
+        output = os.path.join(self.directory.name, 'reordered.psf')
+        status, out = self.run_cli('profile', path, corpus, '-j', '1',
+                                   '--reorder', output)
+
+        self.assertEqual(status, 1)
+        self.assertEqual(out.splitlines(), [
+            '5 characters, 4 codepoints, 1 missing',
+            'U+00E4 ä 1 Latin-1 Supplement',
+        ])
+        font = psflib.PsfImporter.import_from_file(output)
+        self.assertEqual(font[0][1].codepoints, [0x42])
+
+    def test_merge(self):
+        base = self.write_font('base.psf', get_font_psf_256_unicode())
+        donor = self.write_font('donor.psf', get_font_psf_512_simple())
+        output = os.path.join(self.directory.name, 'merged.psf')
+        status, _ = self.run_cli('merge', base, donor, '-o', output)
+
+        self.assertEqual(status, 0)
+        font = psflib.PsfImporter.import_from_file(output)
+        self.assertIn(0x1ff, font.get_coverage())
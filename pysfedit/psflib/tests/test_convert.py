@@ -0,0 +1,82 @@
+#! /usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Copyright (c) 2018 by Karsten Lehmann <mail@kalehmann.de>
+#
+#    This file is part of PySFedit.
+#
+#    PySFedit is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    PySFedit is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    long with PySFedit. If not, see <http://www.gnu.org/licenses/>.
+
+
+"""
+This module tests the conversion of fonts between psf1 and psf2 with the
+psflib.
+"""
+
+import unittest
+from ... import psflib
+from .data_for_testing import *
+
+def import_font(test_font):
+    return psflib.PsfImporter.import_from_data(test_font.get_data())
+
+def export_font(font):
+    return psflib.PsfExporter(font).export_to_data()
+
+class ConvertTest(unittest.TestCase):
+    def test_round_trip(self):
+        for test_font in [get_font_psf_256_sequences(),
+                          get_font_psf_256_unicode(),
+                          get_font_psf_512_simple()]:
+            with self.subTest(test_font=test_font):
+                font, dropped = import_font(test_font).convert(
+                    psflib.PSF2_VERSION)
+                self.assertEqual(font.get_header().version_psf,
+                                 psflib.PSF2_VERSION)
+                self.assertEqual(
+                    dropped, {'glyphs': [], 'codepoints': [],
+                              'sequences': []})
+
+                font, _ = font.convert(psflib.PSF1_VERSION)
+                self.assertEqual(export_font(font), test_font.get_data())
+
+    def test_psf1_limits(self):
+        header = psflib.PsfHeaderv2([8, 2])
+        header.set_flags(psflib.PSF2_HAS_UNICODE_TABLE)
+        font = psflib.PcScreenFont(header)
+        for i in range(514):
+            glyph, description = font.add_glyph()
+            description.add_unicode_value(i)
+        font[0][1].add_unicode_value(0x1F600)
+        font[1][1].add_sequence(psflib.UnicodeSequence([0x41, 0x1F3FB]))
+        font[1][1].add_sequence(psflib.UnicodeSequence([0x41, 0x30A]))
+
+        converted, dropped = font.convert(psflib.PSF1_VERSION)
+        self.assertEqual(len(converted), 512)
+        self.assertTrue(converted.get_header().mode & psflib.PSF1_MODE512)
+        self.assertEqual(dropped['glyphs'], [512, 513])
+        self.assertEqual(dropped['codepoints'], [0x1F600])
+        self.assertEqual(dropped['sequences'], [[0x41, 0x1F3FB]])
+        self.assertEqual(converted[1][1].seq_codepoints, [[0x41, 0x30A]])
+        self.assertEqual(
+            import_font(get_font_psf_256_sequences())
+                .convert(psflib.PSF1_VERSION)[0].get_header().mode,
+            psflib.PSF1_MODEHASTAB
+        )
+
+    def test_invalid_conversion(self):
+        font = import_font(get_font_psf2_unicode())
+        with self.assertRaises(ValueError):
+            font.convert(psflib.PSF1_VERSION)
+        with self.assertRaises(ValueError):
+            font.convert(3)
@@ -0,0 +1,104 @@
+#! /usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Copyright (c) 2018 by Karsten Lehmann <mail@kalehmann.de>
+#
+#    This file is part of PySFedit.
+#
+#    PySFedit is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    PySFedit is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    long with PySFedit. If not, see <http://www.gnu.org/licenses/>.
+
+
+"""
+This module tests the profiling of text corpora with the psflib.
+"""
+
+from collections import Counter
+import os
+import tempfile
+import unittest
+from ... import psflib
+from ..corpus import (CorpusProfile, count_segment, get_segments,
+    profile_files)
+from .data_for_testing import *
+
+TEXT = 'Abä€\U0001D11E\n' * 50
+
+class CorpusTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'corpus.txt')
+        with open(self.path, 'wb') as f:
+            f.write(TEXT.encode('utf-8') + b'\xff\x80')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_segments(self):
+        expected = Counter(TEXT + '\ufffd' * 2)
+        for segment_size in [4, 5, 7, 100, 10000]:
+            for block_size in [1, 3, 64]:
+                with self.subTest(segment_size=segment_size,
+                                  block_size=block_size):
+                    counts = Counter()
+                    for segment in get_segments(self.path, segment_size):
+                        counts.update(count_segment(segment + (block_size,)))
+                    self.assertEqual(counts, expected)
+
+        with self.assertRaises(ValueError):
+            get_segments(self.path, 3)
+
+    def test_profile_files(self):
+        profile = profile_files([self.path], workers=1, segment_size=16)
+
+        self.assertEqual(profile.get_total(), len(TEXT) + 2)
+        self.assertEqual(profile.get_counts()[0xe4], 50)
+        self.assertIn(0x1D11E, profile.get_coverage())
+
+    def test_missing(self):
+        font = psflib.PsfImporter.import_from_data(
+            get_font_psf2_unicode().get_data())
+        profile = CorpusProfile()
+        profile.add_text('AAB\n')
+        profile.add_text('äää€')
+
+        self.assertEqual(profile.get_missing(font), [(0xe4, 3), (0x20ac, 1)])
+        self.assertIn((0x0a, 1), profile.get_missing(font, controls=True))
+
+    def test_glyph_order(self):
+        font = psflib.PsfImporter.import_from_data(
+            get_font_psf2_unicode().get_data())
+        glyphs = [font.get_glyph(i).get_data() for i in range(len(font))]
+        profile = CorpusProfile()
+        profile.add_text('ABB')
+
+        self.assertEqual(profile.get_glyph_frequencies(font), [1, 2])
+        self.assertEqual(profile.get_glyph_order(font), [1, 0])
+        for old_index, new_index in profile.get_glyph_moves(font):
+            font.move_glyph(old_index, new_index)
+        self.assertEqual(font.get_glyph(0).get_data(), glyphs[1])
+        self.assertEqual(font[0][1].codepoints, [0x42])
+        self.assertEqual(profile.get_glyph_moves(font), [])
+
+    def test_glyph_moves(self):
+        font = psflib.PsfImporter.import_from_data(
+            get_font_psf_512_simple().get_data())
+        profile = CorpusProfile()
+        profile.add_text(''.join(chr(i) * (i % 7) for i in range(512)))
+        order = profile.get_glyph_order(font)
+        indices = list(range(len(font)))
+        for old_index, new_index in profile.get_glyph_moves(font):
+            self.assertEqual(indices[old_index], order[new_index])
+            self.assertNotEqual(old_index, new_index)
+            indices.insert(new_index, indices.pop(old_index))
+
+        self.assertEqual(indices, order)
@@ -0,0 +1,105 @@
+#! /usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Copyright (c) 2018 by Karsten Lehmann <mail@kalehmann.de>
+#
+#    This file is part of PySFedit.
+#
+#    PySFedit is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    PySFedit is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    long with PySFedit. If not, see <http://www.gnu.org/licenses/>.
+
+
+"""
+This module tests the codepoint coverage of the psflib.
+"""
+
+import random
+import unittest
+from ... import psflib
+from ..coverage import Coverage, parse_ranges
+from ..unicodeblocks import NO_BLOCK, get_block, get_block_by_name
+from .data_for_testing import *
+
+class CoverageTest(unittest.TestCase):
+    def setUp(self):
+        rand = random.Random(4)
+        self.a = set(rand.sample(range(2000), 700)) | set(range(300, 1400))
+        self.b = set(rand.sample(range(3000), 900)) | set(range(0x400, 0x500))
+
+    def test_set_algebra(self):
+        a, b = Coverage(self.a), Coverage(self.b)
+
+        self.assertEqual(list(a), sorted(self.a))
+        self.assertEqual(len(a), len(self.a))
+        self.assertEqual(set(a | b), self.a | self.b)
+        self.assertEqual(set(a & b), self.a & self.b)
+        self.assertEqual(set(a - b), self.a - self.b)
+        self.assertTrue(a - b <= a)
+        self.assertFalse(a <= b)
+        self.assertTrue(a | b >= b)
+
+    def test_contains(self):
+        a = Coverage(self.a)
+        for codepoint in range(3000):
+            self.assertEqual(codepoint in a, codepoint in self.a)
+
+    def test_conversions(self):
+        a = Coverage(self.a)
+
+        self.assertEqual(Coverage.from_ranges(a.ranges()), a)
+        self.assertEqual(Coverage.from_bitset(a.to_bitset()), a)
+        self.assertEqual(Coverage.from_chunks(a.get_chunks()), a)
+        self.assertEqual(hash(Coverage(sorted(self.a))), hash(a))
+        self.assertEqual(
+            list(Coverage.from_ranges([(0x20, 0x7E), (0x80, 0x2FF)])
+                .ranges()),
+            [(0x20, 0x7E), (0x80, 0x2FF)]
+        )
+        self.assertEqual(len(Coverage.from_ranges([(0, 0x10FFFF)])),
+            0x110000)
+        self.assertFalse(Coverage())
+
+    def test_blocks(self):
+        coverage = Coverage.from_text('HiЖ─') | Coverage([0x10000])
+        blocks = [(block.name, list(part))
+            for block, part in coverage.blocks()]
+
+        self.assertEqual(blocks, [
+            ('Basic Latin', [ord('H'), ord('i')]),
+            ('Cyrillic', [0x416]),
+            ('Box Drawing', [0x2500]),
+            (NO_BLOCK, [0x10000]),
+        ])
+        self.assertEqual(get_block(0x2510), get_block_by_name('box-drawing'))
+
+    def test_font_coverage(self):
+        font = psflib.PsfImporter.import_from_data(
+            get_font_psf2_sequences().get_data())
+        codepoints = [cp for _, d in font for cp in d.codepoints]
+        coverage = font.get_coverage()
+
+        self.assertEqual(list(coverage), sorted(codepoints))
+        for codepoint in codepoints:
+            self.assertTrue(font.has_glyph_for_unicode_value(codepoint))
+        self.assertFalse(font.has_glyph_for_unicode_value(0x10FFFF))
+
+        font = psflib.PsfImporter.import_from_data(
+            get_font_psf_512_simple().get_data())
+        self.assertEqual(list(font.get_coverage().ranges()), [(0, 511)])
+
+    def test_parse_ranges(self):
+        self.assertEqual(
+            parse_ranges('U+0400-U+04FF, 2500-257f,41'),
+            [(0x400, 0x4FF), (0x2500, 0x257F), (0x41, 0x41)]
+        )
+        with self.assertRaises(ValueError):
+            parse_ranges('20-10')
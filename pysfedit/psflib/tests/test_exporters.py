@@ -22,6 +22,9 @@
 This module tests all exporters of the psflib.
 """
 
+import gzip
+import os
+import tempfile
 import unittest
 from ... import psflib
 from .data_for_testing import *
@@ -186,3 +189,62 @@ class ExportersTest(unittest.TestCase):
 
                 data = exporter(font).export_to_data()
                 self.assertEqual(data, test_font.get_data())
+
+    def test_exporting_with_shared_encoding(self):
+        test_font = get_font_psf_256_sequences()
+        font = psflib.PsfImporter.import_from_data(test_font.get_data())
+        encoding = psflib.FontEncoding(font)
+
+        to_test = [
+            [psflib.PsfExporter, test_font.get_data()],
+            [psflib.PsfGzExporter, test_font.get_data()],
+            [psflib.AsmExporter,
+                psflib.AsmExporter(font).export_to_data()],
+        ]
+        for exporter, expected in to_test:
+            with self.subTest(exporter=exporter):
+                data = exporter(font, encoding).export_to_data()
+                if exporter is psflib.PsfGzExporter:
+                    data = gzip.decompress(data)
+                self.assertEqual(data, expected)
+
+    def test_encoding_psf1_rejects_wide_codepoints(self):
+        header = psflib.PsfHeaderv1([8, 8])
+        header.set_mode(psflib.PSF1_MODEHASTAB)
+        font = psflib.PcScreenFont(header)
+        _, description = font[0]
+        description.add_unicode_value(psflib.UnicodeValue(0x1F600))
+
+        with self.assertRaises(ValueError):
+            psflib.FontEncoding(font).get_psf_data()
+
+    def test_export_to_files(self):
+        test_font = get_font_psf2_unicode()
+        font = psflib.PsfImporter.import_from_data(test_font.get_data())
+        with tempfile.TemporaryDirectory() as directory:
+            paths = [
+                os.path.join(directory, 'font' + ext)
+                    for ext in ('.psf', '.psf.gz', '.asm')
+            ]
+            psflib.export_to_files(font, paths)
+
+            with open(paths[0], 'rb') as f:
+                self.assertEqual(f.read(), test_font.get_data())
+            with open(paths[1], 'rb') as f:
+                self.assertEqual(
+                    gzip.decompress(f.read()), test_font.get_data())
+            with open(paths[2]) as f:
+                self.assertEqual(
+                    f.read(), psflib.AsmExporter(font).export_to_data())
+
+    def test_export_to_files_unknown_extension(self):
+        font = psflib.PsfImporter.import_from_data(
+            get_font_psf2_simple().get_data())
+        with tempfile.TemporaryDirectory() as directory:
+            paths = [
+                os.path.join(directory, 'font.psf'),
+                os.path.join(directory, 'font.bdf'),
+            ]
+            with self.assertRaises(ValueError):
+                psflib.export_to_files(font, paths)
+            self.assertEqual(os.listdir(directory), [])
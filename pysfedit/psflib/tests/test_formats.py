@@ -0,0 +1,109 @@
+#! /usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Copyright (c) 2018 by Karsten Lehmann <mail@kalehmann.de>
+#
+#    This file is part of PySFedit.
+#
+#    PySFedit is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    PySFedit is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    long with PySFedit. If not, see <http://www.gnu.org/licenses/>.
+
+
+"""
+This module tests the detection of the file formats of fonts.
+"""
+
+import bz2
+import lzma
+import os
+import tempfile
+import unittest
+from ... import psflib
+from .. import formats
+from .data_for_testing import *
+
+class FormatsTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def write_file(self, name, data):
+        path = os.path.join(self.directory.name, name)
+        with open(path, 'wb') as f:
+            f.write(data)
+
+        return path
+
+    def test_sniff_file(self):
+        data = get_font_psf2_unicode().get_data()
+        to_test = [
+            ['font.psf', data, psflib.PsfImporter],
+            ['font.psf', get_font_psf2_unicode_compressed().get_data(),
+                psflib.PsfGzImporter],
+            ['font.gz', lzma.compress(data), psflib.PsfXzImporter],
+            ['font', bz2.compress(data), psflib.PsfBz2Importer],
+        ]
+        for name, file_data, importer in to_test:
+            with self.subTest(importer=importer):
+                path = self.write_file(name, file_data)
+                self.assertIs(psflib.get_importer_for_file(path), importer)
+                font = importer.import_from_file(path)
+                self.assertEqual(
+                    psflib.PsfExporter(font).export_to_data(), data)
+                header = importer.import_header_from_file(path)
+                self.assertEqual(header.get_length(), len(font))
+
+    def test_sniff(self):
+        data = get_font_psf_256_unicode().get_data()
+        self.assertEqual(formats.sniff(data).name, 'psf')
+        self.assertEqual(formats.sniff(lzma.compress(data)).name, 'psf.xz')
+        self.assertIsNone(formats.sniff(b'font_header:'))
+        self.assertIsNone(formats.sniff(b'\x1f\x8bcorrupt'))
+
+    def test_fallback_to_extension(self):
+        path = self.write_file('font.asm',
+            get_font_psf2_simple_asm().get_data().encode('utf8'))
+        self.assertIs(psflib.get_importer_for_file(path),
+            psflib.AsmImporter)
+
+        path = self.write_file('font.txt', b'no font')
+        with self.assertRaises(ValueError):
+            psflib.get_importer_for_file(path)
+
+    def test_exporters(self):
+        data = get_font_psf_512_simple().get_data()
+        font = psflib.PsfImporter.import_from_data(data)
+        to_test = [
+            ['font.psf.xz', psflib.PsfXzExporter, lzma.decompress],
+            ['font.psf.bz2', psflib.PsfBz2Exporter, bz2.decompress],
+        ]
+        for name, exporter, decompress in to_test:
+            with self.subTest(exporter=exporter):
+                self.assertIs(psflib.get_exporter_for_file(name), exporter)
+                compressed = exporter(font, compresslevel=1).export_to_data()
+                self.assertEqual(decompress(compressed), data)
+
+    def test_register_format(self):
+        font_format = formats.FontFormat('test', ['.testfont'],
+            'pysfedit.psflib:PsfImporter', 'pysfedit.psflib:PsfExporter',
+            [b'TEST'])
+        formats.register_format(font_format)
+        try:
+            path = self.write_file('font', b'TEST')
+            self.assertIs(formats.get_format_for_file(path), font_format)
+            self.assertIs(font_format.get_importer(), psflib.PsfImporter)
+            self.assertIs(psflib.get_exporter_for_file('a.testfont'),
+                psflib.PsfExporter)
+        finally:
+            formats._formats.remove(font_format)
@@ -0,0 +1,80 @@
+#! /usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Copyright (c) 2018 by Karsten Lehmann <mail@kalehmann.de>
+#
+#    This file is part of PySFedit.
+#
+#    PySFedit is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    PySFedit is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    long with PySFedit. If not, see <http://www.gnu.org/licenses/>.
+
+
+"""
+This module tests the gzip compression of the psflib.
+"""
+
+import gzip
+import os
+import tempfile
+import unittest
+from ... import psflib
+from .. import gziputils
+from .data_for_testing import *
+
+class GzipUtilsTest(unittest.TestCase):
+    def test_compress(self):
+        data = bytes(range(256)) * 300 + b'pysfedit' * 5000
+        for level in (0, 1, 6, 9):
+            for block_size in (1000, gziputils.DEFAULT_BLOCK_SIZE):
+                with self.subTest(level=level, block_size=block_size):
+                    compressed = gziputils.compress(
+                        data, level, 1, block_size)
+                    self.assertEqual(gzip.decompress(compressed), data)
+
+    def test_compress_empty(self):
+        self.assertEqual(gzip.decompress(gziputils.compress(b'')), b'')
+
+    def test_compress_threads(self):
+        data = os.urandom(5000) * 20
+        single = gziputils.compress(data, 6, 1, 4096)
+        self.assertEqual(gziputils.compress(data, 6, 4, 4096), single)
+        self.assertEqual(gzip.decompress(single), data)
+
+    def test_compress_invalid_arguments(self):
+        for kwargs in ({'level': 10}, {'threads': 0}, {'block_size': 0}):
+            with self.subTest(**kwargs):
+                with self.assertRaises(ValueError):
+                    gziputils.compress(b'data', **kwargs)
+
+    def test_exporter_options(self):
+        test_font = get_font_psf2_sequences()
+        font = psflib.PsfImporter.import_from_data(test_font.get_data())
+        for level in (1, 9):
+            with self.subTest(level=level):
+                exporter = psflib.PsfGzExporter(font, compresslevel=level,
+                    threads=2)
+                self.assertEqual(
+                    gzip.decompress(exporter.export_to_data()),
+                    test_font.get_data()
+                )
+
+    def test_import_header_from_file(self):
+        test_font = get_font_psf_512_simple_compressed()
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'font.psf.gz')
+            with open(path, 'wb') as f:
+                f.write(test_font.get_data())
+            header = psflib.PsfGzImporter.import_header_from_file(path)
+            font = psflib.PsfGzImporter.import_from_file(path)
+
+        self.assertEqual(header.get_length(), 512)
+        self.assertEqual(len(font), 512)
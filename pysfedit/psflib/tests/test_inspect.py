@@ -0,0 +1,127 @@
+#! /usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Copyright (c) 2018 by Karsten Lehmann <mail@kalehmann.de>
+#
+#    This file is part of PySFedit.
+#
+#    PySFedit is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    PySFedit is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    long with PySFedit. If not, see <http://www.gnu.org/licenses/>.
+
+
+"""
+This module tests the inspection of font files without importing them.
+"""
+
+import os
+import tempfile
+import unittest
+from ... import psflib
+from .data_for_testing import *
+
+class InspectTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def write_file(self, name, data):
+        path = os.path.join(self.directory.name, name)
+        mode = 'w' if isinstance(data, str) else 'wb'
+        with open(path, mode) as f:
+            f.write(data)
+
+        return path
+
+    def count_unicode(self, font):
+        return (
+            sum(len(d.unicode_values) for _, d in font),
+            sum(len(d.sequences) for _, d in font)
+        )
+
+    def test_inspect(self):
+        to_test = [
+            ['font.psf', get_font_psf_512_simple()],
+            ['font.psf', get_font_psf_256_sequences()],
+            ['font.psf.gz', get_font_psf_256_unicode_compressed()],
+            ['font.psf', get_font_psf2_sequences()],
+            ['font.psf.gz', get_font_psf2_unicode_compressed()],
+        ]
+        for name, test_font in to_test:
+            with self.subTest(name=name, test_font=test_font):
+                path = self.write_file(name, test_font.get_data())
+                font = psflib.get_importer_for_file(path).import_from_file(
+                    path)
+                info = psflib.inspect(path, count_unicode=True)
+                header = font.get_header()
+
+                self.assertEqual(info.header.size, header.size)
+                self.assertEqual(info.header.get_length(), len(font))
+                self.assertEqual(info.bitmaps_offset, info.header_size)
+                self.assertEqual(info.bitmaps_size,
+                    len(font) * header.charsize)
+                if not header.has_unicode_table():
+                    self.assertIsNone(info.unicode_table_offset)
+                    self.assertIsNone(info.unicode_value_count)
+
+                    continue
+                data = psflib.PsfExporter(font).export_to_data()
+                self.assertEqual(
+                    data[info.unicode_table_offset:],
+                    b''.join(psflib.FontEncoding(
+                        font).get_unicode_descriptions())
+                )
+                self.assertEqual(
+                    (info.unicode_value_count, info.sequence_count),
+                    self.count_unicode(font)
+                )
+
+    def test_inspect_without_counting(self):
+        path = self.write_file('font.psf', get_font_psf2_unicode().get_data())
+        info = psflib.inspect(path)
+
+        self.assertEqual(info.header_size, 32)
+        self.assertEqual(info.unicode_table_offset, 32 + info.bitmaps_size)
+        self.assertIsNone(info.unicode_value_count)
+        self.assertIsNone(info.sequence_count)
+
+    def test_inspect_asm(self):
+        path = self.write_file('font.asm',
+            get_font_psf2_sequences_asm().get_data())
+        font = psflib.AsmImporter.import_from_file(path)
+        info = psflib.inspect(path, count_unicode=True)
+
+        self.assertEqual(info.format.name, 'asm')
+        self.assertIsNone(info.bitmaps_offset)
+        self.assertEqual(
+            (info.unicode_value_count, info.sequence_count),
+            self.count_unicode(font)
+        )
+
+    def test_decode_unicode_table(self):
+        for test_font in [get_font_psf_256_sequences(),
+                          get_font_psf2_sequences()]:
+            with self.subTest(test_font=test_font):
+                font = psflib.PsfImporter.import_from_data(
+                    test_font.get_data())
+                data = b''.join(
+                    psflib.FontEncoding(font).get_unicode_descriptions())
+                expected = [
+                    (d.codepoints, [s.codepoints for s in d.sequences])
+                        for _, d in font
+                ]
+                self.assertEqual(
+                    psflib.decode_unicode_table(
+                        data, font.get_header().version_psf),
+                    expected
+                )
@@ -0,0 +1,85 @@
+#! /usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Copyright (c) 2018 by Karsten Lehmann <mail@kalehmann.de>
+#
+#    This file is part of PySFedit.
+#
+#    PySFedit is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    PySFedit is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    long with PySFedit. If not, see <http://www.gnu.org/licenses/>.
+
+
+"""
+This module tests the merging of fonts with the psflib.
+"""
+
+import unittest
+from ... import psflib
+from ..coverage import Coverage
+from .data_for_testing import *
+
+def import_font(test_font):
+    return psflib.PsfImporter.import_from_data(test_font.get_data())
+
+def create_font(glyphs):
+    header = psflib.PsfHeaderv2([8, 2])
+    header.set_flags(psflib.PSF2_HAS_UNICODE_TABLE)
+    font = psflib.PcScreenFont(header)
+    for row, codepoints in glyphs:
+        glyph, description = font.add_glyph()
+        glyph.set_data([row, [0] * 8])
+        for codepoint in codepoints:
+            description.add_unicode_value(codepoint)
+
+    return font
+
+class MergeTest(unittest.TestCase):
+    def test_merge_fallback(self):
+        base = create_font([([1] * 8, [0x41]), ([0, 1] * 4, [0x42])])
+        donor = create_font([([1, 0] * 4, [0x42, 0x43]), ([1] * 8, [0x44])])
+        merged = psflib.PcScreenFont.merge([base, donor])
+
+        self.assertEqual(merged.get_header().version_psf,
+                         psflib.PSF2_VERSION)
+        self.assertEqual(len(merged), 3)
+        self.assertEqual(merged[0][1].codepoints, [0x41, 0x44])
+        self.assertEqual(merged[1][1].codepoints, [0x42])
+        self.assertEqual(merged[1][0].get_data()[0], [0, 1] * 4)
+        self.assertEqual(merged[2][1].codepoints, [0x43])
+
+    def test_merge_sequences(self):
+        base = import_font(get_font_psf_256_sequences())
+        merged = psflib.PcScreenFont.merge(
+            [base, import_font(get_font_psf_256_sequences())])
+
+        self.assertEqual(merged.get_coverage(), base.get_coverage())
+        self.assertIn([0x41, 0x30A],
+                      [s for _, d in merged for s in d.seq_codepoints])
+
+    def test_merge_without_unicode_table(self):
+        base = import_font(get_font_psf_256_unicode())
+        donor = import_font(get_font_psf_512_simple())
+        merged = psflib.PcScreenFont.merge([base, donor])
+
+        self.assertEqual(merged.get_coverage(), Coverage(range(512)))
+        self.assertEqual(len(merged), len({
+            glyph.to_bytes() for glyph, _ in merged
+        }))
+
+    def test_merge_different_sizes(self):
+        with self.assertRaises(ValueError):
+            psflib.PcScreenFont.merge([
+                import_font(get_font_psf2_unicode()),
+                import_font(get_font_psf_256_unicode()),
+            ])
+        with self.assertRaises(ValueError):
+            psflib.PcScreenFont.merge([])
@@ -0,0 +1,136 @@
+#! /usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Copyright (c) 2018 by Karsten Lehmann <mail@kalehmann.de>
+#
+#    This file is part of PySFedit.
+#
+#    PySFedit is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    PySFedit is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    long with PySFedit. If not, see <http://www.gnu.org/licenses/>.
+
+
+"""
+This module tests the rendering of text with the psflib.
+"""
+
+import unittest
+from ... import psflib
+from ..render import PackedBitmap, TextRenderer
+from .data_for_testing import *
+
+def create_font():
+    header = psflib.PsfHeaderv2([3, 2])
+    header.set_flags(psflib.PSF2_HAS_UNICODE_TABLE)
+    font = psflib.PcScreenFont(header)
+    for data, codepoints, sequences in [
+            ([[1, 0, 0], [0, 0, 1]], [0x41], []),
+            ([[0, 1, 0], [1, 1, 1]], [0xC5], [[0x41, 0x30A]]),
+            ([[1, 1, 1], [1, 1, 1]], [0xFFFD], [])]:
+        glyph, description = font.add_glyph()
+        glyph.set_data(data)
+        for codepoint in codepoints:
+            description.add_unicode_value(codepoint)
+        for sequence in sequences:
+            description.add_sequence(psflib.UnicodeSequence(sequence))
+
+    return font
+
+class RenderTest(unittest.TestCase):
+    def test_layout(self):
+        renderer = TextRenderer(create_font())
+
+        self.assertEqual(renderer.layout_line('A\u030aA\u00c5B'),
+                         [1, 0, 1, None])
+        self.assertEqual(renderer.layout_line('A\u030b'), [0, None])
+        self.assertEqual(renderer.layout('A\nA\u030aA'), [[0], [1, 0]])
+        self.assertEqual(
+            TextRenderer(create_font(), replacement=0xFFFD)
+                .layout_line('B'),
+            [2]
+        )
+
+    def test_render(self):
+        bitmap = TextRenderer(create_font()).render('AA\u030a\nB')
+
+        self.assertEqual(bitmap.get_size(), (6, 4))
+        self.assertEqual(bitmap.get_stride(), 1)
+        self.assertEqual(bitmap.to_rows(), [
+            [1, 0, 0, 0, 1, 0],
+            [0, 0, 1, 1, 1, 1],
+            [0, 0, 0, 0, 0, 0],
+            [0, 0, 0, 0, 0, 0],
+        ])
+        self.assertEqual(bitmap.get_data(),
+                         bytes([0b10001000, 0b00111100, 0, 0]))
+        self.assertEqual(bitmap.to_pbm(), b'P4\n6 4\n' + bitmap.get_data())
+
+    def test_render_empty_text(self):
+        bitmap = TextRenderer(create_font()).render('')
+
+        self.assertEqual(bitmap.get_size(), (0, 2))
+        self.assertEqual(bitmap.to_rows(), [[], []])
+        self.assertEqual(bitmap.to_rgba(2), b'')
+        self.assertEqual(bitmap.to_pbm(), b'P4\n0 2\n')
+
+    def test_render_without_unicode_table(self):
+        font = psflib.PsfImporter.import_from_data(
+            get_font_psf_512_simple().get_data())
+        bitmap = TextRenderer(font).render('\x00\x01')
+
+        self.assertEqual(bitmap.get_size(), (16, 10))
+        rows = bitmap.to_rows()
+        self.assertEqual([row[:8] for row in rows],
+                         font.get_glyph(0).get_data())
+        self.assertEqual([row[8:] for row in rows],
+                         font.get_glyph(1).get_data())
+
+    def test_image(self):
+        try:
+            import PIL
+        except ImportError:
+            self.skipTest('PIL is not installed')
+        bitmap = TextRenderer(create_font()).render('A')
+        image = bitmap.to_image()
+
+        self.assertEqual(image.size, (3, 2))
+        self.assertEqual(image.getpixel((0, 0)), 255)
+        self.assertEqual(image.getpixel((1, 0)), 0)
+
+    def test_packed_bitmap(self):
+        self.assertEqual(PackedBitmap(9, 2).get_data(), bytes(4))
+        with self.assertRaises(ValueError):
+            PackedBitmap(9, 2, bytes(3))
+
+    def test_from_rows(self):
+        rows = [[1, 0, 0, 0, 0, 0, 0, 0, 1], [0, 1, 1, 1, 1, 1, 1, 1, 0]]
+        bitmap = PackedBitmap.from_rows(rows)
+
+        self.assertEqual(bitmap.get_data(), b'\x80\x80\x7f\x00')
+        self.assertEqual(bitmap.to_rows(), rows)
+        self.assertEqual(
+            PackedBitmap.from_rows([[1, 1]], 3, 2).to_rows(),
+            [[1, 1, 0], [0, 0, 0]]
+        )
+
+    def test_rgba(self):
+        black, clear = b'\x00\x00\x00\xff', bytes(4)
+        bitmap = PackedBitmap.from_rows([[1, 0, 1], [0, 1, 0]])
+
+        self.assertEqual(bitmap.to_rgba(),
+                         black + clear + black + clear + black + clear)
+        self.assertEqual(
+            bitmap.to_rgba(2, (1, 2, 3, 4), (5, 6, 7, 8))[:24],
+            b'\x01\x02\x03\x04' * 2 + b'\x05\x06\x07\x08' * 2 +
+            b'\x01\x02\x03\x04' * 2
+        )
+        self.assertEqual(len(bitmap.to_rgba(2)), 6 * 4 * 4)
+        self.assertEqual(bitmap.to_rgba(2)[:24], bitmap.to_rgba(2)[24:48])
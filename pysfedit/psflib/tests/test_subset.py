@@ -0,0 +1,103 @@
+#! /usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Copyright (c) 2018 by Karsten Lehmann <mail@kalehmann.de>
+#
+#    This file is part of PySFedit.
+#
+#    PySFedit is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    PySFedit is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    long with PySFedit. If not, see <http://www.gnu.org/licenses/>.
+
+
+"""
+This module tests the subsetting of fonts with the psflib.
+"""
+
+import unittest
+from ... import psflib
+from ..coverage import Coverage
+from .data_for_testing import *
+
+def import_font(test_font):
+    return psflib.PsfImporter.import_from_data(test_font.get_data())
+
+class SubsetTest(unittest.TestCase):
+    def test_subset_codepoints(self):
+        font = import_font(get_font_psf2_unicode())
+        subset = font.subset([0x42, 0x43])
+
+        self.assertEqual(len(subset), 1)
+        self.assertEqual(subset.get_header().version_psf,
+                         psflib.PSF2_VERSION)
+        glyph, description = subset[0]
+        self.assertEqual(glyph.get_data(), font.get_glyph(1).get_data())
+        self.assertEqual(description.codepoints, [0x42])
+
+    def test_subset_text_chunks(self):
+        font = import_font(get_font_psf2_unicode())
+        subset = font.subset(text=iter(['AB', 'BA']))
+
+        self.assertEqual(len(subset), 2)
+        self.assertEqual(subset.get_coverage(), Coverage.from_text('AB'))
+
+    def test_subset_sequences(self):
+        font = import_font(get_font_psf_256_sequences())
+
+        subset = font.subset(text='A')
+        self.assertEqual(subset[0][1].codepoints, [0x41])
+        self.assertEqual(subset[0][1].seq_codepoints, [])
+
+        subset = font.subset([0x41, 0x30A])
+        self.assertEqual(subset[0][1].seq_codepoints, [[0x41, 0x30A]])
+
+    def test_subset_without_unicode_table(self):
+        font = import_font(get_font_psf_512_simple())
+        subset = font.subset(range(256, 260))
+
+        self.assertEqual(len(subset), 4)
+        self.assertTrue(subset.has_unicode_table())
+        self.assertEqual(subset[0][1].codepoints, [256])
+        self.assertEqual(subset[0][0].get_data(),
+                         font.get_glyph(256).get_data())
+
+    def test_subset_psf1(self):
+        font = import_font(get_font_psf_512_simple())
+
+        subset = font.subset(range(300), psf1=True)
+        header = subset.get_header()
+        self.assertEqual(header.version_psf, psflib.PSF1_VERSION)
+        self.assertEqual(len(subset), 512)
+        self.assertTrue(header.mode & psflib.PSF1_MODE512)
+        self.assertEqual(subset.get_coverage(), Coverage(range(300)))
+        self.assertEqual(subset[299][0].get_data(),
+                         font.get_glyph(299).get_data())
+
+        subset = font.subset(range(3), psf1=True)
+        self.assertEqual(len(subset), 256)
+        self.assertFalse(subset.get_header().mode & psflib.PSF1_MODE512)
+
+    def test_subset_psf1_does_not_fit(self):
+        font = import_font(get_font_psf2_unicode())
+        subset = font.subset(text='A', psf1=True)
+
+        self.assertEqual(subset.get_header().version_psf,
+                         psflib.PSF2_VERSION)
+
+    def test_subset_exports(self):
+        font = import_font(get_font_psf_256_sequences())
+        data = psflib.PsfExporter(font.subset(range(0x300),
+                                              psf1=True)).export_to_data()
+
+        self.assertEqual(
+            psflib.PsfImporter.import_from_data(data).get_coverage(),
+            Coverage([0x41])
+        )
@@ -0,0 +1,135 @@
+#! /usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Copyright (c) 2018 by Karsten Lehmann <mail@kalehmann.de>
+#
+#    This file is part of PySFedit.
+#
+#    PySFedit is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    PySFedit is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    long with PySFedit. If not, see <http://www.gnu.org/licenses/>.
+
+
+"""
+This module tests the terminal grid of the psflib.
+"""
+
+import unittest
+from ... import psflib
+from ..render import TextRenderer
+from ..terminal import MODE_MONO, MODE_RGBA, TerminalGrid
+from .data_for_testing import *
+
+RED = (0xFF, 0, 0, 0xFF)
+BLUE = (0, 0, 0xFF, 0xFF)
+
+def import_font(test_font):
+    return psflib.PsfImporter.import_from_data(test_font.get_data())
+
+class TerminalGridTest(unittest.TestCase):
+    def test_mono_matches_renderer(self):
+        for test_font in [get_font_psf_512_simple(), get_font_psf2_unicode()]:
+            with self.subTest(test_font=test_font):
+                font = import_font(test_font)
+                text = ['AB', 'BA', 'A ']
+                if not font.has_unicode_table():
+                    text = ['\x01\x02', '\x03\x04', '\x05 ']
+                grid = TerminalGrid(font, 2, 3, MODE_MONO, replacement=None)
+                for row, line in enumerate(text):
+                    grid.write(0, row, line)
+                grid.redraw()
+                bitmap = TextRenderer(font).render('\n'.join(text))
+
+                self.assertEqual(bytes(grid.get_framebuffer()),
+                                 bitmap.get_data())
+                self.assertEqual(grid.get_stride(), bitmap.get_stride())
+
+    def test_rgba(self):
+        font = import_font(get_font_psf2_unicode())
+        grid = TerminalGrid(font, 3, 2, foreground=RED, background=BLUE)
+        grid.write(1, 1, 'A')
+        grid.redraw()
+
+        self.assertEqual(grid.get_pixel_size(), (30, 16))
+        framebuffer = grid.get_framebuffer()
+        glyph = font.get_glyph(0).get_data()
+        for y in range(8):
+            for x in range(10):
+                offset = (8 + y) * grid.get_stride() + (10 + x) * 4
+                self.assertEqual(tuple(framebuffer[offset:offset + 4]),
+                                 RED if glyph[y][x] else BLUE)
+        self.assertEqual(tuple(framebuffer[:4]), BLUE)
+
+    def test_cell_and_line_redraw_agree(self):
+        font = import_font(get_font_psf_512_simple())
+        grid = TerminalGrid(font, 16, 2)
+        grid.redraw()
+        grid.write(0, 0, '\x01\x02', foreground=RED)
+        grid.put_glyph(7, 1, 3, background=BLUE)
+        self.assertEqual(grid.get_dirty_cells(), [(0, 0), (1, 0), (7, 1)])
+        self.assertEqual(grid.redraw(), [(0, 0, 16, 10), (56, 10, 8, 10)])
+        partial = bytes(grid.get_framebuffer())
+
+        grid.invalidate()
+        self.assertEqual(grid.redraw(),
+                         [(0, 0, 128, 10), (0, 10, 128, 10)])
+        self.assertEqual(bytes(grid.get_framebuffer()), partial)
+        self.assertEqual(grid.redraw(), [])
+
+    def test_unchanged_cells_are_not_dirty(self):
+        font = import_font(get_font_psf_512_simple())
+        grid = TerminalGrid(font, 4, 2)
+        grid.write(0, 0, '\x01\x02')
+        grid.redraw()
+        grid.write(0, 0, '\x01\x03')
+
+        self.assertEqual(grid.get_dirty_cells(), [(1, 0)])
+        self.assertEqual(grid.write(3, 1, '\x01\x02'), 1)
+        with self.assertRaises(IndexError):
+            grid.put_glyph(4, 0, 1)
+
+    def test_scroll(self):
+        font = import_font(get_font_psf_512_simple())
+        grid = TerminalGrid(font, 2, 3, MODE_MONO)
+        for row in range(3):
+            grid.write(0, row, chr(row + 1) * 2)
+        grid.redraw()
+        grid.scroll()
+
+        self.assertEqual(grid.get_cell(0, 0)[0], 2)
+        self.assertEqual(grid.get_cell(0, 2)[0], None)
+        self.assertEqual(grid.get_dirty_cells(), [(0, 2), (1, 2)])
+        grid.redraw()
+        scrolled = bytes(grid.get_framebuffer())
+        grid.invalidate()
+        grid.redraw()
+        self.assertEqual(bytes(grid.get_framebuffer()), scrolled)
+
+    def test_scroll_areas(self):
+        font = import_font(get_font_psf2_unicode())
+        grid = TerminalGrid(font, 4, 3, MODE_MONO)
+        grid.redraw()
+        grid.write(0, 2, 'AB')
+        grid.redraw()
+        grid.scroll(1)
+
+        self.assertEqual(grid.redraw(), [(0, 0, 40, 16), (0, 16, 40, 8)])
+        self.assertEqual(grid.redraw(), [])
+        grid.scroll(3)
+        self.assertEqual(grid.redraw(), [(0, 0, 40, 8), (0, 8, 40, 8),
+                                         (0, 16, 40, 8)])
+
+    def test_invalid_arguments(self):
+        font = import_font(get_font_psf_512_simple())
+        with self.assertRaises(ValueError):
+            TerminalGrid(font, mode='RGB')
+        with self.assertRaises(ValueError):
+            TerminalGrid(font, 0, 25)
@@ -18,8 +18,14 @@
 #    long with PySFedit. If not, see <http://www.gnu.org/licenses/>.
 
 import unittest
+from unittest import mock
+import cairo
+import gi
+gi.require_version("Gtk", "3.0")
+from gi.repository import Gtk
 from ..psflib import PsfHeaderv2, PcScreenFont
-from ..font_editor import FontEditor
+from ..font_editor import FontEditor, GlyphPreviewCache
+from ..glyph_editor import GlyphEditor
 
 class FontEditorTest(unittest.TestCase):
         def __init__(self, *args, **kwargs):
@@ -47,6 +53,19 @@ class FontEditorTest(unittest.TestCase):
 
                 self.assertEqual(len(self.font), 4)
 
+        def test_remove_selected_glyph_unbinds_editor(self):
+                glyph_selector = self.font_editor.glyph_selector
+                glyph_selector.select_row(glyph_selector.get_row_at_index(4))
+                glyph = self.font.get_glyph(4)
+                context = self.font_editor.glyph_editor.get_context()
+                context.select_pencil(0)
+                context.handle_pixel_event(0, 0, context.SET_PIXEL)
+                glyph_selector.context.remove_glyph(4)
+
+                self.assertEqual(glyph.get_data()[0][0], 1)
+                self.assertIs(context.get_glyph(), self.font.get_glyph(3))
+                self.assertIsNot(context.get_pixels(), glyph.get_data())
+
         def test_glyph_show_index(self):
                 glyph_selector = self.font_editor.glyph_selector
                 context = glyph_selector.context
@@ -80,5 +99,169 @@ class FontEditorTest(unittest.TestCase):
                 data2 = self.font.get_glyph(2).get_data()
                 self.assertEqual(data1, data2)
 
+        def test_virtualized_rows(self):
+                for i in range(995):
+                        self.font.add_glyph()
+                font_editor = FontEditor(self.header, self.font)
+                glyph_selector = font_editor.glyph_selector
+
+                self.assertLess(len(glyph_selector.get_children()), 100)
+                row = glyph_selector.get_row_at_index(999)
+                self.assertEqual(row.get_index(), 999)
+                glyph_selector.select_row(row)
+                self.assertEqual(glyph_selector.get_selected_index(), 999)
+                self.assertEqual(row.l_index.get_text(), '999')
+                font_editor.destroy()
+
+        def test_glyph_overview(self):
+                overview = self.font_editor.glyph_overview
+                glyph_selector = self.font_editor.glyph_selector
+                glyph_selector.select_row(glyph_selector.get_row_at_index(3))
+                self.assertEqual(overview.get_selected_index(), 3)
+
+                x, y, _, _ = overview.get_cell_rectangle(2)
+                self.assertEqual(overview.get_index_at(x, y), 2)
+                self.assertIsNone(overview.get_index_at(x, y + 10000))
+
+        def test_glyph_editor_shares_glyph(self):
+                glyph_selector = self.font_editor.glyph_selector
+                glyph_selector.select_row(glyph_selector.get_row_at_index(2))
+                context = self.font_editor.glyph_editor.get_context()
+                glyph = self.font.get_glyph(2)
+                self.assertIs(context.get_pixels(), glyph.get_data())
+
+                generation = glyph.get_generation()
+                context.set_pixels([[1] * 8 for _ in range(8)])
+                self.assertEqual(glyph.get_data()[7], [1] * 8)
+                self.assertGreater(glyph.get_generation(), generation)
+
+        def test_glyph_editor_stroke(self):
+                glyph_selector = self.font_editor.glyph_selector
+                glyph_selector.select_row(glyph_selector.get_row_at_index(0))
+                context = self.font_editor.glyph_editor.get_context()
+                context.select_pencil(0)
+                context.handle_pixel_event(0, 0, context.SET_PIXEL)
+                area = context.handle_pixel_event(7, 3, context.SET_PIXEL)
+                context.end_stroke()
+
+                self.assertEqual(area, (0, 0, 8, 4))
+                data = self.font.get_glyph(0).get_data()
+                self.assertEqual(sum(map(sum, data)), 8)
+                self.assertEqual(data[3][7], 1)
+                self.assertIsNone(
+                    context.handle_pixel_event(0, 7, context.NONE))
+
+        def draw_glyph_editor(self):
+                glyph_editor = self.font_editor.glyph_editor
+                width, height = glyph_editor.get_size_request()
+                surface = cairo.ImageSurface(cairo.FORMAT_ARGB32, width,
+                                             height)
+                glyph_editor.do_draw(cairo.Context(surface))
+
+        def spy_on_glyph_editor(self, name):
+                name = '_GlyphEditor__' + name
+                patcher = mock.patch.object(
+                    GlyphEditor, name, autospec=True,
+                    side_effect=getattr(GlyphEditor, name))
+                self.addCleanup(patcher.stop)
+
+                return patcher.start()
+
+        def get_rendered_rows(self, render_rows):
+                return sorted(y for call in render_rows.call_args_list
+                              for y in call[0][5])
+
+        def test_glyph_editor_layers_are_cached(self):
+                render_rows = self.spy_on_glyph_editor('render_rows')
+                render_grid_tile = self.spy_on_glyph_editor(
+                    'render_grid_tile')
+                self.draw_glyph_editor()
+                self.assertEqual(sorted(set(
+                    self.get_rendered_rows(render_rows))), list(range(8)))
+                self.assertTrue(render_grid_tile.called)
+
+                render_rows.reset_mock()
+                render_grid_tile.reset_mock()
+                self.draw_glyph_editor()
+                self.assertFalse(render_rows.called)
+                self.assertFalse(render_grid_tile.called)
+
+        def test_glyph_editor_invalidates_edited_cells(self):
+                glyph_editor = self.font_editor.glyph_editor
+                context = glyph_editor.get_context()
+                context.select_pencil(1)
+                context.handle_pixel_event(7, 7, context.NONE)
+                self.assertEqual(context.get_pencil_area(), (6, 6, 2, 2))
+                context.handle_pixel_event(0, 0, context.NONE)
+                self.assertEqual(context.get_pencil_area(), (0, 0, 1, 1))
+
+                self.draw_glyph_editor()
+                render_rows = self.spy_on_glyph_editor('render_rows')
+                area = context.handle_pixel_event(3, 4, context.SET_PIXEL)
+                context.end_stroke()
+                self.assertEqual(area, (2, 3, 2, 2))
+                self.draw_glyph_editor()
+                self.assertEqual(self.get_rendered_rows(render_rows), [3, 4])
+
+        def test_glyph_edits_notify_once_per_frame(self):
+                window = Gtk.OffscreenWindow()
+                self.addCleanup(window.destroy)
+                window.add(self.font_editor)
+                window.show_all()
+                glyph_editor = self.font_editor.glyph_editor
+                self.assertIsNotNone(glyph_editor.get_frame_clock())
+
+                context = glyph_editor.get_context()
+                calls = []
+                context.register_on_changed_callback(calls.append)
+                for x in range(4):
+                        context.handle_pixel_event(x, 1, context.SET_PIXEL)
+                self.assertEqual(calls, [])
+                context.flush()
+                self.assertEqual(len(calls), 1)
+                context.flush()
+                self.assertEqual(len(calls), 1)
+
+        def wait_for_previews(self, cache):
+                while cache.has_pending():
+                        Gtk.main_iteration_do(True)
+
+        def test_preview_cache(self):
+                glyph_selector = self.font_editor.glyph_selector
+                cache = glyph_selector.context.get_preview_cache()
+                self.wait_for_previews(cache)
+                row0 = glyph_selector.get_row_at_index(0)
+                row1 = glyph_selector.get_row_at_index(1)
+                self.assertIs(row0.image.get_pixbuf(),
+                              row1.image.get_pixbuf())
+                self.assertEqual(len(cache), 1)
+
+                glyph_selector.select_row(row1)
+                context = self.font_editor.glyph_editor.get_context()
+                context.set_pixels([[1] * 8 for _ in range(8)])
+                self.wait_for_previews(cache)
+                self.assertIsNot(row0.image.get_pixbuf(),
+                                 row1.image.get_pixbuf())
+                self.assertEqual(len(cache), 2)
+
+                glyph_selector.context.set_glyph_preview_size(16)
+                self.wait_for_previews(cache)
+                self.assertEqual(row1.image.get_pixbuf().get_width(), 16)
+
+        def test_preview_render_error(self):
+                cache = GlyphPreviewCache()
+                self.addCleanup(cache.shutdown)
+                pixbufs = []
+                with mock.patch('pysfedit.constants.get_preview_data',
+                                side_effect=ValueError):
+                        cache.request(self.font.get_glyph(0), 16,
+                                      lambda key, pixbuf:
+                                      pixbufs.append(pixbuf))
+                        self.wait_for_previews(cache)
+
+                self.assertEqual(len(pixbufs), 1)
+                self.assertEqual(pixbufs[0].get_width(), 16)
+                self.assertEqual(len(cache), 0)
+
         def tearDown(self):
                 self.font_editor.destroy()
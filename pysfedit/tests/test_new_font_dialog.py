@@ -23,7 +23,7 @@ import gi
 gi.require_version("Gtk", "3.0")
 from gi.repository import Gtk
 from gi.repository import GLib
-from .. import NewFontDialog
+from ..application import NewFontDialog
 from . import MockedParent
 
 class NewFontDialogTest(unittest.TestCase):
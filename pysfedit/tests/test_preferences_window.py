@@ -21,7 +21,7 @@
 import unittest
 
 from . import ChangedCallback
-from .. import PreferencesWindow
+from ..preferences_window import PreferencesWindow
 
 from ..constants import Storage
 from ..glyph_editor import GlyphEditorAttributes
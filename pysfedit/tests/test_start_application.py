@@ -23,7 +23,7 @@ import gi
 gi.require_version("Gtk", "3.0")
 from gi.repository import Gtk
 from gi.repository import GLib
-from .. import PySFeditWindow
+from ..application import PySFeditWindow
 
 class StartApplicationTest(unittest.TestCase):
     def __init__(self, *args, **kwargs):
@@ -23,7 +23,8 @@ from setuptools import setup
 setup(
     entry_points={
         'console_scripts' : [
-            'pysfedit=pysfedit:main'
+            'pysfedit=pysfedit:main',
+            'pysfedit-cli=pysfedit.cli:main'
         ]
     }
 )